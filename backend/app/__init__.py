@@ -1,3 +1,4 @@
+import os
 from flask import Flask
 from flask_migrate import Migrate
 from .database import db
@@ -5,6 +6,7 @@ from .config import Config, AuthConfig, DBConfig
 from .auth.oauth import config_oauth
 from .auth.oauth_routes import oauth_bp
 from .api.github_routes import github_bp
+from backend.app.services.github_query.github_graphql.checkpoint import configure_checkpoint_store
 
 
 def create_app():
@@ -15,11 +17,25 @@ def create_app():
     app.config.from_object(DBConfig)
     app.debug = app.config.get("DEBUG", False)
 
+    # crawl checkpoints must outlive the process, so they are kept in a file
+    checkpoint_path = app.config.get("GRAPHQL_CHECKPOINT_PATH")
+    if not checkpoint_path:
+        os.makedirs(app.instance_path, exist_ok=True)
+        checkpoint_path = os.path.join(app.instance_path, "graphql_checkpoints.sqlite")
+    configure_checkpoint_store(checkpoint_path)
+
     config_oauth(app)  # Initialize OAuth with app configuration
 
     db.init_app(app)
     migrate = Migrate(app, db)
-    from .models import user, github_user_data
+    from .models import user, github_user_data, crawl_job, contribution_rollup
+    # keeps the contribution rollups up to date as snapshots are stored
+    from .services.rollup_service import rebuild_rollups
+
+    @app.cli.command("rebuild-rollups")
+    def rebuild_rollups_command():
+        """Recomputes the contribution rollups from the stored snapshots."""
+        print(f"Rolled up {rebuild_rollups()} snapshots")
 
     app.register_blueprint(oauth_bp, url_prefix="/oauth")
     app.register_blueprint(github_bp, url_prefix="/api")
@@ -3,6 +3,8 @@ import os
 class Config(object):
     DEBUG = True  # Ensure debug is enabled in your configuration for development
     SECRET_KEY = "your_secret_key_here"  # Consider using environment variables
+    # SQLite file of the crawl checkpoints; defaults to graphql_checkpoints.sqlite in the instance folder
+    GRAPHQL_CHECKPOINT_PATH = os.environ.get("GRAPHQL_CHECKPOINT_PATH")
 
 class AuthConfig(Config):
     GITHUB_OAUTH_CLIENT_ID = "your_github_oauth_client_id_here"
@@ -1,2 +1,4 @@
 from .user import User
-from .github_user_data import GitHubUserData
\ No newline at end of file
+from .github_user_data import GitHubUserData
+from .crawl_job import CrawlJob, CrawlJobPage
+from .contribution_rollup import ContributionRollup
\ No newline at end of file
@@ -0,0 +1,38 @@
+from app.database import db
+
+class ContributionRollup(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint('user_id', 'granularity', 'bucket', name='uq_contribution_rollup_bucket'),
+        # range queries over a cohort filter on the granularity and the bucket start
+        db.Index('ix_contribution_rollup_range', 'granularity', 'bucket_start', 'user_id'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id', ondelete='CASCADE'), nullable=False)
+    # 'day', 'week' or 'semester'
+    granularity = db.Column(db.String(10), nullable=False)
+    # e.g. '2023-09-04' for a day or a week (its Monday), '2023 Fall' for a semester
+    bucket = db.Column(db.String(100), nullable=False)
+    bucket_start = db.Column(db.DateTime, nullable=False)
+
+    snapshots = db.Column(db.Integer, nullable=False, default=0)
+    commits = db.Column(db.Integer, nullable=False, default=0)
+    prs = db.Column(db.Integer, nullable=False, default=0)
+    issues = db.Column(db.Integer, nullable=False, default=0)
+    pr_reviews = db.Column(db.Integer, nullable=False, default=0)
+    comments = db.Column(db.Integer, nullable=False, default=0)
+
+    # Convert object properties to a dictionary
+    def to_dict(self):
+        return {
+            'user_id': self.user_id,
+            'granularity': self.granularity,
+            'bucket': self.bucket,
+            'bucket_start': self.bucket_start.isoformat() if self.bucket_start else None,
+            'snapshots': self.snapshots,
+            'commits': self.commits,
+            'prs': self.prs,
+            'issues': self.issues,
+            'pr_reviews': self.pr_reviews,
+            'comments': self.comments,
+        }
@@ -0,0 +1,53 @@
+from datetime import datetime
+from sqlalchemy.dialects.mysql import LONGTEXT
+from app.database import db
+
+class CrawlJob(db.Model):
+    __table_args__ = (
+        # the jobs whose worker stopped renewing their lease
+        db.Index('ix_crawl_job_status_heartbeat', 'status', 'heartbeat_at'),
+    )
+
+    id = db.Column(db.String(36), primary_key=True)
+    kind = db.Column(db.String(100), nullable=False)
+    params = db.Column(db.Text, nullable=False)
+    # hash of the kind, the parameters and the token, shared by identical jobs
+    dedup_key = db.Column(db.String(64), nullable=False, index=True)
+    # the dedup_key while the job is queued or running, NULL once it has finished: at most one
+    # identical job is active at a time, whichever process submitted it
+    active_key = db.Column(db.String(64), unique=True)
+    status = db.Column(db.String(20), nullable=False, default='queued')
+    progress = db.Column(db.Integer, nullable=False, default=0)
+    # the result of a job returning a single object; the pages of a paginated crawl are in CrawlJobPage
+    result = db.Column(db.Text().with_variant(LONGTEXT, 'mysql'))
+    error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+    # renewed by the process running the job while it is queued or running
+    heartbeat_at = db.Column(db.DateTime)
+
+    # Convert object properties to a dictionary, without the result which can be large
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'kind': self.kind,
+            'status': self.status,
+            'progress': self.progress,
+            'error': self.error,
+            'created_at': self.created_at.isoformat() if self.created_at else None,
+            'started_at': self.started_at.isoformat() if self.started_at else None,
+            'finished_at': self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class CrawlJobPage(db.Model):
+    __table_args__ = (
+        db.UniqueConstraint('job_id', 'seq', name='uq_crawl_job_page_seq'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.String(36), db.ForeignKey('crawl_job.id', ondelete='CASCADE'), nullable=False)
+    # the position of the page in the crawl, from 0
+    seq = db.Column(db.Integer, nullable=False)
+    data = db.Column(db.Text().with_variant(LONGTEXT, 'mysql'), nullable=False)
@@ -2,6 +2,18 @@ from datetime import datetime
 from app.database import db
 
 class GitHubUserData(db.Model):
+    __table_args__ = (
+        # one snapshot per login and period, which bulk ingestion upserts on; also serves the lookups
+        # by GitHub login, optionally within a semester
+        db.UniqueConstraint('github_login', 'semester', 'start_at', 'end_at', name='uq_git_hub_user_data_snapshot'),
+        # a user's snapshots, in order: filter_by(user_id=...) and the history views
+        db.Index('ix_git_hub_user_data_user_created', 'user_id', 'created_at'),
+        # per-semester reporting over a cohort
+        db.Index('ix_git_hub_user_data_semester_user', 'semester', 'user_id'),
+        # snapshots whose period falls in a date range
+        db.Index('ix_git_hub_user_data_period', 'start_at', 'end_at'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     github_login = db.Column(db.String(100), nullable=False)
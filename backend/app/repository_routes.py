@@ -1,10 +1,41 @@
-from flask import Blueprint, jsonify, request
+import json
+import time
+from flask import Blueprint, Response, jsonify, request, session, stream_with_context
+from app.database import db
+from app.services.github_query.github_graphql.client import QueryFailedException
 from app.services.github_comments_service import (get_user_commit_comments,get_user_gist_comments,get_user_issue_comments)
-from app.services.github_contributions import (get_user_gists,get_issues,get_pull_requests,get_repo_discussions)
+from app.services.github_contributions import (get_user_gists,get_issues,get_pull_requests,get_repo_discussions,get_search_counts)
 from app.services.github_contributions_service import (get_user_contributions)
-from app.services.github_profile_services import (get_profile_stats,get_profile_login)
+from app.services.github_profile_services import (get_profile_stats,get_profile_login,get_profiles_stats)
+from app.services.github_activity_service import (get_user_activity)
+from app.services.github_repository_service import (get_repository_commits,get_repository_commits_between,get_repository_user_contribution)
+from app.services.job_service import (get_job_queue, FINISHED_STATUSES)
+from app.services.rollup_service import (cohort_totals, parse_range)
+from app.services.snapshot_service import (ingest_snapshots, build_semester_snapshots)
 repository_bp = Blueprint('repository', __name__)
 
+def paginated_response(data):
+    """
+    Builds the response of a paginated query. With ?stream=ndjson (or an Accept: application/x-ndjson
+    header) each page is sent as one JSON line as soon as it is fetched, so memory stays bounded by one
+    page and the first byte arrives after the first page. Otherwise all pages are returned as one JSON list.
+    """
+    if isinstance(data, dict):
+        # the service returned an error instead of a page generator
+        return jsonify(data)
+
+    if request.args.get('stream') == 'ndjson' or 'application/x-ndjson' in request.headers.get('Accept', ''):
+        def generate():
+            try:
+                for page in data:
+                    yield json.dumps(page) + "\n"
+            except QueryFailedException as e:
+                yield json.dumps({"error": str(e)}) + "\n"
+
+        return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+    return jsonify(list(data))
+
 @repository_bp.route('/graphql/comments/<user>/commitcomments',methods=['GET'])
 def commit_comments(user):
     pg_size = request.args.get('pg_size', 100, type=int)
@@ -13,10 +44,7 @@ def commit_comments(user):
     if token and token.startswith('Bearer '):
         token = token.split(' ')[1]
     data=get_user_commit_comments(user,pg_size)
-    data_list = list(data)
-    
-    # Use jsonify to create a proper JSON response
-    return jsonify(data_list)
+    return paginated_response(data)
 
 @repository_bp.route('/graphql/comments/<user>/gistcomments', methods=['GET'])
 def gist_comments(user):
@@ -26,10 +54,7 @@ def gist_comments(user):
         token = token.split(' ')[1]
 
     data=get_user_gist_comments(user,pg_size)
-    data_list = list(data)
-    
-    # Use jsonify to create a proper JSON response
-    return jsonify(data_list)
+    return paginated_response(data)
 
 @repository_bp.route('/graphql/comments/<user>/issuecomments', methods=['GET'])
 def issue_comments(user):
@@ -39,10 +64,7 @@ def issue_comments(user):
         token = token.split(' ')[1]
     
     data=get_user_issue_comments(user,pg_size)
-    data_list = list(data)
-    
-    # Use jsonify to create a proper JSON response
-    return jsonify(data_list)
+    return paginated_response(data)
 
 @repository_bp.route('/graphql/contributions/<user>/usergists', methods=['GET'])
 def contributions_gists(user):
@@ -50,11 +72,13 @@ def contributions_gists(user):
     token = request.headers.get('Authorization')
     if token and token.startswith('Bearer '):
         token = token.split(' ')[1]
-    data=get_user_gists(user,pg_size)
-    data_list = list(data)
-    
-    # Use jsonify to create a proper JSON response
-    return jsonify(data_list)
+    # with ?start= and/or ?end=, only the nodes created in that window are returned, along with the
+    # pages fetched and skipped; ?order=desc pages from the newest node
+    start = request.args.get('start')
+    end = request.args.get('end')
+    descending = request.args.get('order') == 'desc'
+    data=get_user_gists(user,pg_size,token,start,end,descending)
+    return paginated_response(data)
 
 @repository_bp.route('/graphql/contributions/<user>/userissues', methods=['GET'])
 def contributions_isues(user):
@@ -62,11 +86,13 @@ def contributions_isues(user):
     token = request.headers.get('Authorization')
     if token and token.startswith('Bearer '):
         token = token.split(' ')[1]
-    data=get_issues(user,pg_size)
-    data_list = list(data)
-    
-    # Use jsonify to create a proper JSON response
-    return jsonify(data_list)
+    # with ?start= and/or ?end=, only the nodes created in that window are returned, along with the
+    # pages fetched and skipped; ?order=desc pages from the newest node
+    start = request.args.get('start')
+    end = request.args.get('end')
+    descending = request.args.get('order') == 'desc'
+    data=get_issues(user,pg_size,token,start,end,descending)
+    return paginated_response(data)
 
 @repository_bp.route('/graphql/contributions/<user>/userpullrequests', methods=['GET'])
 def pull_request(user):
@@ -74,11 +100,13 @@ def pull_request(user):
     token = request.headers.get('Authorization')
     if token and token.startswith('Bearer '):
         token = token.split(' ')[1]
-    data=get_pull_requests(user,pg_size)
-    data_list = list(data)
-    
-    # Use jsonify to create a proper JSON response
-    return jsonify(data_list)
+    # with ?start= and/or ?end=, only the nodes created in that window are returned, along with the
+    # pages fetched and skipped; ?order=desc pages from the newest node
+    start = request.args.get('start')
+    end = request.args.get('end')
+    descending = request.args.get('order') == 'desc'
+    data=get_pull_requests(user,pg_size,token,start,end,descending)
+    return paginated_response(data)
 
 @repository_bp.route('/graphql/contributions/<user>/userrepodiscussions', methods=['GET'])
 def repo_discussions(user):
@@ -86,11 +114,38 @@ def repo_discussions(user):
     token = request.headers.get('Authorization')
     if token and token.startswith('Bearer '):
         token = token.split(' ')[1]
-    data=get_repo_discussions(user,pg_size)
-    data_list = list(data)
-    
-    # Use jsonify to create a proper JSON response
-    return jsonify(data_list)
+    # with ?start= and/or ?end=, only the nodes created in that window are returned, along with the
+    # pages fetched and skipped; ?order=desc pages from the newest node
+    start = request.args.get('start')
+    end = request.args.get('end')
+    descending = request.args.get('order') == 'desc'
+    data=get_repo_discussions(user,pg_size,token,start,end,descending)
+    return paginated_response(data)
+
+@repository_bp.route('/graphql/contributions/<user>/counts', methods=['GET'])
+def contribution_counts(user):
+    start = request.args.get('start')
+    end = request.args.get('end')
+    header = request.headers.get('Authorization')
+    token = None
+    if header and header.startswith('Bearer '):
+        token = header.split(' ')[1]
+
+    # issues and pull requests created in [start, end], counted by search without fetching any node
+    data = get_search_counts(user, start, end, token)
+    return jsonify(data)
+
+@repository_bp.route('/graphql/activity/<user>', methods=['GET'])
+def user_activity(user):
+    pg_size = request.args.get('pg_size', 100, type=int)
+    header = request.headers.get('Authorization')
+    token = None
+    if header and header.startswith('Bearer '):
+        token = header.split(' ')[1]
+
+    # gists, issues, pull requests, discussions and all comment types are fetched concurrently
+    data = get_user_activity(user, pg_size, token)
+    return jsonify(data)
 
 @repository_bp.route('/graphql/contributions/<user>', methods=['GET'])
 def user_contributions(user):
@@ -108,6 +163,40 @@ def user_contributions(user):
     data = get_user_contributions(user, start_date, end_date, token)
     return jsonify(data)
 
+@repository_bp.route('/graphql/repositories/<owner>/<repo_name>/commits', methods=['GET'])
+def repository_commits(owner, repo_name):
+    header = request.headers.get('Authorization')
+    token = None
+    if header and header.startswith('Bearer '):
+        token = header.split(' ')[1]
+
+    since = request.args.get('since')
+    until = request.args.get('until')
+    if since or until:
+        if not since or not until:
+            return jsonify({"error": "since and until must be given together"}), 400
+        # the range is crawled in parallel time windows
+        try:
+            data = get_repository_commits_between(owner, repo_name, since, until, token,
+                                                  max_workers=request.args.get('workers', 4, type=int))
+        except ValueError as e:
+            return jsonify({"error": str(e)}), 400
+        return jsonify(data)
+
+    # only the commits made since the previous sync are fetched
+    data = get_repository_commits(owner, repo_name, token)
+    return jsonify(data)
+
+@repository_bp.route('/graphql/repositories/<owner>/<repo_name>/contributors/<author_id>', methods=['GET'])
+def repository_user_contribution(owner, repo_name, author_id):
+    header = request.headers.get('Authorization')
+    token = None
+    if header and header.startswith('Bearer '):
+        token = header.split(' ')[1]
+
+    data = get_repository_user_contribution(owner, repo_name, author_id, token)
+    return jsonify(data)
+
 @repository_bp.route('/graphql/profiles/<user>', methods=['GET'])
 def user_profiles(user):
     header = request.headers.get('Authorization')
@@ -118,6 +207,20 @@ def user_profiles(user):
     data = get_profile_stats(user, token)
     return jsonify(data)
 
+@repository_bp.route('/graphql/profiles', methods=['GET'])
+def users_profiles():
+    users = [user for user in request.args.get('users', '').split(',') if user]
+    if not users:
+        return jsonify({"error": "users is required"}), 400
+
+    header = request.headers.get('Authorization')
+    token = None
+    if header and header.startswith('Bearer '):
+        token = header.split(' ')[1]
+
+    data = get_profiles_stats(users, token)
+    return jsonify(data)
+
 @repository_bp.route('/graphql/profiles/login/<user>', methods=['GET'])
 def user_profiles_login(user):
     header = request.headers.get('Authorization')
@@ -128,9 +231,121 @@ def user_profiles_login(user):
     data = get_profile_login(user, token)
     return jsonify(data)
 
+@repository_bp.route('/jobs', methods=['POST'])
+def submit_job():
+    body = request.get_json(silent=True) or {}
+    kind = body.get('kind')
+    params = body.get('params', {})
+
+    header = request.headers.get('Authorization')
+    token = None
+    if header and header.startswith('Bearer '):
+        token = header.split(' ')[1]
+    # the worker has no session, so the token is taken now
+    token = token or session.get('access_token')
+    if not token:
+        return jsonify({"error": "User not authenticated"}), 401
+
+    try:
+        job_id = get_job_queue().submit(kind, params, token)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(get_job_queue().get(job_id)), 202
 
+@repository_bp.route('/jobs/<job_id>', methods=['GET'])
+def job_status(job_id):
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    return jsonify(job)
 
+@repository_bp.route('/jobs/<job_id>/result', methods=['GET'])
+def job_result(job_id):
+    job = get_job_queue().get(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found"}), 404
+    if job['status'] != 'succeeded':
+        return jsonify(job), 409
+    # the pages of a paginated crawl are read back a chunk at a time, and can be streamed with ?stream=ndjson
+    return paginated_response(get_job_queue().result(job_id))
 
+@repository_bp.route('/jobs/<job_id>/stream', methods=['GET'])
+def job_stream(job_id):
+    """
+    Streams the state of a job as NDJSON, one line whenever its status or progress changes,
+    until the job has finished.
+    """
+    interval = request.args.get('interval', 1.0, type=float)
+    if get_job_queue().get(job_id) is None:
+        return jsonify({"error": "Job not found"}), 404
 
-    
-    
\ No newline at end of file
+    def generate():
+        last = None
+        while True:
+            # end the transaction of the previous poll, which would otherwise keep reading the same
+            # snapshot (REPEATABLE READ) and never see the progress committed by the worker
+            db.session.rollback()
+            job = get_job_queue().get(job_id)
+            if (job['status'], job['progress']) != last:
+                last = (job['status'], job['progress'])
+                yield json.dumps(job) + "\n"
+            if job['status'] in FINISHED_STATUSES:
+                return
+            time.sleep(interval)
+
+    return Response(stream_with_context(generate()), mimetype='application/x-ndjson')
+
+@repository_bp.route('/rollups/summary', methods=['GET'])
+def rollup_summary():
+    """
+    Returns the contribution totals of a cohort over a date range, e.g.
+    /rollups/summary?user_ids=1,2,3&granularity=week&start=2024-01-08&end=2024-05-06&per_user=true
+    """
+    try:
+        user_ids = [int(user_id) for user_id in request.args.get('user_ids', '').split(',') if user_id]
+        start, end = parse_range(request.args.get('start'), request.args.get('end'))
+        if not user_ids:
+            raise ValueError("user_ids is required")
+        summary = cohort_totals(user_ids, request.args.get('granularity', 'semester'), start, end,
+                                per_user=request.args.get('per_user', 'false').lower() == 'true')
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(summary)
+
+@repository_bp.route('/snapshots/bulk', methods=['POST'])
+def bulk_snapshots():
+    """
+    Stores a batch of GitHubUserData snapshots in one transaction, replacing the snapshots with the same
+    login and period. The body is {"snapshots": [...], "chunk_size": 1000}.
+    """
+    body = request.get_json(silent=True) or {}
+    snapshots = body.get('snapshots')
+    if not isinstance(snapshots, list):
+        return jsonify({"error": "snapshots must be a list"}), 400
+    try:
+        report = ingest_snapshots(snapshots, chunk_size=int(body.get('chunk_size', 1000)))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(report), 201
+
+@repository_bp.route('/snapshots/semesters', methods=['POST'])
+def semester_snapshots():
+    """
+    Builds and stores the snapshots of a user for several semesters in a couple of GitHub requests. The body is
+    {"user_id": 1, "github_login": "...", "semesters": [{"semester": "2024 Fall", "start_at": ..., "end_at": ...}]}.
+    """
+    body = request.get_json(silent=True) or {}
+    semesters = body.get('semesters')
+    if body.get('user_id') is None or not body.get('github_login') or not isinstance(semesters, list):
+        return jsonify({"error": "user_id, github_login and a list of semesters are required"}), 400
+    header = request.headers.get('Authorization')
+    token = None
+    if header and header.startswith('Bearer '):
+        token = header.split(' ')[1]
+    try:
+        report = build_semester_snapshots(body['user_id'], body['github_login'], semesters, token)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    if "error" in report:
+        return jsonify(report), 401 if report["error"] == "User not authenticated" else 502
+    return jsonify(report), 201
@@ -0,0 +1,58 @@
+import asyncio
+from typing import Dict, Any, Optional
+from flask import session
+
+# the exception is imported from the module that raises it, so the except clause matches its class
+from app.services.github_query.github_graphql.async_client import AsyncClient, QueryFailedException
+from app.services.github_query.github_graphql.authentication import (
+    PersonalAccessTokenAuthenticator,
+)
+
+from app.services.github_query.queries.contributions.user_gists import (UserGists)
+from app.services.github_query.queries.contributions.user_issues import (UserIssues)
+from app.services.github_query.queries.contributions.user_pull_requests import (UserPullRequests)
+from app.services.github_query.queries.contributions.user_repository_discussions import (UserRepositoryDiscussions)
+from app.services.github_query.queries.comments.user_commit_comments import (UserCommitComments)
+from app.services.github_query.queries.comments.user_gist_comments import (UserGistComments)
+from app.services.github_query.queries.comments.user_issue_comments import (UserIssueComments)
+from app.services.github_query.queries.comments.user_repository_discussion_comments import (UserRepositoryDiscussionComments)
+
+ACTIVITY_QUERIES = {
+    "gists": UserGists,
+    "issues": UserIssues,
+    "pull_requests": UserPullRequests,
+    "repository_discussions": UserRepositoryDiscussions,
+    "commit_comments": UserCommitComments,
+    "gist_comments": UserGistComments,
+    "issue_comments": UserIssueComments,
+    "repository_discussion_comments": UserRepositoryDiscussionComments,
+}
+
+
+async def fetch_user_activity(user: str, pg_size: int, auth_token: str) -> Dict[str, Any]:
+    """
+    Fetches every page of the contribution and comment queries of a user concurrently.
+
+    Returns:
+        dict: The list of pages of each query, keyed by activity type.
+    """
+    async with AsyncClient(
+        host="api.github.com",
+        is_enterprise=False,
+        authenticator=PersonalAccessTokenAuthenticator(token=auth_token),
+    ) as client:
+        results = await client.gather(
+            *(query_class(user=user, pg_size=pg_size) for query_class in ACTIVITY_QUERIES.values())
+        )
+    return dict(zip(ACTIVITY_QUERIES.keys(), results))
+
+
+def get_user_activity(user: str, pg_size: int = 100, token: Optional[str] = None) -> Dict[str, Any]:
+    auth_token = token or session.get("access_token")
+    if not auth_token:
+        return {"error": "User not authenticated"}
+
+    try:
+        return asyncio.run(fetch_user_activity(user, pg_size, auth_token))
+    except QueryFailedException as e:
+        return {"error": str(e)}
@@ -37,8 +37,8 @@ def get_user_commit_comments(user:str,pg_size:int=100,token: Optional[str] = Non
     except QueryFailedException as e:
         return {"error": str(e)}
 
-def get_user_gist_comments(user:str,pg_size:int=100)-> Dict[str, Any]:
-    token = session.get("access_token")
+def get_user_gist_comments(user:str,pg_size:int=100,token: Optional[str] = None)-> Dict[str, Any]:
+    token = token or session.get("access_token")
     if not token:
         return {"error": "User not authenticated"}
     
@@ -56,8 +56,8 @@ def get_user_gist_comments(user:str,pg_size:int=100)-> Dict[str, Any]:
     except QueryFailedException as e:
         return {"error": str(e)}
     
-def get_user_issue_comments(user:str,pg_size:int=100)-> Dict[str, Any]:
-    token = session.get("access_token")
+def get_user_issue_comments(user:str,pg_size:int=100,token: Optional[str] = None)-> Dict[str, Any]:
+    token = token or session.get("access_token")
     if not token:
         return {"error": "User not authenticated"}
     client = Client(
@@ -14,9 +14,20 @@ from app.services.github_query.queries.contributions.user_issues import (UserIss
 from app.services.github_query.queries.contributions.user_pull_requests import (UserPullRequests)
 from app.services.github_query.queries.contributions.user_repositories import (UserRepositories)
 from app.services.github_query.queries.contributions.user_repository_discussions import (UserRepositoryDiscussions)
-
-def get_user_gists(user:str,pg_size:int=100)-> Dict[str, Any]:
-    token = session.get("access_token")
+from app.services.github_query.queries.contributions.user_search_counts import (UserSearchCounts)
+from app.services.github_query.queries.windowed_query import (WindowedPaginatedQuery)
+
+def _windowed_or_pages(client: Client, query: WindowedPaginatedQuery, start: Optional[str], end: Optional[str], descending: bool) -> Any:
+    # with a window, only the pages holding its nodes are fetched, newest first if descending;
+    # without one, every page is streamed as it arrives
+    if start or end:
+        return query.windowed_nodes(client, start, end, descending)
+    if descending:
+        query.order_by_creation(descending=True)
+    return client.execute(query=query)
+
+def get_user_gists(user:str,pg_size:int=100,token: Optional[str] = None,start: Optional[str] = None,end: Optional[str] = None,descending: bool = False)-> Dict[str, Any]:
+    token = token or session.get("access_token")
     if not token:
         return {"error": "User not authenticated"}
     
@@ -28,14 +39,12 @@ def get_user_gists(user:str,pg_size:int=100)-> Dict[str, Any]:
 
     try:
         query = UserGists(user=user,pg_size=pg_size)
-        # Execute query and handle pagination
-        response = client.execute(query=query)
-        return response
-    except QueryFailedException as e:
+        return _windowed_or_pages(client, query, start, end, descending)
+    except (QueryFailedException, ValueError) as e:
         return {"error": str(e)}
 
-def get_issues(user:str,pg_size:int=100)-> Dict[str, Any]:
-    token = session.get("access_token")
+def get_issues(user:str,pg_size:int=100,token: Optional[str] = None,start: Optional[str] = None,end: Optional[str] = None,descending: bool = False)-> Dict[str, Any]:
+    token = token or session.get("access_token")
     if not token:
         return {"error": "User not authenticated"}
     
@@ -47,14 +56,12 @@ def get_issues(user:str,pg_size:int=100)-> Dict[str, Any]:
 
     try:
         query = UserIssues(user=user,pg_size=pg_size)
-        # Execute query and handle pagination
-        response = client.execute(query=query)
-        return response
-    except QueryFailedException as e:
+        return _windowed_or_pages(client, query, start, end, descending)
+    except (QueryFailedException, ValueError) as e:
         return {"error": str(e)}
 
-def get_pull_requests(user:str,pg_size:int=100)-> Dict[str, Any]:
-    token = session.get("access_token")
+def get_pull_requests(user:str,pg_size:int=100,token: Optional[str] = None,start: Optional[str] = None,end: Optional[str] = None,descending: bool = False)-> Dict[str, Any]:
+    token = token or session.get("access_token")
     if not token:
         return {"error": "User not authenticated"}
     
@@ -66,14 +73,12 @@ def get_pull_requests(user:str,pg_size:int=100)-> Dict[str, Any]:
 
     try:
         query = UserPullRequests(user=user,pg_size=pg_size)
-        # Execute query and handle pagination
-        response = client.execute(query=query)
-        return response
-    except QueryFailedException as e:
+        return _windowed_or_pages(client, query, start, end, descending)
+    except (QueryFailedException, ValueError) as e:
         return {"error": str(e)}
 
-def get_repo_discussions(user:str,pg_size:int=100)->Dict[str, Any]:
-    token = session.get("access_token")
+def get_repo_discussions(user:str,pg_size:int=100,token: Optional[str] = None,start: Optional[str] = None,end: Optional[str] = None,descending: bool = False)-> Dict[str, Any]:
+    token = token or session.get("access_token")
     if not token:
         return {"error": "User not authenticated"}
     
@@ -85,18 +90,23 @@ def get_repo_discussions(user:str,pg_size:int=100)->Dict[str, Any]:
 
     try:
         query = UserRepositoryDiscussions(user=user,pg_size=pg_size)
-        # Execute query and handle pagination
-        response = client.execute(query=query)
-        return response
-    except QueryFailedException as e:
+        return _windowed_or_pages(client, query, start, end, descending)
+    except (QueryFailedException, ValueError) as e:
         return {"error": str(e)}
 
+def get_search_counts(user:str,start:Optional[str]=None,end:Optional[str]=None,token: Optional[str] = None)->Dict[str, Any]:
+    token = token or session.get("access_token")
+    if not token:
+        return {"error": "User not authenticated"}
 
+    client = Client(
+        host="api.github.com",
+        is_enterprise=False,
+        authenticator=PersonalAccessTokenAuthenticator(token=token),
+    )
 
-
-
-
-
-
-
-    
\ No newline at end of file
+    try:
+        # one search issueCount per kind instead of paging through every issue and pull request
+        return UserSearchCounts.window_counts(client, user, [(start, end)])[0]
+    except (QueryFailedException, ValueError) as e:
+        return {"error": str(e)}
@@ -7,6 +7,8 @@ from app.services.github_query.github_graphql.client import (
 from app.services.github_query.github_graphql.authentication import (
     PersonalAccessTokenAuthenticator,
 )
+from app.services.github_query.github_graphql.cache import get_default_cache
+from app.services.github_query.github_graphql.single_flight import get_default_single_flight
 
 from app.services.github_query.queries.time_range_contributions.user_contributions_collection import (UserContributionsCollection)
 def get_user_contributions(user: str, start_date: str, end_date: str, token: Optional[str] = None) -> Dict[str, Any]:
@@ -19,6 +21,8 @@ def get_user_contributions(user: str, start_date: str, end_date: str, token: Opt
         host="api.github.com",
         is_enterprise=False,
         authenticator=PersonalAccessTokenAuthenticator(token=auth_token),
+        cache=get_default_cache(),
+        single_flight=get_default_single_flight(),
     )
 
     try:
@@ -28,7 +32,11 @@ def get_user_contributions(user: str, start_date: str, end_date: str, token: Opt
             end_date=end_date
         )
         response = client.execute(query=query)
-        print(response)  # Debugging: Inspect response structure
-        return response
-    except QueryFailedException as e:
+        # the totals keep their top-level keys; ranges longer than a year come back as one aliased
+        # window each, broken down under "windows"
+        return {
+            **UserContributionsCollection.user_contributions_collection(response),
+            "windows": UserContributionsCollection.contributions_by_window(response),
+        }
+    except (QueryFailedException, ValueError) as e:
         return {"error": str(e)}
\ No newline at end of file
@@ -1,15 +1,21 @@
-from typing import Dict, Any, Optional
+import os
+from typing import Dict, Any, List, Optional
 from flask import session
 from app.services.github_query.github_graphql.client import (
     Client,
     QueryFailedException,
 )
 from app.services.github_query.github_graphql.authentication import (
+    Authenticator,
     PersonalAccessTokenAuthenticator,
+    TokenPoolAuthenticator,
 )
+from app.services.github_query.github_graphql.cache import get_default_cache
+from app.services.github_query.github_graphql.single_flight import get_default_single_flight
 
 from app.services.github_query.queries.profiles.user_profile_stats import (UserProfileStats)
 from app.services.github_query.queries.profiles.user_login import (UserLogin)
+from app.services.github_query.github_graphql.batch import (execute_batched)
 
 def get_profile_stats(user: str,token: Optional[str] = None)-> Dict[str, Any]:
     auth_token = token or session.get("access_token")
@@ -21,6 +27,8 @@ def get_profile_stats(user: str,token: Optional[str] = None)-> Dict[str, Any]:
         host="api.github.com",
         is_enterprise=False,
         authenticator=PersonalAccessTokenAuthenticator(token=auth_token),
+        cache=get_default_cache(),
+        single_flight=get_default_single_flight(),
     )
 
     try:
@@ -43,6 +51,8 @@ def get_profile_login(user: str,token: Optional[str] = None)-> Dict[str, Any]:
         host="api.github.com",
         is_enterprise=False,
         authenticator=PersonalAccessTokenAuthenticator(token=auth_token),
+        cache=get_default_cache(),
+        single_flight=get_default_single_flight(),
     )
 
     try:
@@ -55,4 +65,37 @@ def get_profile_login(user: str,token: Optional[str] = None)-> Dict[str, Any]:
     except QueryFailedException as e:
         return {"error": str(e)}
 
+def get_crawl_authenticator(auth_token: str) -> Authenticator:
+    """
+    Builds the authenticator of a batch crawl: the user's token, pooled with the tokens listed
+    (comma-separated) in the GITHUB_TOKEN_POOL environment variable when there are any.
+    """
+    pool = [t.strip() for t in os.environ.get("GITHUB_TOKEN_POOL", "").split(",") if t.strip()]
+    if not pool:
+        return PersonalAccessTokenAuthenticator(token=auth_token)
+    return TokenPoolAuthenticator([auth_token] + [t for t in pool if t != auth_token])
 
+def get_profiles_stats(users: List[str], token: Optional[str] = None, batch_size: int = 50) -> Dict[str, Any]:
+    auth_token = token or session.get("access_token")
+    if not auth_token:
+        return {"error": "User not authenticated"}
+
+    client = Client(
+        host="api.github.com",
+        is_enterprise=False,
+        authenticator=get_crawl_authenticator(auth_token),
+        cache=get_default_cache(),
+        single_flight=get_default_single_flight(),
+    )
+
+    try:
+        # one request per batch of users instead of one per user
+        responses = execute_batched(
+            client, [UserProfileStats(user=user) for user in users], max_size=batch_size
+        )
+        return {
+            user: UserProfileStats.profile_stats(response) if response.get("user") else None
+            for user, response in zip(users, responses)
+        }
+    except QueryFailedException as e:
+        return {"error": str(e)}
@@ -0,0 +1,252 @@
+"""The module defines the AsyncClient class, an asyncio counterpart of Client that lets several GraphQL
+queries, and the rate limit waits between them, progress concurrently on one event loop."""
+
+import asyncio
+from typing import Union, Optional, Dict, Any, AsyncGenerator, Awaitable
+import httpx
+from backend.app.services.github_query.github_graphql.authentication import Authenticator
+from backend.app.services.github_query.github_graphql.base_client import (
+    BaseClient,
+    QueryFailedException,
+)
+from backend.app.services.github_query.github_graphql.query import Query, PaginatedQuery
+from backend.app.services.github_query.github_graphql.rate_limit_budget import RateLimitBudget
+
+
+class AsyncClient(BaseClient):
+    """
+    AsyncClient sends GraphQL queries to the GitHub GraphQL API without blocking the event loop.
+    It mirrors the execute() surface of Client: a Query resolves to the response data and a
+    PaginatedQuery yields each page's data as it arrives. Rate limit waits are awaited, so other
+    queries on the same loop keep running while one of them waits for the reset.
+    """
+
+    def __init__(
+        self,
+        protocol: str = "https",
+        host: str = "api.github.com",
+        is_enterprise: bool = False,
+        authenticator: Optional[Authenticator] = None,
+        retry_attempts: int = 3,
+        timeout_seconds: int = 10,
+        pool_maxsize: int = 10,
+        http2: bool = False,
+        budget: Optional[RateLimitBudget] = None,
+    ) -> None:
+        """
+        Initializes the client with the necessary configuration and authentication.
+
+        Args:
+            protocol (str): The protocol to use for connecting to the GitHub server.
+            host (str): The host address of the GitHub server.
+            is_enterprise (bool): Indicates whether the client is connecting to a GitHub Enterprise instance.
+            authenticator (Optional[Authenticator]): The authenticator instance for handling authentication.
+            retry_attempts (int): The number of times to retry the request before giving up.
+            timeout_seconds (int): The number of seconds to wait for a response before timing out.
+            pool_maxsize (int): The maximum number of connections kept open, and so of requests in flight.
+            http2 (bool): Whether to multiplex requests over HTTP/2 (requires the h2 package).
+            budget (Optional[RateLimitBudget]): The rate limit budget to throttle against. Defaults to the
+                budget shared by every client using the same token.
+
+        Raises:
+            InvalidAuthenticationError: If no authenticator is provided or if the provided authenticator is invalid.
+        """
+        super().__init__(protocol, host, is_enterprise, authenticator, retry_attempts, timeout_seconds, budget)
+        # one lock per budget, so coroutines finding a budget stale together send a single probe
+        self._probe_locks: Dict[int, asyncio.Lock] = {}
+
+        self._http = httpx.AsyncClient(
+            http2=http2,
+            timeout=timeout_seconds,
+            limits=httpx.Limits(
+                max_connections=pool_maxsize, max_keepalive_connections=pool_maxsize
+            ),
+        )
+
+    async def __aenter__(self) -> "AsyncClient":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        """
+        Closes the underlying HTTP client and every pooled connection it holds.
+        """
+        await self._http.aclose()
+
+    async def _retry_request(
+        self, query: Union[str, Query], authenticator: Optional[Authenticator] = None
+    ) -> httpx.Response:
+        """
+        Tries to send a request multiple times until it succeeds or the retry limit is reached.
+        The variables of a Query are sent in the variables payload alongside its document.
+
+        Args:
+            query (Union[str, Query]): The GraphQL query to execute.
+            authenticator (Optional[Authenticator]): The credential to send the query with.
+        Returns:
+            httpx.Response: The server's response to the HTTP request.
+
+        Raises:
+            httpx.TimeoutException: If all retry attempts are exhausted and the request keeps timing out.
+        """
+        query, payload = self._payload(query)
+        last_exception = None
+        response = None
+        for _ in range(self._retry_attempts):
+            try:
+                response = await self._http.post(
+                    self._base_path(),
+                    json=payload,
+                    headers=self._generate_headers(authenticator),
+                )
+                if response.status_code == 200:
+                    return response
+            except httpx.TimeoutException as e:
+                last_exception = e
+                print("Request timed out. Retrying...")
+        # If this point is reached, all retries have been exhausted
+        if not last_exception:
+            raise QueryFailedException(query=query, response=response)
+        raise httpx.TimeoutException("All retry attempts exhausted.")
+
+    async def _have_limit(
+        self,
+        query: Union[str, Query],
+        authenticator: Optional[Authenticator] = None,
+        budget: Optional[RateLimitBudget] = None,
+    ) -> None:
+        """
+        Probes the API with a dry run of the query and records the cost and remaining rate limit in the budget.
+
+        Args:
+            query (Union[str, Query]): The GraphQL query to estimate.
+            authenticator (Optional[Authenticator]): The credential to probe. Defaults to the client's.
+            budget (Optional[RateLimitBudget]): The budget of the credential. Defaults to the client's.
+        """
+        if budget is None:
+            budget = self._budget
+        rate_limit = await self._retry_request(self._cost_query(query), authenticator)
+        budget.observe(rate_limit.json()["data"]["rateLimit"])
+
+    async def _wait_for_limit(
+        self,
+        query: Union[str, Query],
+        authenticator: Optional[Authenticator] = None,
+        budget: Optional[RateLimitBudget] = None,
+    ) -> None:
+        """
+        Waits, without blocking the event loop, until the budget allows the query to be sent.
+
+        Args:
+            query (Union[str, Query]): The GraphQL query about to be sent.
+            authenticator (Optional[Authenticator]): The credential the query will be sent with.
+            budget (Optional[RateLimitBudget]): The budget of the credential. Defaults to the client's.
+        """
+        if budget is None:
+            budget = self._budget
+        probed = budget.is_stale()
+        if probed:
+            lock = self._probe_locks.setdefault(id(budget), asyncio.Lock())
+            async with lock:
+                # another coroutine may have probed while this one waited for the lock
+                if budget.is_stale():
+                    await self._have_limit(query, authenticator, budget)
+        seconds = budget.wait_seconds(self._retry_attempts)
+        if seconds and not probed:
+            # confirm against the API before sleeping on a locally derived estimate
+            await self._have_limit(query, authenticator, budget)
+            seconds = budget.wait_seconds(self._retry_attempts)
+        if seconds:
+            print("GitHub GraphQL API Rate Limit Exceeded.")
+            print(f"Waiting for {seconds}s.")
+            await asyncio.sleep(seconds + 5)
+            budget.reset()
+
+    async def _execute(self, query: Union[str, Query]) -> Dict[str, Any]:
+        """
+        Executes a query and handles response processing and error checking.
+
+        Args:
+            query (Union[str, Query]): The GraphQL query to execute.
+
+        Returns:
+            Dict[str, Any]: The parsed JSON response from the server.
+
+        Raises:
+            QueryFailedException: If the query execution fails or returns errors.
+        """
+        authenticator, budget = self._credential()
+        await self._wait_for_limit(query, authenticator, budget)
+        budget.consume()
+
+        response = await self._retry_request(query, authenticator)
+        try:
+            json_response = response.json()
+        except ValueError as e:
+            raise QueryFailedException(query=query, response=response) from e
+
+        return self._handle_response(query, response, json_response, budget)
+
+    async def _execution_generator(
+        self, query: PaginatedQuery
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Handles the iteration over paginated query results, yielding each page's data as it's fetched.
+
+        Args:
+            query (PaginatedQuery): The paginated GraphQL query to execute.
+
+        Returns:
+            AsyncGenerator[Dict[str, Any], None]: An async generator yielding each page's data as a dictionary.
+        """
+        while query.paginator.has_next():
+            response = await self._execute(query)
+            self._advance(query, response)
+            yield response
+
+    def execute(
+        self, query: Union[str, Query, PaginatedQuery]
+    ) -> Union[Awaitable[Dict[str, Any]], AsyncGenerator[Dict[str, Any], None]]:
+        """
+        Public method to execute a non-paginated or paginated query.
+
+        Args:
+            query (Union[str, Query, PaginatedQuery]): The GraphQL query to execute.
+        Returns:
+            An awaitable resolving to the response data for a query, or an async generator
+            of page data for a paginated query.
+        """
+        if isinstance(query, PaginatedQuery):
+            return self._execution_generator(query)
+        return self._execute(query)
+
+    async def collect(self, query: PaginatedQuery) -> list:
+        """
+        Fetches every page of a paginated query.
+
+        Args:
+            query (PaginatedQuery): The paginated GraphQL query to execute.
+
+        Returns:
+            list: The data of every page, in order.
+        """
+        return [page async for page in self._execution_generator(query)]
+
+    async def gather(self, *queries: Union[str, Query, PaginatedQuery]) -> list:
+        """
+        Runs several queries concurrently. Paginated queries are fetched to completion.
+
+        Args:
+            *queries (Union[str, Query, PaginatedQuery]): The GraphQL queries to execute.
+
+        Returns:
+            list: One result per query, in the order given; a list of pages for each paginated query.
+        """
+        return await asyncio.gather(
+            *(
+                self.collect(query) if isinstance(query, PaginatedQuery) else self._execute(query)
+                for query in queries
+            )
+        )
@@ -1,4 +1,7 @@
-from typing import Dict
+import hashlib
+import threading
+from typing import Any, Dict, List, Tuple, Union
+from backend.app.services.github_query.github_graphql.rate_limit_budget import RateLimitBudget
 
 
 class Authenticator:
@@ -44,3 +47,137 @@ class PersonalAccessTokenAuthenticator(Authenticator):
                   authentication with the GitHub API using a personal access token.
         """
         return {"Authorization": f"token {self._token}"}
+
+
+class TokenPoolAuthenticator(Authenticator):
+    """
+    TokenPoolAuthenticator spreads queries over several credentials, e.g. personal access tokens and
+    GitHub App installation tokens. Each credential is throttled against its own shared RateLimitBudget,
+    and every query is routed to the credential with the most remaining points, so that a crawl only
+    waits for a rate limit reset once every credential of the pool is exhausted.
+    """
+
+    def __init__(self, tokens: List[Union[str, Authenticator]], host: str = "api.github.com") -> None:
+        """
+        Initializes the pool.
+
+        Args:
+            tokens (List[Union[str, Authenticator]]): The credentials of the pool. Strings are taken as
+                personal access tokens; any other Authenticator is used as is.
+            host (str): The host the credentials are used against, which scopes their budgets like Client does.
+
+        Raises:
+            ValueError: If the pool is empty.
+        """
+        if not tokens:
+            raise ValueError("A token pool needs at least one token")
+        self._host = host
+        self._authenticators: List[Authenticator] = [
+            PersonalAccessTokenAuthenticator(token) if isinstance(token, str) else token
+            for token in tokens
+        ]
+        self._budgets = [
+            RateLimitBudget.for_scope(self.token_scope(authenticator))
+            for authenticator in self._authenticators
+        ]
+        self._requests = [0] * len(self._authenticators)
+        self._lock = threading.Lock()
+
+    def token_scope(self, authenticator: Authenticator) -> str:
+        """
+        Identifies a credential of the pool the same way Client does, so that the pool and single-token
+        clients of the same credential share its budget.
+
+        Args:
+            authenticator (Authenticator): A credential of the pool.
+
+        Returns:
+            str: A digest of the authorization header.
+        """
+        authorization = authenticator.get_authorization_header().get("Authorization", "")
+        return hashlib.sha256(f"{self._host}:{authorization}".encode()).hexdigest()
+
+    def pool_scope(self) -> str:
+        """
+        Identifies the pool as a whole, e.g. to share cached responses between its credentials.
+
+        Returns:
+            str: A digest of the authorization headers of every credential.
+        """
+        scopes = sorted(self.token_scope(authenticator) for authenticator in self._authenticators)
+        return hashlib.sha256("\n".join(scopes).encode()).hexdigest()
+
+    @staticmethod
+    def _headroom(budget: RateLimitBudget) -> float:
+        if budget.remaining is None or budget.is_stale():
+            # never observed, or a new window: assume a full budget, the first query will tell
+            return float("inf")
+        return budget.remaining
+
+    def acquire(self, attempts: int = 1) -> Tuple[Authenticator, RateLimitBudget]:
+        """
+        Picks the credential to send the next query with: the one with the most remaining points among
+        those that can send now, or the one whose window resets first if every credential is exhausted.
+
+        Args:
+            attempts (int): The number of attempts the client may take to send the query, each of which is
+                charged, so a credential is only ready if it can afford all of them.
+
+        Returns:
+            Tuple[Authenticator, RateLimitBudget]: The credential and its budget.
+        """
+        with self._lock:
+            ready = [i for i, budget in enumerate(self._budgets) if budget.wait_seconds(attempts) == 0]
+            if ready:
+                index = max(ready, key=lambda i: self._headroom(self._budgets[i]))
+            else:
+                index = min(range(len(self._budgets)), key=lambda i: self._budgets[i].wait_seconds(attempts))
+            return self._authenticators[index], self._budgets[index]
+
+    def record_request(self, authenticator: Authenticator) -> None:
+        """
+        Counts a request sent with a credential of the pool, for stats().
+
+        Args:
+            authenticator (Authenticator): The credential the request was sent with.
+        """
+        with self._lock:
+            for index, candidate in enumerate(self._authenticators):
+                if candidate is authenticator:
+                    self._requests[index] += 1
+                    return
+
+    def get_authorization_header(self) -> Dict[str, str]:
+        """
+        Returns the authorization header of the credential picked for the next query.
+
+        Returns:
+            dict: The authorization header of the credential with the most headroom.
+        """
+        return self.acquire()[0].get_authorization_header()
+
+    def stats(self) -> List[Dict[str, Any]]:
+        """
+        Reports the utilisation of every credential of the pool.
+
+        Returns:
+            List[Dict[str, Any]]: For each credential, in pool order: the number of requests sent with it,
+            its last known remaining points and limit, the reset time (epoch seconds) and the share of
+            its limit already spent. Unknown values are None.
+        """
+        with self._lock:
+            stats = []
+            for requests, budget in zip(self._requests, self._budgets):
+                utilisation = None
+                if budget.limit and budget.remaining is not None:
+                    utilisation = 1 - max(budget.remaining, 0) / budget.limit
+                stats.append(
+                    {
+                        "requests": requests,
+                        "remaining": budget.remaining,
+                        "limit": budget.limit,
+                        "reset_at": budget.reset_at,
+                        "utilisation": utilisation,
+                    }
+                )
+            return stats
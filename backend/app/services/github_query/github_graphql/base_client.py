@@ -0,0 +1,217 @@
+"""The module defines the BaseClient class, which holds the request building, credential and rate limit
+bookkeeping shared by the blocking Client and the asyncio AsyncClient. The subclasses only add the I/O."""
+
+import re
+import hashlib
+from typing import Union, Optional, Dict, Any, Tuple
+from backend.app.services.github_query.github_graphql.authentication import (
+    Authenticator,
+    TokenPoolAuthenticator,
+)
+from backend.app.services.github_query.github_graphql.query import Query, PaginatedQuery
+from backend.app.services.github_query.github_graphql.rate_limit_budget import RateLimitBudget
+from backend.app.services.github_query.queries.costs.query_cost import QueryCost
+
+
+class InvalidAuthenticationError(Exception):
+    """Exception raised when an authentication object is invalid or not provided."""
+
+
+class QueryFailedException(Exception):
+    """
+    Exception raised when a GraphQL query fails to execute properly.
+    This can be due to various reasons including network issues or logical errors in query construction.
+    """
+
+    def __init__(self, response: Any, query: Optional[str] = None) -> None:
+        # Initializing the exception with the response and query that caused the failure
+        self.response = response
+        self.query = query
+        # Constructing a detailed error message
+        if query:
+            message = (
+                f"Query failed with code {response.status_code}. "
+                f"Query: {query}. Response: {response.text}"
+            )
+        else:
+            message = (
+                f"Query failed with code {response.status_code}. "
+                f"Path: {response.request.path_url}. Response: {response.text}"
+            )
+        super().__init__(message)
+
+
+class BaseClient:
+    """
+    BaseClient is the part of a GitHub GraphQL client that does not depend on how requests are sent:
+    the endpoint, the headers, the credential and budget a query is sent with, the request payload,
+    the dry-run cost query, and the handling of a response.
+    """
+
+    def __init__(
+        self,
+        protocol: str = "https",
+        host: str = "api.github.com",
+        is_enterprise: bool = False,
+        authenticator: Optional[Authenticator] = None,
+        retry_attempts: int = 3,
+        timeout_seconds: int = 10,
+        budget: Optional[RateLimitBudget] = None,
+    ) -> None:
+        """
+        Initializes the configuration and authentication shared by every client.
+
+        Raises:
+            InvalidAuthenticationError: If no authenticator is provided.
+        """
+        self._protocol = protocol
+        self._host = host
+        self._is_enterprise = is_enterprise
+        self._retry_attempts = retry_attempts
+        self._timeout_seconds = timeout_seconds
+
+        if authenticator is None:
+            raise InvalidAuthenticationError("Authentication needs to be specified")
+        self._authenticator = authenticator
+        self._budget = budget if budget is not None else RateLimitBudget.for_scope(self._token_scope())
+
+    def _base_path(self) -> str:
+        """
+        Constructs the base URL path for the GitHub GraphQL API.
+
+        Returns:
+            str: The base URL path for the GitHub GraphQL API.
+        """
+        return f"{self._protocol}://{self._host}/graphql"
+
+    def _generate_headers(self, authenticator: Optional[Authenticator] = None, **kwargs) -> Dict[str, str]:
+        """
+        Generates the necessary headers for making a GraphQL request, including authentication headers.
+
+        Args:
+            authenticator (Optional[Authenticator]): The credential to authenticate with. Defaults to the
+                authenticator of the client.
+            **kwargs: Additional headers to include in the request.
+
+        Returns:
+            Dict[str, str]: A dictionary of headers for the request.
+        """
+        if authenticator is None:
+            authenticator = self._credential()[0]
+        if isinstance(self._authenticator, TokenPoolAuthenticator):
+            # the headers are generated right before each request is sent, retries and probes included
+            self._authenticator.record_request(authenticator)
+        headers = authenticator.get_authorization_header()
+        headers.update(kwargs)
+        return headers
+
+    def _token_scope(self) -> str:
+        """
+        Identifies the token used by this client without keeping the token itself, so the clients of
+        one token, blocking or asynchronous, share a budget.
+
+        Returns:
+            str: A digest of the authorization header.
+        """
+        if isinstance(self._authenticator, TokenPoolAuthenticator):
+            return self._authenticator.pool_scope()
+        authorization = self._authenticator.get_authorization_header().get("Authorization", "")
+        return hashlib.sha256(f"{self._host}:{authorization}".encode()).hexdigest()
+
+    def _credential(self) -> Tuple[Authenticator, RateLimitBudget]:
+        """
+        Picks the credential to send the next query with, and the budget it is throttled against.
+        A token pool routes each query to its credential with the most headroom.
+
+        Returns:
+            Tuple[Authenticator, RateLimitBudget]: The credential and its budget.
+        """
+        if isinstance(self._authenticator, TokenPoolAuthenticator):
+            return self._authenticator.acquire(self._retry_attempts)
+        return self._authenticator, self._budget
+
+    @staticmethod
+    def _payload(query: Union[str, Query]) -> Tuple[str, Dict[str, Any]]:
+        """
+        Builds the JSON body of a request. The variables of a Query are sent alongside its document.
+
+        Args:
+            query (Union[str, Query]): The GraphQL query to send.
+
+        Returns:
+            Tuple[str, Dict[str, Any]]: The query document and the request body.
+        """
+        variables = query.get_variables() if isinstance(query, Query) else None
+        if isinstance(query, Query):
+            query = query.get_query()
+        payload = {"query": query}
+        if variables:
+            payload["variables"] = variables
+        return query, payload
+
+    @staticmethod
+    def _cost_query(query: Union[str, Query]) -> QueryCost:
+        """
+        Builds the dry run of a query, which reports its cost and the remaining rate limit.
+
+        Args:
+            query (Union[str, Query]): The GraphQL query to estimate.
+
+        Returns:
+            QueryCost: The dry-run query.
+        """
+        if isinstance(query, Query):
+            content, variables = query.get_body(), query.get_variable_definitions()
+        else:
+            content = re.search(r"query\s*{(?P<content>.+)}", query).group("content")
+            variables = None
+        return QueryCost(content, dryrun=True, variables=variables)
+
+    @staticmethod
+    def _handle_response(
+        query: Union[str, Query], response: Any, json_response: Dict[str, Any], budget: RateLimitBudget
+    ) -> Dict[str, Any]:
+        """
+        Records the rate limit reported by a response in the budget, and extracts its data.
+
+        Args:
+            query (Union[str, Query]): The GraphQL query that was sent.
+            response (Any): The HTTP response.
+            json_response (Dict[str, Any]): The parsed body of the response.
+            budget (RateLimitBudget): The budget of the credential the query was sent with.
+
+        Returns:
+            Dict[str, Any]: The data of the response.
+
+        Raises:
+            QueryFailedException: If the query failed or returned errors, unless the query accepts partial
+                data and some data came back.
+        """
+        budget.observe_headers(response.headers)
+        if isinstance(json_response.get("data"), dict) and "rateLimit" in json_response["data"]:
+            budget.observe(json_response["data"]["rateLimit"])
+
+        if response.status_code == 200 and "errors" not in json_response:
+            return json_response["data"]
+        if (
+            response.status_code == 200
+            and getattr(query, "accepts_partial_data", False)
+            and isinstance(json_response.get("data"), dict)
+        ):
+            # the fields that failed, e.g. a login that does not exist, are null in the data
+            return json_response["data"]
+        raise QueryFailedException(query=query, response=response)
+
+    @staticmethod
+    def _advance(query: PaginatedQuery, response: Dict[str, Any]) -> None:
+        """
+        Moves the paginator of a query past the page it just received.
+
+        Args:
+            query (PaginatedQuery): The paginated GraphQL query.
+            response (Dict[str, Any]): The data of the page.
+        """
+        curr_node = response
+        for field_name in query.path:
+            curr_node = curr_node[field_name]
+        query.paginator.update_paginator(curr_node["pageInfo"]["hasNextPage"], curr_node["pageInfo"]["endCursor"])
@@ -0,0 +1,200 @@
+"""The module defines the BatchedQuery class, which packs several single-subject queries into one GraphQL
+document using field aliases, and helpers to size batches by cost and to split the response back apart."""
+
+import math
+from typing import Any, Dict, Generator, List, Optional, Tuple
+from backend.app.services.github_query.github_graphql.query import QueryNode, Query, PaginatedQuery, QueryVariable
+
+
+def estimate_cost(node: QueryNode, multiplier: int = 1) -> int:
+    """
+    Estimates the number of connection requests a query tree asks of the API, following GitHub's cost model:
+    every connection is requested once per parent item, and the parent items of a connection are the
+    product of the page sizes of the connections above it.
+
+    Args:
+        node (QueryNode): The root of the query tree.
+        multiplier (int): The number of times the node itself is requested.
+
+    Returns:
+        int: The estimated number of connection requests. Divide by 100 for the rate limit cost.
+    """
+    requests = 0
+    for field in node.get_connected_nodes():
+        first = (field.args or {}).get("first")
+        if isinstance(first, int):
+            requests += multiplier
+            requests += estimate_cost(field, multiplier * first)
+        else:
+            requests += estimate_cost(field, multiplier)
+    return requests
+
+
+def _prefix_variables(value: Any, prefix: str) -> Any:
+    """
+    Renames the variables of an argument value, so that the same variable of several packed queries
+    can be sent with a different value for each of them.
+
+    Args:
+        value (Any): The argument value: a variable, a dict of argument values, or a literal.
+        prefix (str): The prefix of the new variable names.
+
+    Returns:
+        Any: The value, with every variable replaced by a renamed copy.
+    """
+    if isinstance(value, QueryVariable):
+        return QueryVariable(f"{prefix}_{value.name}", value.type_name, value.value)
+    if isinstance(value, dict):
+        return {key: _prefix_variables(v, prefix) for key, v in value.items()}
+    return value
+
+
+def _prefix_node(node: QueryNode, prefix: str, name: Optional[str] = None) -> QueryNode:
+    """
+    Copies a query tree, renaming the variables of its arguments with _prefix_variables.
+
+    Args:
+        node (QueryNode): The root of the tree to copy.
+        prefix (str): The prefix of the new variable names.
+        name (Optional[str]): The name of the copy of the root. Defaults to the name of the root.
+
+    Returns:
+        QueryNode: The copy.
+    """
+    return QueryNode(
+        node.name if name is None else name,
+        fields=[_prefix_node(field, prefix) if isinstance(field, QueryNode) else field for field in node.fields],
+        args=None if node.args is None else {key: _prefix_variables(v, prefix) for key, v in node.args.items()},
+    )
+
+
+def rate_limit_cost(query: QueryNode) -> int:
+    """
+    Estimates the rate limit points charged for a query.
+
+    Args:
+        query (QueryNode): The query to estimate.
+
+    Returns:
+        int: The estimated cost, at least 1 like every query charged by GitHub.
+    """
+    return max(1, math.ceil(estimate_cost(query) / 100))
+
+
+class BatchedQuery(Query):
+    """
+    BatchedQuery combines the top-level fields of several queries into a single document. Every top-level
+    field is aliased (u0: user(login: "a") { ... }), so the same field can be requested for many subjects
+    in one HTTP request. split_response() turns the aliased response back into one response per query,
+    in the shape the static parsers of the individual query classes expect.
+    A subject that cannot be resolved, e.g. a login that does not exist, only nulls its own alias: the
+    rest of the batch is still returned.
+    The variables of each packed query are renamed after its alias ($u0_login, $u1_login, ...), so the
+    document of a batch only depends on the shape of its queries, not on their logins or dates.
+    """
+
+    # GitHub answers a batch with a NOT_FOUND error and a null alias for every missing subject
+    accepts_partial_data = True
+
+    def __init__(self, queries: List[Query], prefix: str = "u") -> None:
+        """
+        Initializes a BatchedQuery from the queries to pack.
+
+        Args:
+            queries (List[Query]): The queries to combine. Paginated queries cannot be batched,
+                since each of them carries its own cursor.
+            prefix (str): The prefix of the generated aliases.
+
+        Raises:
+            ValueError: If no queries are given, a paginated query is given, or a query declares variables
+                used by its string fields, which cannot be renamed.
+        """
+        if not queries:
+            raise ValueError("At least one query is required for a batch")
+        self.aliases: List[List[Tuple[str, str]]] = []
+        fields = []
+        for i, query in enumerate(queries):
+            if isinstance(query, PaginatedQuery):
+                raise ValueError("Paginated queries cannot be batched")
+            if query.variables:
+                raise ValueError("Queries with explicitly declared variables cannot be batched")
+            nodes = query.get_connected_nodes()
+            query_aliases = []
+            for j, node in enumerate(nodes):
+                alias = f"{prefix}{i}" if len(nodes) == 1 else f"{prefix}{i}_{j}"
+                query_aliases.append((alias, node.name))
+                fields.append(_prefix_node(node, alias, name=f"{alias}: {node.name}"))
+            self.aliases.append(query_aliases)
+        super().__init__(fields=fields)
+
+    def split_response(self, raw_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Splits the response of the batched query into one response per packed query.
+
+        Args:
+            raw_data (Dict[str, Any]): The data returned for the batched query.
+
+        Returns:
+            List[Dict[str, Any]]: The data of each packed query, keyed by the original field names,
+            e.g. {"user": {...}}, in the order the queries were given. The fields of a subject that
+            could not be resolved are None.
+        """
+        return [
+            {name: raw_data.get(alias) for alias, name in query_aliases}
+            for query_aliases in self.aliases
+        ]
+
+    @staticmethod
+    def batches(
+        queries: List[Query], max_cost: int = 100, max_size: int = 50
+    ) -> Generator["BatchedQuery", None, None]:
+        """
+        Groups queries into batches whose estimated cost and size stay under the given limits.
+
+        Args:
+            queries (List[Query]): The queries to group.
+            max_cost (int): The maximum estimated rate limit cost of a batch. Keeping it low also keeps
+                the server-side work, and so the risk of a timeout, of each request bounded.
+            max_size (int): The maximum number of queries per batch.
+
+        Returns:
+            Generator[BatchedQuery, None, None]: The batches, preserving the order of the queries.
+        """
+        batch: List[Query] = []
+        batch_requests = 0
+        for query in queries:
+            requests = estimate_cost(query)
+            if batch and (
+                len(batch) >= max_size
+                or math.ceil((batch_requests + requests) / 100) > max_cost
+            ):
+                yield BatchedQuery(batch)
+                batch, batch_requests = [], 0
+            batch.append(query)
+            batch_requests += requests
+        if batch:
+            yield BatchedQuery(batch)
+
+
+def execute_batched(
+    client: Any, queries: List[Query], max_cost: int = 100, max_size: int = 50
+) -> List[Optional[Dict[str, Any]]]:
+    """
+    Executes queries through a client in as few requests as the batch limits allow.
+
+    Args:
+        client (Client): The client used to send the batches.
+        queries (List[Query]): The queries to execute.
+        max_cost (int): The maximum estimated rate limit cost of a batch.
+        max_size (int): The maximum number of queries per batch.
+
+    Returns:
+        List[Optional[Dict[str, Any]]]: The data of each query, in the order the queries were given.
+
+    Raises:
+        QueryFailedException: If a batch returned no data at all.
+    """
+    results = []
+    for batch in BatchedQuery.batches(queries, max_cost=max_cost, max_size=max_size):
+        results.extend(batch.split_response(client.execute(batch)))
+    return results
@@ -0,0 +1,224 @@
+"""The module defines the QueryCache class, a two-tier (in-process LRU and on-disk SQLite) cache of GraphQL
+responses keyed on the normalized query text and the token that sent it."""
+
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+# Time to live, in seconds, of the responses of each query class. None never expires, 0 disables caching.
+# Query classes without an entry are not cached unless they decide their own time to live.
+DEFAULT_TTLS: Dict[str, Optional[float]] = {
+    "UserProfileStats": 300,
+    "UserLogin": 3600,
+    "UserLoginViewer": 3600,
+    "UserContributionsCollection": 300,
+    "QueryCost": 0,
+    "RateLimit": 0,
+}
+
+
+class QueryCache:
+    """
+    QueryCache stores GraphQL responses in a bounded in-process LRU tier backed by an optional, also bounded,
+    SQLite tier that survives restarts. Entries expire according to a time to live chosen per query class;
+    a query object may also decide its own time to live through a cache_ttl() method, e.g. a contributions
+    window that has already closed can never change and is kept forever. Caching is opt-in: raw query
+    strings, mutations and query classes with neither an entry nor a cache_ttl() method are never cached.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        max_entries: int = 1024,
+        max_disk_entries: int = 100000,
+        ttls: Optional[Dict[str, Optional[float]]] = None,
+        default_ttl: Optional[float] = None,
+    ) -> None:
+        """
+        Initializes the cache.
+
+        Args:
+            path (Optional[str]): The SQLite file of the on-disk tier. Only the in-process tier is used if omitted.
+            max_entries (int): The maximum number of responses kept in memory.
+            max_disk_entries (int): The maximum number of responses kept on disk.
+            ttls (Optional[Dict[str, Optional[float]]]): Time to live per query class name, merged over DEFAULT_TTLS.
+            default_ttl (Optional[float]): Time to live of query classes without an entry in ttls. They are not
+                cached if omitted.
+        """
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+        self.default_ttl = default_ttl
+        self._memory: "OrderedDict[str, Tuple[str, Optional[float]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+        self._db = None
+        self._disk_entries = 0
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS query_cache ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL, accessed_at REAL NOT NULL)"
+            )
+            self._db.execute(
+                "CREATE INDEX IF NOT EXISTS ix_query_cache_accessed_at ON query_cache (accessed_at)"
+            )
+            self._db.commit()
+            self._disk_entries = self._db.execute("SELECT COUNT(*) FROM query_cache").fetchone()[0]
+
+    @staticmethod
+    def key(query: str, scope: str) -> str:
+        """
+        Builds the cache key of a query sent with a given token.
+
+        Args:
+            query (str): The GraphQL query text. Whitespace differences do not change the key.
+            scope (str): An identifier of the token, so that responses are never shared between tokens.
+
+        Returns:
+            str: The cache key.
+        """
+        normalized = re.sub(r"\s+", " ", query).strip()
+        return hashlib.sha256(f"{scope}\n{normalized}".encode()).hexdigest()
+
+    def ttl_for(self, query: Any) -> Optional[float]:
+        """
+        Determines how long the response of a query may be cached.
+
+        Args:
+            query (Any): The query object, or a query string.
+
+        Returns:
+            Optional[float]: The time to live in seconds, None to never expire, 0 to not cache.
+        """
+        if isinstance(query, str) or str(query).lstrip().startswith("mutation"):
+            return 0
+        if hasattr(query, "cache_ttl"):
+            return query.cache_ttl()
+        name = type(query).__name__
+        if name in self.ttls:
+            return self.ttls[name]
+        return 0 if self.default_ttl is None else self.default_ttl
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """
+        Looks a response up, first in memory, then on disk.
+
+        Args:
+            key (str): The cache key.
+
+        Returns:
+            Optional[Dict[str, Any]]: A copy of the cached response, or None on a miss.
+        """
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None and (entry[1] is None or entry[1] > now):
+                self._memory.move_to_end(key)
+                self._stats["hits"] += 1
+                self._stats["memory_hits"] += 1
+                return json.loads(entry[0])
+            if entry is not None:
+                del self._memory[key]
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value, expires_at FROM query_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None and (row[1] is None or row[1] > now):
+                    self._db.execute("UPDATE query_cache SET accessed_at = ? WHERE key = ?", (now, key))
+                    self._db.commit()
+                    self._remember(key, row[0], row[1])
+                    self._stats["hits"] += 1
+                    self._stats["disk_hits"] += 1
+                    return json.loads(row[0])
+            self._stats["misses"] += 1
+            return None
+
+    def put(self, key: str, value: Dict[str, Any], ttl: Optional[float]) -> None:
+        """
+        Stores a response in both tiers.
+
+        Args:
+            key (str): The cache key.
+            value (Dict[str, Any]): The response data.
+            ttl (Optional[float]): The time to live in seconds, None to never expire. 0 stores nothing.
+        """
+        if ttl == 0:
+            return
+        now = time.time()
+        expires_at = None if ttl is None else now + ttl
+        serialized = json.dumps(value)
+        with self._lock:
+            self._remember(key, serialized, expires_at)
+            if self._db is not None:
+                # a running count of the rows, so a put never scans the table
+                exists = self._db.execute("SELECT 1 FROM query_cache WHERE key = ?", (key,)).fetchone()
+                self._db.execute(
+                    "INSERT OR REPLACE INTO query_cache (key, value, expires_at, accessed_at) VALUES (?, ?, ?, ?)",
+                    (key, serialized, expires_at, now),
+                )
+                if exists is None:
+                    self._disk_entries += 1
+                overflow = self._disk_entries - self.max_disk_entries
+                if overflow > 0:
+                    deleted = self._db.execute(
+                        "DELETE FROM query_cache WHERE key IN "
+                        "(SELECT key FROM query_cache ORDER BY accessed_at LIMIT ?)",
+                        (overflow,),
+                    ).rowcount
+                    self._disk_entries -= deleted
+                    self._stats["evictions"] += deleted
+                self._db.commit()
+
+    def _remember(self, key: str, serialized: str, expires_at: Optional[float]) -> None:
+        self._memory[key] = (serialized, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def clear(self) -> None:
+        """
+        Removes every entry from both tiers.
+        """
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM query_cache")
+                self._db.commit()
+                self._disk_entries = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Reports the cache metrics.
+
+        Returns:
+            Dict[str, int]: Hits (split by tier), misses, evictions and the number of entries in memory.
+        """
+        with self._lock:
+            return dict(self._stats, memory_entries=len(self._memory))
+
+
+_default_cache: Optional[QueryCache] = None
+_default_cache_lock = threading.Lock()
+
+
+def get_default_cache() -> QueryCache:
+    """
+    Returns the process-wide cache shared by the service layer. The on-disk tier is enabled when the
+    GRAPHQL_CACHE_PATH environment variable names a SQLite file.
+
+    Returns:
+        QueryCache: The shared cache.
+    """
+    global _default_cache
+    with _default_cache_lock:
+        if _default_cache is None:
+            _default_cache = QueryCache(path=os.environ.get("GRAPHQL_CACHE_PATH"))
+        return _default_cache
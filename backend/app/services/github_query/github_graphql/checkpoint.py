@@ -0,0 +1,124 @@
+"""The module defines the CheckpointStore class, which persists crawl progress (cursors, last seen commits
+and partial aggregates) so that later crawls can continue from it instead of starting over."""
+
+import os
+import json
+import logging
+import time
+import sqlite3
+import threading
+from typing import Any, Dict, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointStore:
+    """
+    CheckpointStore keeps one JSON document per (kind, subject) pair in a SQLite file, e.g. the
+    ("repository_commits", "owner/repo") checkpoint of an incremental commit sync.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Initializes the store, creating its table if needed.
+
+        Args:
+            path (str): The SQLite file holding the checkpoints. ":memory:" keeps them in a private
+                in-memory database, whose checkpoints are lost on exit.
+        """
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS crawl_checkpoint ("
+            "kind TEXT NOT NULL, subject TEXT NOT NULL, value TEXT NOT NULL, updated_at REAL NOT NULL, "
+            "PRIMARY KEY (kind, subject))"
+        )
+        self._db.commit()
+
+    def get(self, kind: str, subject: str) -> Optional[Dict[str, Any]]:
+        """
+        Loads a checkpoint.
+
+        Args:
+            kind (str): The kind of crawl, usually the query class.
+            subject (str): What was crawled, e.g. a repository or a user.
+
+        Returns:
+            Optional[Dict[str, Any]]: The checkpoint, or None if there is none.
+        """
+        with self._lock:
+            row = self._db.execute(
+                "SELECT value FROM crawl_checkpoint WHERE kind = ? AND subject = ?", (kind, subject)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put(self, kind: str, subject: str, value: Dict[str, Any]) -> None:
+        """
+        Saves a checkpoint, replacing the previous one.
+
+        Args:
+            kind (str): The kind of crawl, usually the query class.
+            subject (str): What was crawled, e.g. a repository or a user.
+            value (Dict[str, Any]): A JSON-serializable checkpoint.
+        """
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO crawl_checkpoint (kind, subject, value, updated_at) VALUES (?, ?, ?, ?)",
+                (kind, subject, json.dumps(value), time.time()),
+            )
+            self._db.commit()
+
+    def delete(self, kind: str, subject: str) -> None:
+        """
+        Removes a checkpoint, if any.
+
+        Args:
+            kind (str): The kind of crawl, usually the query class.
+            subject (str): What was crawled, e.g. a repository or a user.
+        """
+        with self._lock:
+            self._db.execute(
+                "DELETE FROM crawl_checkpoint WHERE kind = ? AND subject = ?", (kind, subject)
+            )
+            self._db.commit()
+
+
+_default_store: Optional[CheckpointStore] = None
+_default_store_path: Optional[str] = None
+_default_store_lock = threading.Lock()
+
+
+def configure_checkpoint_store(path: str) -> None:
+    """
+    Sets the SQLite file of the process-wide checkpoint store, e.g. from the configuration of the app.
+    The GRAPHQL_CHECKPOINT_PATH environment variable takes precedence.
+
+    Args:
+        path (str): The SQLite file holding the checkpoints.
+    """
+    global _default_store, _default_store_path
+    with _default_store_lock:
+        if _default_store_path != path:
+            _default_store_path = path
+            _default_store = None
+
+
+def get_default_checkpoint_store() -> CheckpointStore:
+    """
+    Returns the process-wide checkpoint store, persisted to the SQLite file named by the
+    GRAPHQL_CHECKPOINT_PATH environment variable, or else by configure_checkpoint_store. Outside a
+    configured app, e.g. in scripts or tests, checkpoints are kept in memory: they still let a failed
+    crawl resume within the process, but not after it exits.
+
+    Returns:
+        CheckpointStore: The shared store.
+    """
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            path = os.environ.get("GRAPHQL_CHECKPOINT_PATH") or _default_store_path
+            if not path:
+                logger.warning("No checkpoint file is configured, crawl checkpoints are kept in memory")
+            _default_store = CheckpointStore(path or ":memory:")
+        return _default_store
@@ -1,46 +1,26 @@
-import re
+import json
 import time
+import hashlib
 from datetime import datetime, timezone
-from typing import Union, Optional, Dict, Any, Generator, Tuple
+from typing import Union, Optional, Dict, Any, Generator, Tuple, Callable
 import requests
+from requests.adapters import HTTPAdapter
 from requests.exceptions import Timeout, RequestException
 from requests import Response
-from backend.app.services.github_query.github_graphql.authentication import (
-    Authenticator,
+from backend.app.services.github_query.github_graphql.authentication import Authenticator
+from backend.app.services.github_query.github_graphql.base_client import (
+    BaseClient,
+    InvalidAuthenticationError,
+    QueryFailedException,
 )
 from backend.app.services.github_query.github_graphql.query import Query, PaginatedQuery
-from backend.app.services.github_query.queries.costs.query_cost import QueryCost
+from backend.app.services.github_query.github_graphql.rate_limit_budget import RateLimitBudget
+from backend.app.services.github_query.github_graphql.single_flight import SingleFlight
+from backend.app.services.github_query.github_graphql.cache import QueryCache
+from backend.app.services.github_query.github_graphql.checkpoint import CheckpointStore, get_default_checkpoint_store
 
 
-class InvalidAuthenticationError(Exception):
-    """Exception raised when an authentication object is invalid or not provided."""
-
-
-class QueryFailedException(Exception):
-    """
-    Exception raised when a GraphQL query fails to execute properly.
-    This can be due to various reasons including network issues or logical errors in query construction.
-    """
-
-    def __init__(self, response: Response, query: Optional[str] = None) -> None:
-        # Initializing the exception with the response and query that caused the failure
-        self.response = response
-        self.query = query
-        # Constructing a detailed error message
-        if query:
-            message = (
-                f"Query failed with code {response.status_code}. "
-                f"Query: {query}. Response: {response.text}"
-            )
-        else:
-            message = (
-                f"Query failed with code {response.status_code}. "
-                f"Path: {response.request.path_url}. Response: {response.text}"
-            )
-        super().__init__(message)
-
-
-class Client:
+class Client(BaseClient):
     """
     Client is a class that sends the given GraphQL queries to the GitHub GraphQL API and returns the query results.
     The class is responsible for constructing requests, executing them, handling errors, and managing pagination.
@@ -55,6 +35,13 @@ class Client:
         authenticator: Optional[Authenticator] = None,
         retry_attempts: int = 3,
         timeout_seconds: int = 10,
+        pool_connections: int = 1,
+        pool_maxsize: int = 10,
+        keep_alive: bool = True,
+        session: Optional[requests.Session] = None,
+        budget: Optional[RateLimitBudget] = None,
+        cache: Optional[QueryCache] = None,
+        single_flight: Optional[SingleFlight] = None,
     ) -> None:
         """
         Initializes the client with the necessary configuration and authentication.
@@ -66,69 +53,105 @@ class Client:
             authenticator (Optional[Authenticator]): The authenticator instance for handling authentication.
             retry_attempts (int): The number of times to retry the request before giving up.
             timeout_seconds (int): The number of seconds to wait for a response before timing out.
+            pool_connections (int): The number of host pools kept by the underlying connection pool manager.
+            pool_maxsize (int): The maximum number of persistent connections kept open per host.
+            keep_alive (bool): Whether connections are kept open and reused between requests.
+            session (Optional[requests.Session]): An existing session to send requests through, allowing
+                several clients to share one connection pool. A new session is created if omitted. A
+                borrowed session is used as is: pool_connections, pool_maxsize and keep_alive only
+                configure a session created by the client, and close() leaves it open.
+            budget (Optional[RateLimitBudget]): The rate limit budget to throttle against. Defaults to the
+                budget shared by every client using the same token.
+            cache (Optional[QueryCache]): A cache of non-paginated query responses. Responses are not cached if omitted.
+            single_flight (Optional[SingleFlight]): Coalesces identical non-paginated queries sent concurrently
+                with the same token into one request. Every query is sent on its own if omitted.
 
         Raises:
             InvalidAuthenticationError: If no authenticator is provided or if the provided authenticator is invalid.
         """
-        self._protocol = protocol
-        self._host = host
-        self._is_enterprise = is_enterprise
-        self._retry_attempts = retry_attempts
-        self._timeout_seconds = timeout_seconds
+        super().__init__(protocol, host, is_enterprise, authenticator, retry_attempts, timeout_seconds, budget)
+
+        # a persistent session keeps the TCP+TLS connection to the API open across pages and retries.
+        # A borrowed session is left as configured by its owner, so the clients sharing it share its pool.
+        self._owns_session = session is None
+        if self._owns_session:
+            self._session = requests.Session()
+            self._session.mount(f"{self._protocol}://", HTTPAdapter(
+                pool_connections=pool_connections,
+                pool_maxsize=pool_maxsize,
+                pool_block=True,
+            ))
+            if not keep_alive:
+                self._session.headers["Connection"] = "close"
+        else:
+            self._session = session
+        self._adapter = self._session.get_adapter(self._base_path())
 
-        if authenticator is None:
-            raise InvalidAuthenticationError("Authentication needs to be specified")
-        self._authenticator = authenticator
+        self._cache = cache
+        self._single_flight = single_flight
 
-    def _base_path(self) -> str:
-        """
-        Constructs the base URL path for the GitHub GraphQL API.
+    def __enter__(self) -> "Client":
+        return self
 
-        Returns:
-            str: The base URL path for the GitHub GraphQL API.
-        """
-        return (
-            f"{self._protocol}://{self._host}/graphql"
-            if self._is_enterprise
-            else f"{self._protocol}://{self._host}/graphql"
-        )
+    def __exit__(self, *exc_info) -> None:
+        self.close()
 
-    def _generate_headers(self, **kwargs) -> Dict[str, str]:
+    def close(self) -> None:
+        """
+        Closes the underlying session and every pooled connection it holds, unless the session was
+        passed in, in which case closing it is left to its owner.
         """
-        Generates the necessary headers for making a GraphQL request, including authentication headers.
+        if self._owns_session:
+            self._session.close()
 
-        Args:
-            **kwargs: Additional headers to include in the request.
+    def pool_stats(self) -> Dict[str, int]:
+        """
+        Reports how well the connection pool is being reused.
 
         Returns:
-            Dict[str, str]: A dictionary of headers for the request.
+            Dict[str, int]: The number of requests sent through the pool, the number of connections
+            that had to be opened (misses) and the number of requests served by an already open
+            connection (hits). For a shared session, these cover every client using it.
         """
-        headers = self._authenticator.get_authorization_header()
-        headers.update(kwargs)
-        return headers
-
-    def _retry_request(self, query: str) -> Response:
+        requests_sent, connections_opened = 0, 0
+        pools = self._adapter.poolmanager.pools
+        for key in pools.keys():
+            pool = pools.get(key)
+            if pool is None:
+                continue
+            requests_sent += pool.num_requests
+            connections_opened += pool.num_connections
+        return {
+            "requests": requests_sent,
+            "hits": requests_sent - connections_opened,
+            "misses": connections_opened,
+        }
+
+    def _retry_request(
+        self, query: str, authenticator: Optional[Authenticator] = None
+    ) -> Response:
         """
         Tries to send a request multiple times until it succeeds or the retry limit is reached.
+        The variables of a Query are sent in the variables payload alongside its document.
 
         Args:
             query (Union[str, Query]): The GraphQL query to execute.
+            authenticator (Optional[Authenticator]): The credential to send the query with.
         Returns:
             Response: The server's response to the HTTP request.
 
         Raises:
             Timeout: If all retry attempts are exhausted and the request keeps timing out.
         """
-        if isinstance(query, Query):
-            query = query.get_query()
+        query, payload = self._payload(query)
         last_exception = None
         response = None
         for _ in range(self._retry_attempts):
             try:
-                response = requests.post(
+                response = self._session.post(
                     self._base_path(),
-                    json={"query": query},
-                    headers=self._generate_headers(),
+                    json=payload,
+                    headers=self._generate_headers(authenticator),
                     timeout=self._timeout_seconds,
                 )
                 if response.status_code == 200:
@@ -141,14 +164,30 @@ class Client:
             raise QueryFailedException(query=query, response=response)
         raise Timeout("All retry attempts exhausted.")
 
-    def _have_limit(self, query: Union[str, Query]) -> Tuple[bool, str]:
-        if isinstance(query, Query):
-            query = query.get_query()
-        match = re.search(r"query\s*{(?P<content>.+)}", query)
+    def _have_limit(
+        self,
+        query: Union[str, Query],
+        authenticator: Optional[Authenticator] = None,
+        budget: Optional[RateLimitBudget] = None,
+    ) -> Tuple[bool, str]:
+        """
+        Probes the API with a dry run of the query to learn its cost and the remaining rate limit,
+        and records the result in the budget.
+
+        Args:
+            query (Union[str, Query]): The GraphQL query to estimate.
+            authenticator (Optional[Authenticator]): The credential to probe. Defaults to the client's.
+            budget (Optional[RateLimitBudget]): The budget of the credential. Defaults to the client's.
+
+        Returns:
+            Tuple[bool, str]: Whether the query has to wait for the rate limit to reset, and the reset time.
+        """
+        if budget is None:
+            budget = self._budget
         # pre-calculate the cost of the upcoming graphql query
-        rate_query = QueryCost(match.group("content"), dryrun=True).get_query()
-        rate_limit = self._retry_request(rate_query)
+        rate_limit = self._retry_request(self._cost_query(query), authenticator)
         rate_limit = rate_limit.json()["data"]["rateLimit"]
+        budget.observe(rate_limit)
         cost, remaining, reset_at = (
             rate_limit["cost"],
             rate_limit["remaining"],
@@ -156,6 +195,43 @@ class Client:
         )
         return (self._retry_attempts * cost > remaining, reset_at)
 
+    def _wait_for_limit(
+        self,
+        query: Union[str, Query],
+        authenticator: Optional[Authenticator] = None,
+        budget: Optional[RateLimitBudget] = None,
+    ) -> None:
+        """
+        Blocks until the budget allows the query to be sent. The decision is made locally from the
+        budget, and the API is only probed when the estimate is stale or a wait has to be confirmed.
+
+        Args:
+            query (Union[str, Query]): The GraphQL query about to be sent.
+            authenticator (Optional[Authenticator]): The credential the query will be sent with.
+            budget (Optional[RateLimitBudget]): The budget of the credential. Defaults to the client's.
+        """
+        if budget is None:
+            budget = self._budget
+        probed = budget.is_stale()
+        if probed:
+            with budget.probe_lock:
+                # another thread may have probed while this one waited for the lock
+                if budget.is_stale():
+                    self._have_limit(query, authenticator, budget)
+        seconds = budget.wait_seconds(self._retry_attempts)
+        if seconds and not probed:
+            # confirm against the API before sleeping on a locally derived estimate
+            self._have_limit(query, authenticator, budget)
+            seconds = budget.wait_seconds(self._retry_attempts)
+        if seconds:
+            current_time = datetime.now(timezone.utc)
+            print("GitHub GraphQL API Rate Limit Exceeded.")
+            print(f"Stop at {current_time}s.")
+            print(f"Waiting for {seconds}s.")
+            time.sleep(seconds + 5)
+            budget.reset()
+            # TBD: display the reset time in the frontend
+
     def _execute(self, query: Union[str, Query]) -> Dict[str, Any]:
         """
         Executes a query and handles response processing and error checking.
@@ -169,32 +245,17 @@ class Client:
         Raises:
             QueryFailedException: If the query execution fails or returns errors.
         """
-        no_limit, reset_at = self._have_limit(query)
-        # if the cost of the upcoming graphql query larger than avaliable ratelimit,
-        # wait till ratelimit reset
-        if no_limit:
-            current_time = datetime.now(timezone.utc)
-            reset_at = datetime.strptime(reset_at, "%Y-%m-%dT%H:%M:%SZ").replace(
-                tzinfo=timezone.utc
-            )
-            time_diff = reset_at - current_time
-            seconds = time_diff.total_seconds()
-            print("GitHub GraphQL API Rate Limit Exceeded.")
-            print(f"Stop at {current_time}s.")
-            print(f"Waiting for {seconds}s.")
-            print(f"Reset at {reset_at}s.")
-            time.sleep(seconds + 5)
-            # TBD: display the reset time in the frontend
+        authenticator, budget = self._credential()
+        self._wait_for_limit(query, authenticator, budget)
+        budget.consume()
 
-        response = self._retry_request(query)
+        response = self._retry_request(query, authenticator)
         try:
             json_response = response.json()
         except RequestException as e:
             raise QueryFailedException(query=query, response=response) from e
 
-        if response.status_code == 200 and "errors" not in json_response:
-            return json_response["data"]
-        raise QueryFailedException(query=query, response=response)
+        return self._handle_response(query, response, json_response, budget)
 
     def _execution_generator(
         self, query: PaginatedQuery
@@ -210,15 +271,59 @@ class Client:
         """
         while query.paginator.has_next():
             response = self._execute(query)
-            curr_node = response
+            self._advance(query, response)
+            yield response
 
-            for field_name in query.path:
-                curr_node = curr_node[field_name]
+    def execute_resumable(
+        self,
+        query: PaginatedQuery,
+        reduce: Callable[[Any, Dict[str, Any]], Any],
+        initial: Any = None,
+        subject: Optional[str] = None,
+        store: Optional[CheckpointStore] = None,
+    ) -> Any:
+        """
+        Folds every page of a paginated query into an aggregate, checkpointing the end cursor and the partial
+        aggregate after each page. A crawl that failed midway resumes from its checkpoint instead of fetching
+        the pages it already folded again; the checkpoint is removed once the last page is folded.
 
-            end_cursor = curr_node["pageInfo"]["endCursor"]
-            has_next_page = curr_node["pageInfo"]["hasNextPage"]
-            query.paginator.update_paginator(has_next_page, end_cursor)
-            yield response
+        Args:
+            query (PaginatedQuery): The paginated GraphQL query to execute, not started yet.
+            reduce (Callable[[Any, Dict[str, Any]], Any]): Folds a page into the aggregate and returns it.
+                The aggregate must be JSON-serializable.
+            initial (Any): The aggregate before the first page.
+            subject (Optional[str]): What is crawled, e.g. "owner/repo"; checkpoints are kept per query class
+                and subject. Defaults to a digest of the query and its variables.
+            store (Optional[CheckpointStore]): Where checkpoints are kept. Defaults to the process-wide store,
+                backed by the file configured through GRAPHQL_CHECKPOINT_PATH or configure_checkpoint_store, or
+                kept in memory if none is.
+
+        Returns:
+            Any: The aggregate of every page.
+        """
+        store = store if store is not None else get_default_checkpoint_store()
+        kind = f"{type(query).__name__}.pages"
+        if subject is None:
+            text = query.get_query() + "\n" + json.dumps(query.get_variables(), sort_keys=True)
+            subject = hashlib.sha256(text.encode()).hexdigest()
+        checkpoint = store.get(kind, subject)
+        if checkpoint is None:
+            aggregate, pages = initial, 0
+        else:
+            aggregate, pages = checkpoint["partial"], checkpoint["pages"]
+            query.paginator.update_paginator(checkpoint["has_next_page"], checkpoint["end_cursor"])
+
+        for page in self._execution_generator(query):
+            aggregate = reduce(aggregate, page)
+            pages += 1
+            store.put(kind, subject, {
+                "end_cursor": query.paginator.args["after"].value,
+                "has_next_page": query.paginator.has_next(),
+                "pages": pages,
+                "partial": aggregate,
+            })
+        store.delete(kind, subject)
+        return aggregate
 
     def execute(self, query: Union[str, Query, PaginatedQuery]) -> Dict[str, Any]:
         """
@@ -231,4 +336,27 @@ class Client:
         """
         if isinstance(query, PaginatedQuery):
             return self._execution_generator(query)
-        return self._execute(query)
+        ttl = self._cache.ttl_for(query) if self._cache is not None else 0
+        text = query.get_query() if isinstance(query, Query) else query
+        coalesce = self._single_flight is not None and not text.lstrip().startswith("mutation")
+        if ttl == 0 and not coalesce:
+            return self._execute(query)
+        if isinstance(query, Query):
+            variables = query.get_variables()
+            if variables:
+                text += "\n" + json.dumps(variables, sort_keys=True)
+        key = QueryCache.key(text, self._token_scope())
+        if ttl != 0:
+            response = self._cache.get(key)
+            if response is not None:
+                return response
+
+        def fetch() -> Dict[str, Any]:
+            response = self._execute(query)
+            if ttl != 0:
+                self._cache.put(key, response, ttl)
+            return response
+
+        if coalesce:
+            return self._single_flight.do(key, fetch)
+        return fetch()
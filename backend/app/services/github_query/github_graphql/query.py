@@ -1,7 +1,8 @@
-"""The module defines four query-related classes that are used to generate GraphQL query strings
+"""The module defines five query-related classes that are used to generate GraphQL query strings
 in an object-oriented way."""
 
-from typing import Union, List, Dict, Tuple, Optional
+import weakref
+from typing import Any, Union, List, Dict, Tuple, Optional
 from datetime import datetime
 from collections import deque
 
@@ -39,6 +40,86 @@ class InvalidQueryException(Exception):
         return f"{self.__class__.__name__}: {self.message}"
 
 
+class QueryVariable:
+    """
+    QueryVariable is a GraphQL variable used as an argument value. It is rendered as $name in the query
+    document, declared in the operation header, and its value is sent in the variables payload of the
+    request, so the document itself stays the same whatever the value is.
+    """
+
+    def __init__(self, name: str, type_name: str, value: Any = None) -> None:
+        """
+        Initializes a QueryVariable.
+
+        Args:
+            name (str): The name of the variable, without the leading $.
+            type_name (str): The GraphQL type of the variable, e.g. "String!".
+            value (Any): The JSON-serializable value sent for the variable.
+        """
+        self.name = name
+        self.type_name = type_name
+        self.value = value
+
+    def __str__(self) -> str:
+        return f"${self.name}"
+
+    def __repr__(self) -> str:
+        return f"QueryVariable({self.name!r}, {self.type_name!r}, {self.value!r})"
+
+    def __eq__(self, other: "QueryVariable") -> bool:
+        return (
+            isinstance(other, QueryVariable)
+            and self.name == other.name
+            and self.type_name == other.type_name
+            and self.value == other.value
+        )
+
+
+class _Arguments(dict):
+    """
+    _Arguments holds the arguments of a QueryNode and tells the node whenever one of them changes,
+    so that the queries that compiled the node render the new value.
+    """
+
+    def __init__(self, node: "QueryNode", args: Dict) -> None:
+        super().__init__(args)
+        self._node = node
+
+    def _changed(self) -> None:
+        self._node._changed()
+
+    def __setitem__(self, key: str, value: Any) -> None:
+        super().__setitem__(key, value)
+        self._changed()
+
+    def __delitem__(self, key: str) -> None:
+        super().__delitem__(key)
+        self._changed()
+
+    def update(self, *args, **kwargs) -> None:
+        super().update(*args, **kwargs)
+        self._changed()
+
+    def setdefault(self, key: str, default: Any = None) -> Any:
+        value = super().setdefault(key, default)
+        self._changed()
+        return value
+
+    def pop(self, *args) -> Any:
+        value = super().pop(*args)
+        self._changed()
+        return value
+
+    def popitem(self) -> Tuple[str, Any]:
+        item = super().popitem()
+        self._changed()
+        return item
+
+    def clear(self) -> None:
+        super().clear()
+        self._changed()
+
+
 class QueryNode:
     """
     QueryNode is the fundamental building block of a GraphQL query.It represents a field or a set of fields,
@@ -69,6 +150,25 @@ class QueryNode:
             self.fields = fields
         self.args = args
 
+    # whether changes to the arguments require recompiling the queries the node belongs to
+    _compiled_args = True
+
+    def __setattr__(self, key: str, value: Any) -> None:
+        if key == "args" and isinstance(value, dict) and self._compiled_args:
+            value = _Arguments(self, value)
+        super().__setattr__(key, value)
+        if key in ("name", "fields", "args"):
+            self._changed()
+
+    def _changed(self) -> None:
+        """
+        Invalidates the compiled templates of the queries this node belongs to.
+        """
+        owners = self.__dict__.get("_owners")
+        if owners:
+            for owner in list(owners.values()):
+                owner.invalidate()
+
     def _format_args(self) -> str:
         """
         Formats the arguments of the QueryNode into a string suitable for inclusion in a GraphQL query.
@@ -82,7 +182,9 @@ class QueryNode:
 
         args_list = []
         for key, value in self.args.items():
-            if key == "login":
+            if isinstance(value, QueryVariable):
+                args_list.append(f"{key}: {value}")
+            elif key == "login":
                 args_list.append(f'{key}: "{value}"')
             elif key == "owner":
                 args_list.append(f'{key}: "{value}"')
@@ -157,8 +259,175 @@ class Query(QueryNode):
     """
     Query is a subclass of QueryNode specifically designed to represent a complete, executable GraphQL query.
     It provides additional functionality for formatting and substituting values in preparation for execution.
+
+    The query string is compiled once into a template in which only the arguments of paginator nodes, the
+    parts that change between pages, are rendered again on each call. Setting the name, fields or arguments
+    of a node, or changing its arguments in place, recompiles the queries it belongs to on their next
+    rendering; call invalidate() after changing a list of fields in place.
+
+    Argument values given as QueryVariable are declared in the operation header and sent separately
+    through get_variables(), which is how the cursor of a paginated query is passed from page to page.
     """
 
+    def __init__(
+        self,
+        name: str = "query",
+        fields: Optional[List[Union[str, "QueryNode"]]] = None,
+        args: Optional[Dict] = None,
+        variables: Optional[List[QueryVariable]] = None,
+    ) -> None:
+        """
+        Initializes a Query with a name, a list of fields, and optional arguments and variables.
+
+        Args:
+            name (str): The name of the Query, typically "query".
+            fields (List[Union[str, 'QueryNode']]): A list of fields to include in the Query.
+            args (Dict): A dictionary of arguments of the operation. Ignored once variables are declared.
+            variables (Optional[List[QueryVariable]]): Variables used by string fields of the query, which
+                cannot be found by walking the query tree. Variables of node arguments are found on their own.
+        """
+        self._template: Optional[List[Union[str, QueryNodePaginator]]] = None
+        self._static_variables: List[QueryVariable] = []
+        super().__init__(name=name, fields=fields, args=args)
+        self.variables = variables if variables is not None else []
+
+    @staticmethod
+    def _compile_fields(node: QueryNode) -> List[Union[str, "QueryNodePaginator"]]:
+        """
+        Renders the fields of a node into template chunks, keeping a slot for the arguments of every paginator.
+
+        Args:
+            node (QueryNode): The node whose fields are compiled.
+
+        Returns:
+            List[Union[str, QueryNodePaginator]]: Literal strings, and paginators whose arguments fill the slots.
+        """
+        chunks: List[Union[str, QueryNodePaginator]] = []
+        for i, field in enumerate(node.fields):
+            if i:
+                chunks.append(" ")
+            if isinstance(field, QueryNodePaginator):
+                chunks += [field.name, field, " { "]
+                chunks += Query._compile_fields(field)
+                chunks.append(" }")
+            elif isinstance(field, QueryNode):
+                chunks.append(f"{field.name}{field._format_args()} {{ ")
+                chunks += Query._compile_fields(field)
+                chunks.append(" }")
+            else:
+                chunks.append(str(field))
+        # merge consecutive literals so that rendering only joins a few strings
+        merged: List[Union[str, QueryNodePaginator]] = []
+        for chunk in chunks:
+            if isinstance(chunk, str) and merged and isinstance(merged[-1], str):
+                merged[-1] += chunk
+            else:
+                merged.append(chunk)
+        return merged
+
+    @staticmethod
+    def _collect_variables(node: QueryNode) -> List[QueryVariable]:
+        """
+        Finds the variables used in the arguments of the nodes below a node, except in those of paginators,
+        whose arguments are read again on every rendering.
+
+        Args:
+            node (QueryNode): The node whose descendants are searched.
+
+        Returns:
+            List[QueryVariable]: The variables found, in document order.
+        """
+        variables = []
+        for field in node.get_connected_nodes():
+            if not isinstance(field, QueryNodePaginator):
+                for value in (field.args or {}).values():
+                    values = value.values() if isinstance(value, dict) else [value]
+                    variables += [v for v in values if isinstance(v, QueryVariable)]
+            variables += Query._collect_variables(field)
+        return variables
+
+    def _own(self, node: QueryNode) -> None:
+        """
+        Registers the query with a node and its descendants, so that their changes invalidate the template.
+        """
+        if "_owners" not in node.__dict__:
+            object.__setattr__(node, "_owners", weakref.WeakValueDictionary())
+        node._owners[id(self)] = self
+        for field in node.get_connected_nodes():
+            self._own(field)
+
+    def compile(self) -> None:
+        """
+        Compiles the fields of the query into a template.
+        """
+        self._own(self)
+        self._template = Query._compile_fields(self)
+        self._static_variables = Query._collect_variables(self)
+
+    def get_variable_definitions(self) -> List[QueryVariable]:
+        """
+        Returns the variables of the query, as declared in its operation header.
+
+        Returns:
+            List[QueryVariable]: The variables of the query, each name once.
+        """
+        if self._template is None:
+            self.compile()
+        variables: Dict[str, QueryVariable] = {}
+        for variable in self.variables + self._static_variables:
+            variables.setdefault(variable.name, variable)
+        for chunk in self._template:
+            if isinstance(chunk, QueryNodePaginator):
+                for value in chunk.args.values():
+                    if isinstance(value, QueryVariable):
+                        variables.setdefault(value.name, value)
+        return list(variables.values())
+
+    def get_variables(self) -> Dict[str, Any]:
+        """
+        Returns the variables payload sent along with the query document.
+
+        Returns:
+            Dict[str, Any]: The value of each variable, keyed by name.
+        """
+        return {variable.name: variable.value for variable in self.get_variable_definitions()}
+
+    def invalidate(self) -> None:
+        """
+        Discards the compiled template, so that the next rendering reflects changes made to the query tree.
+        """
+        self._template = None
+
+    def get_body(self) -> str:
+        """
+        Returns the selection set of the query, i.e. the query string without the surrounding "query { ... }".
+
+        Returns:
+            str: The rendered fields of the query.
+        """
+        if self._template is None:
+            self.compile()
+        return "".join(
+            chunk if isinstance(chunk, str) else chunk._format_args() for chunk in self._template
+        )
+
+    def get_query(self) -> str:
+        """
+        Returns the query string representation of the Query, rendered from its compiled template.
+
+        Returns:
+            str: The query string representation of the Query.
+        """
+        body = self.get_body()
+        variables = self.get_variable_definitions()
+        if not variables:
+            return f"{self.name}{self._format_args()} {{ {body} }}"
+        declarations = ", ".join(f"${v.name}: {v.type_name}" for v in variables)
+        return f"{self.name}({declarations}) {{ {body} }}"
+
+    def __str__(self) -> str:
+        return self.get_query()
+
     @staticmethod
     def test_time_format(time_string: str) -> bool:
         """
@@ -205,6 +474,9 @@ class QueryNodePaginator(QueryNode):
         super().__init__(name=name, fields=fields, args=args)
         self.has_next_page = True
 
+    # the arguments of a paginator are rendered again on every page, never compiled into a template
+    _compiled_args = False
+
     def update_paginator(
         self, has_next_page: bool, end_cursor: Optional[str] = None
     ) -> None:
@@ -214,11 +486,12 @@ class QueryNodePaginator(QueryNode):
         Args:
             has_next_page (bool): Indicates whether there is a next page available.
             end_cursor (str, optional): The cursor that should be used to fetch the next page. Defaults to None.
+                It is passed as the $after variable, so every page is requested with the same document.
         """
         self.has_next_page = has_next_page
         if end_cursor is None:
             end_cursor = ""
-        self.args.update({"after": '"' + end_cursor + '"'})
+        self.args.update({"after": QueryVariable("after", "String", end_cursor)})
 
     def has_next(self) -> bool:
         """
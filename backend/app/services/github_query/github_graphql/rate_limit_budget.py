@@ -0,0 +1,173 @@
+"""The module defines the RateLimitBudget class, which keeps a local estimate of the GraphQL rate limit
+of a token so that the client can decide whether to throttle without asking the API before every query."""
+
+import time
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, Mapping, Optional
+
+
+class RateLimitBudget:
+    """
+    RateLimitBudget tracks the remaining GraphQL points of a single token. The estimate is learned from the
+    rateLimit block or the X-RateLimit headers of real responses, so the throttling decision is a local
+    computation and the dry-run probe is only needed when the estimate is stale or uncertain.
+    Budgets are shared by every client that uses the same token.
+    """
+
+    _registry: Dict[str, "RateLimitBudget"] = {}
+    _registry_lock = threading.Lock()
+
+    def __init__(self, max_age_seconds: float = 60.0, safety_margin: int = 5) -> None:
+        """
+        Initializes an empty budget, which is considered stale until the first observation.
+
+        Args:
+            max_age_seconds (float): How long an observation is trusted before the budget is considered stale.
+                Other processes may spend points of the same token, so the estimate drifts over time.
+            safety_margin (int): Points kept in reserve when deciding whether a query can be sent.
+        """
+        self.max_age_seconds = max_age_seconds
+        self.safety_margin = safety_margin
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None
+        self._observed_remaining: Optional[int] = None
+        self.reset_at: Optional[float] = None
+        self.last_cost: int = 1
+        self.updated_at: Optional[float] = None
+        self._lock = threading.Lock()
+        # held while the budget is probed, so threads finding it stale together send a single probe
+        self.probe_lock = threading.Lock()
+
+    @classmethod
+    def for_scope(cls, scope: str) -> "RateLimitBudget":
+        """
+        Returns the budget shared by every client authenticated with the given token scope,
+        creating it on first use.
+
+        Args:
+            scope (str): An identifier of the token, e.g. a hash of its authorization header.
+
+        Returns:
+            RateLimitBudget: The shared budget of the token.
+        """
+        with cls._registry_lock:
+            if scope not in cls._registry:
+                cls._registry[scope] = cls()
+            return cls._registry[scope]
+
+    @classmethod
+    def clear_registry(cls) -> None:
+        """
+        Forgets every shared budget.
+        """
+        with cls._registry_lock:
+            cls._registry.clear()
+
+    @staticmethod
+    def _parse_reset_at(reset_at: str) -> float:
+        return (
+            datetime.strptime(reset_at, "%Y-%m-%dT%H:%M:%SZ")
+            .replace(tzinfo=timezone.utc)
+            .timestamp()
+        )
+
+    def _update(self, remaining: int, reset_at: float, limit: Optional[int], cost: Optional[int]) -> None:
+        with self._lock:
+            if cost is None and self._observed_remaining is not None and self.reset_at == reset_at:
+                # the points spent since the previous observation in the same window approximate the query cost
+                cost = self._observed_remaining - remaining
+            if cost is not None and cost > 0:
+                self.last_cost = cost
+            if limit is not None:
+                self.limit = limit
+            self.remaining = remaining
+            self._observed_remaining = remaining
+            self.reset_at = reset_at
+            self.updated_at = time.time()
+
+    def observe(self, rate_limit: Mapping[str, Any]) -> None:
+        """
+        Learns the budget from a rateLimit block of a GraphQL response.
+
+        Args:
+            rate_limit (Mapping[str, Any]): A mapping with the "cost", "remaining" and "resetAt" fields,
+                and optionally "limit".
+        """
+        self._update(
+            remaining=int(rate_limit["remaining"]),
+            reset_at=self._parse_reset_at(rate_limit["resetAt"]),
+            limit=int(rate_limit["limit"]) if "limit" in rate_limit else None,
+            cost=int(rate_limit["cost"]) if "cost" in rate_limit else None,
+        )
+
+    def observe_headers(self, headers: Mapping[str, str]) -> None:
+        """
+        Learns the budget from the X-RateLimit headers of a response. Responses without them are ignored.
+
+        Args:
+            headers (Mapping[str, str]): The (case-insensitive) response headers.
+        """
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is None or reset is None:
+            return
+        limit = headers.get("X-RateLimit-Limit")
+        self._update(
+            remaining=int(remaining),
+            reset_at=float(reset),
+            limit=int(limit) if limit is not None else None,
+            cost=None,
+        )
+
+    def consume(self, cost: Optional[int] = None) -> None:
+        """
+        Optimistically subtracts the cost of a query that was just sent, until a response corrects the estimate.
+
+        Args:
+            cost (Optional[int]): The cost of the query. Defaults to the last observed cost.
+        """
+        with self._lock:
+            if self.remaining is not None:
+                self.remaining -= self.last_cost if cost is None else cost
+
+    def is_stale(self) -> bool:
+        """
+        Checks whether the estimate is too old or absent to be trusted.
+
+        Returns:
+            bool: True if the budget has never been observed or the last observation is older than max_age_seconds.
+        """
+        if self.updated_at is None:
+            return True
+        if self.reset_at is not None and time.time() >= self.reset_at:
+            # a new window has started, the old remaining value is meaningless
+            return True
+        return time.time() - self.updated_at > self.max_age_seconds
+
+    def wait_seconds(self, attempts: int = 1, cost: Optional[int] = None) -> float:
+        """
+        Decides locally whether a query can be sent now.
+
+        Args:
+            attempts (int): The number of attempts the query may take, each of which is charged.
+            cost (Optional[int]): The expected cost of the query. Defaults to the last observed cost.
+
+        Returns:
+            float: 0 if the query can be sent immediately, otherwise the number of seconds until the budget resets.
+        """
+        if self.remaining is None or self.reset_at is None:
+            return 0.0
+        cost = self.last_cost if cost is None else cost
+        if attempts * cost <= self.remaining - self.safety_margin:
+            return 0.0
+        return max(self.reset_at - time.time(), 0.0)
+
+    def reset(self) -> None:
+        """
+        Marks the current window as exhausted and waited out, so that the next decision probes again.
+        """
+        with self._lock:
+            self.remaining = self.limit
+            self._observed_remaining = None
+            self.updated_at = None
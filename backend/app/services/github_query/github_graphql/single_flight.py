@@ -0,0 +1,119 @@
+"""The module defines the SingleFlight class, which coalesces identical concurrent GraphQL requests so that
+callers asking for the same query with the same token at the same time share one request to the API."""
+
+import copy
+import threading
+from typing import Any, Callable, Dict, Optional
+
+
+class _Call:
+    """
+    _Call is one in-flight execution that the callers of the same key wait on.
+    """
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.waiters = 0
+        # a copy of the result kept for the waiters, which the executing caller never sees
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    SingleFlight runs at most one execution per key at a time. The first caller of a key executes the
+    request; callers arriving while it is in flight wait for it and receive a copy of its result, or the
+    same exception. Nothing is kept once the execution finishes: a later caller executes again, which
+    is what the response cache is for.
+    """
+
+    def __init__(self) -> None:
+        """
+        Initializes an empty set of in-flight executions.
+        """
+        self._calls: Dict[str, _Call] = {}
+        self._lock = threading.Lock()
+        self._stats = {"calls": 0, "executions": 0, "coalesced": 0}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """
+        Executes fn for the key, or waits for the execution already in flight for it.
+
+        Args:
+            key (str): Identifies identical requests, e.g. the cache key of the query and token.
+            fn (Callable[[], Any]): Sends the request.
+
+        Returns:
+            Any: The result of fn. Callers that waited receive a deep copy, so they cannot affect each other.
+
+        Raises:
+            BaseException: Whatever fn raised, for the executing caller and every waiting caller.
+        """
+        with self._lock:
+            self._stats["calls"] += 1
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+                self._stats["executions"] += 1
+            else:
+                call.waiters += 1
+                self._stats["coalesced"] += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return copy.deepcopy(call.result)
+
+        try:
+            result = fn()
+        except BaseException as e:
+            call.error = e
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+            raise
+        with self._lock:
+            # no caller can start waiting once the call is removed
+            del self._calls[key]
+            waiters = call.waiters
+        try:
+            if waiters:
+                # copied before the waiters are released, so the caller may change its result right away
+                call.result = copy.deepcopy(result)
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            call.done.set()
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Reports the coalescing metrics.
+
+        Returns:
+            Dict[str, int]: The number of calls, of executions actually sent, of calls that were coalesced
+            into another one, and of executions currently in flight.
+        """
+        with self._lock:
+            return dict(self._stats, in_flight=len(self._calls))
+
+
+_default_single_flight: Optional[SingleFlight] = None
+_default_single_flight_lock = threading.Lock()
+
+
+def get_default_single_flight() -> SingleFlight:
+    """
+    Returns the process-wide SingleFlight shared by the service layer.
+
+    Returns:
+        SingleFlight: The shared instance.
+    """
+    global _default_single_flight
+    with _default_single_flight_lock:
+        if _default_single_flight is None:
+            _default_single_flight = SingleFlight()
+        return _default_single_flight
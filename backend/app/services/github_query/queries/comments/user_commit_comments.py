@@ -1,13 +1,14 @@
 from typing import Dict, Any, List
-from backend.app.services.github_query.github_graphql.query import QueryNode, PaginatedQuery, QueryNodePaginator
+from backend.app.services.github_query.github_graphql.query import QueryNode, QueryNodePaginator, QueryVariable
+from backend.app.services.github_query.queries.windowed_query import WindowedPaginatedQuery
 import backend.app.services.github_query.utils.helper as helper
 from backend.app.services.github_query.queries.constants import (
     FIELD_LOGIN, FIELD_TOTAL_COUNT, FIELD_CREATED_AT, FIELD_END_CURSOR, FIELD_HAS_NEXT_PAGE,
-    NODE_USER, NODE_COMMIT_COMMENTS, NODE_NODES, NODE_PAGE_INFO, ARG_LOGIN, ARG_FIRST
+    NODE_USER, NODE_COMMIT_COMMENTS, NODE_NODES, NODE_PAGE_INFO, ARG_LOGIN, TYPE_LOGIN, ARG_FIRST
 )
 from datetime import datetime, timezone
 
-class UserCommitComments(PaginatedQuery):
+class UserCommitComments(WindowedPaginatedQuery):
     """
     UserCommitComments constructs a paginated GraphQL query specifically for 
     retrieving user commit comments. It extends the PaginatedQuery class to handle
@@ -22,7 +23,7 @@ class UserCommitComments(PaginatedQuery):
             fields=[
                 QueryNode(
                     NODE_USER,
-                    args={ARG_LOGIN: user},
+                    args={ARG_LOGIN: QueryVariable(ARG_LOGIN, TYPE_LOGIN, user)},
                     fields=[
                         FIELD_LOGIN,
                         QueryNodePaginator(
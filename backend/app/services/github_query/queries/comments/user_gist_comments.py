@@ -1,12 +1,13 @@
 from typing import Dict, Any, List
-from backend.app.services.github_query.github_graphql.query import QueryNode, PaginatedQuery, QueryNodePaginator
+from backend.app.services.github_query.github_graphql.query import QueryNode, QueryNodePaginator, QueryVariable
+from backend.app.services.github_query.queries.windowed_query import WindowedPaginatedQuery
 import backend.app.services.github_query.utils.helper as helper
 from backend.app.services.github_query.queries.constants import (
     FIELD_LOGIN, FIELD_TOTAL_COUNT, FIELD_CREATED_AT, FIELD_END_CURSOR, FIELD_HAS_NEXT_PAGE,
-    NODE_USER, NODE_GIST_COMMENTS, NODE_NODES, NODE_PAGE_INFO, ARG_LOGIN, ARG_FIRST
+    NODE_USER, NODE_GIST_COMMENTS, NODE_NODES, NODE_PAGE_INFO, ARG_LOGIN, TYPE_LOGIN, ARG_FIRST
 )
 
-class UserGistComments(PaginatedQuery):
+class UserGistComments(WindowedPaginatedQuery):
     """
     UserGistComments constructs a paginated GraphQL query specifically for
     retrieving user gist comments. It extends the PaginatedQuery class to handle
@@ -21,7 +22,7 @@ class UserGistComments(PaginatedQuery):
             fields=[
                 QueryNode(
                     NODE_USER,
-                    args={ARG_LOGIN: user},
+                    args={ARG_LOGIN: QueryVariable(ARG_LOGIN, TYPE_LOGIN, user)},
                     fields=[
                         FIELD_LOGIN,
                         QueryNodePaginator(
@@ -71,9 +72,10 @@ class UserGistComments(PaginatedQuery):
         Returns:
             int: The count of gist comments created before the specified time.
         """
+        cutoff = helper.parse_time(time)
         counter = 0
         for gist_comment in gist_comments:
-            if helper.created_before(gist_comment[FIELD_CREATED_AT], time):
+            if helper.created_before(gist_comment[FIELD_CREATED_AT], cutoff):
                 counter += 1
             # else:
             #     break
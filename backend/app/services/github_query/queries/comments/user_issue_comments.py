@@ -1,13 +1,14 @@
 from typing import Dict, Any, List
-from backend.app.services.github_query.github_graphql.query import QueryNode, PaginatedQuery, QueryNodePaginator
-from backend.app.services.github_query.utils.helper import created_before
+from backend.app.services.github_query.github_graphql.query import QueryNode, QueryNodePaginator, QueryVariable
+from backend.app.services.github_query.queries.windowed_query import WindowedPaginatedQuery
+from backend.app.services.github_query.utils.helper import created_before, parse_time
 from backend.app.services.github_query.queries.constants import (
     NODE_USER, NODE_LOGIN, NODE_ISSUE_COMMENTS, FIELD_TOTAL_COUNT,
     FIELD_CREATED_AT, NODE_NODES, NODE_PAGE_INFO, FIELD_END_CURSOR, FIELD_HAS_NEXT_PAGE,
-    ARG_LOGIN, ARG_FIRST
+    ARG_LOGIN, TYPE_LOGIN, ARG_FIRST
 )
 
-class UserIssueComments(PaginatedQuery):
+class UserIssueComments(WindowedPaginatedQuery):
     """
     UserIssueComments constructs a paginated GraphQL query specifically for
     retrieving user issue comments. It extends the PaginatedQuery class to handle
@@ -23,7 +24,7 @@ class UserIssueComments(PaginatedQuery):
             fields=[
                 QueryNode(
                     NODE_USER,
-                    args={ARG_LOGIN:user},
+                    args={ARG_LOGIN: QueryVariable(ARG_LOGIN, TYPE_LOGIN, user)},
                     fields=[
                         NODE_LOGIN,
                         QueryNodePaginator(
@@ -79,4 +80,5 @@ class UserIssueComments(PaginatedQuery):
         #     # else:
         #     #     break
         # return counter
-        return sum(1 for comment in issue_comments if created_before(comment[FIELD_CREATED_AT], time))
+        cutoff = parse_time(time)
+        return sum(1 for comment in issue_comments if created_before(comment[FIELD_CREATED_AT], cutoff))
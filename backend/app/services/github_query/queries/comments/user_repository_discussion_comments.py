@@ -1,5 +1,6 @@
 from typing import Dict, Any, List
-from backend.app.services.github_query.github_graphql.query import QueryNode, PaginatedQuery, QueryNodePaginator
+from backend.app.services.github_query.github_graphql.query import QueryNode, QueryNodePaginator, QueryVariable
+from backend.app.services.github_query.queries.windowed_query import WindowedPaginatedQuery
 from backend.app.services.github_query.queries.constants import (
     NODE_USER,
     NODE_LOGIN,
@@ -11,17 +12,18 @@ from backend.app.services.github_query.queries.constants import (
     FIELD_END_CURSOR,
     FIELD_HAS_NEXT_PAGE,
     ARG_LOGIN,
+    TYPE_LOGIN,
     ARG_FIRST
 )
 import backend.app.services.github_query.utils.helper as helper
 
-class UserRepositoryDiscussionComments(PaginatedQuery):
+class UserRepositoryDiscussionComments(WindowedPaginatedQuery):
     """
     UserRepositoryDiscussionComments constructs a paginated GraphQL query specifically for
     retrieving user repository discussion comments. It extends the PaginatedQuery class to handle
     queries that expect a large amount of data that might be delivered in multiple pages.
     """
-    def __init__(self) -> None:
+    def __init__(self, user: str, pg_size: int) -> None:
         """
         Initializes the UserRepositoryDiscussionComments query with specific fields and arguments
         to retrieve user repository discussion comments, including pagination handling. The query is constructed
@@ -31,12 +33,12 @@ class UserRepositoryDiscussionComments(PaginatedQuery):
             fields=[
                 QueryNode(
                     NODE_USER,
-                    args={ARG_LOGIN: "$user"},
+                    args={ARG_LOGIN: QueryVariable(ARG_LOGIN, TYPE_LOGIN, user)},
                     fields=[
                         NODE_LOGIN,
                         QueryNodePaginator(
                             NODE_REPOSITORY_DISCUSSION_COMMENTS,
-                            args={ARG_FIRST: "$pg_size"},
+                            args={ARG_FIRST: pg_size},
                             fields=[
                                 FIELD_TOTAL_COUNT,
                                 QueryNode(
@@ -81,9 +83,10 @@ class UserRepositoryDiscussionComments(PaginatedQuery):
         Returns:
             int: The count of repository discussion comments created before the specified time.
         """
+        cutoff = helper.parse_time(time)
         counter = 0
         for repository_discussion_comment in repository_discussion_comments:
-            if helper.created_before(repository_discussion_comment[FIELD_CREATED_AT], time):
+            if helper.created_before(repository_discussion_comment[FIELD_CREATED_AT], cutoff):
                 counter += 1
             else:
                 break
@@ -74,3 +74,8 @@ ARG_DIRECTION = "direction"
 ARG_FROM = "from"
 ARG_TO = "to"
 ARG_DRYRUN = "dryRun"
+
+
+# GraphQL types of the variables queries are parameterized with
+TYPE_LOGIN = "String!"
+TYPE_DATE_TIME = "DateTime"
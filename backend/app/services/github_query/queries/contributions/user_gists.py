@@ -1,5 +1,6 @@
 from typing import List, Dict, Any
-from backend.app.services.github_query.github_graphql.query import QueryNode, PaginatedQuery, QueryNodePaginator
+from backend.app.services.github_query.github_graphql.query import QueryNode, QueryNodePaginator, QueryVariable
+from backend.app.services.github_query.queries.windowed_query import WindowedPaginatedQuery
 from backend.app.services.github_query.queries.constants import (
     NODE_USER,
     NODE_LOGIN,
@@ -11,11 +12,14 @@ from backend.app.services.github_query.queries.constants import (
     FIELD_END_CURSOR,
     FIELD_HAS_NEXT_PAGE,
     ARG_LOGIN,
+    TYPE_LOGIN,
     ARG_FIRST
 )
 import backend.app.services.github_query.utils.helper as helper
 
-class UserGists(PaginatedQuery):
+class UserGists(WindowedPaginatedQuery):
+    created_order_field = "CREATED_AT"
+
     def __init__(self,user:str,pg_size:int) -> None:
         """Initializes a query for User Gists as a paginated query.
 
@@ -26,7 +30,7 @@ class UserGists(PaginatedQuery):
             fields=[
                 QueryNode(
                     NODE_USER,
-                    args={ARG_LOGIN: user},
+                    args={ARG_LOGIN: QueryVariable(ARG_LOGIN, TYPE_LOGIN, user)},
                     fields=[
                         NODE_LOGIN,
                         QueryNodePaginator(
@@ -73,9 +77,10 @@ class UserGists(PaginatedQuery):
         Returns:
             The count of gists created before the specified time.
         """
+        cutoff = helper.parse_time(time)
         counter = 0
         for gist in gists:
-            if helper.created_before(gist.get(FIELD_CREATED_AT, ""), time):
+            if helper.created_before(gist.get(FIELD_CREATED_AT, ""), cutoff):
                 counter += 1
             else:
                 break
@@ -1,5 +1,6 @@
 from typing import List, Dict, Any
-from backend.app.services.github_query.github_graphql.query import QueryNode, PaginatedQuery, QueryNodePaginator
+from backend.app.services.github_query.github_graphql.query import QueryNode, QueryNodePaginator, QueryVariable
+from backend.app.services.github_query.queries.windowed_query import WindowedPaginatedQuery
 from backend.app.services.github_query.queries.constants import (
     NODE_USER,
     NODE_LOGIN,
@@ -11,16 +12,19 @@ from backend.app.services.github_query.queries.constants import (
     FIELD_END_CURSOR,
     FIELD_HAS_NEXT_PAGE,
     ARG_LOGIN,
+    TYPE_LOGIN,
     ARG_FIRST
 )
 import backend.app.services.github_query.utils.helper as helper
 
-class UserIssues(PaginatedQuery):
+class UserIssues(WindowedPaginatedQuery):
     """
     UserIssues extends PaginatedQuery to fetch issues associated with a specific user.
     It is designed to navigate through potentially large sets of issues data.
     """
     
+    created_order_field = "CREATED_AT"
+
     def __init__(self,user:str,pg_size:int) -> None:
         """
         Initializes the UserIssues query with necessary fields and pagination support.
@@ -29,7 +33,7 @@ class UserIssues(PaginatedQuery):
             fields=[
                 QueryNode(
                     NODE_USER,
-                    args={ARG_LOGIN: user},
+                    args={ARG_LOGIN: QueryVariable(ARG_LOGIN, TYPE_LOGIN, user)},
                     fields=[
                         NODE_LOGIN,
                         QueryNodePaginator(
@@ -77,9 +81,10 @@ class UserIssues(PaginatedQuery):
         Returns:
             int: The count of issues created before the specified time.
         """
+        cutoff = helper.parse_time(time)
         counter = 0
         for issue in issues:
-            if helper.created_before(issue.get(FIELD_CREATED_AT, ""), time):
+            if helper.created_before(issue.get(FIELD_CREATED_AT, ""), cutoff):
                 counter += 1
             else:
                 break
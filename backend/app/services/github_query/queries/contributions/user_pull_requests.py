@@ -1,17 +1,20 @@
 from typing import List, Dict, Any
-from backend.app.services.github_query.github_graphql.query import QueryNode, PaginatedQuery, QueryNodePaginator
+from backend.app.services.github_query.github_graphql.query import QueryNode, QueryNodePaginator, QueryVariable
+from backend.app.services.github_query.queries.windowed_query import WindowedPaginatedQuery
 import backend.app.services.github_query.utils.helper as helper
 from backend.app.services.github_query.queries.constants import (
     NODE_USER, NODE_LOGIN, NODE_PULL_REQUESTS, FIELD_CREATED_AT,
-    FIELD_TOTAL_COUNT, FIELD_END_CURSOR, FIELD_HAS_NEXT_PAGE, ARG_LOGIN, ARG_FIRST, NODE_NODES, NODE_PAGE_INFO
+    FIELD_TOTAL_COUNT, FIELD_END_CURSOR, FIELD_HAS_NEXT_PAGE, ARG_LOGIN, TYPE_LOGIN, ARG_FIRST, NODE_NODES, NODE_PAGE_INFO
 )
 
-class UserPullRequests(PaginatedQuery):
+class UserPullRequests(WindowedPaginatedQuery):
     """
     UserPullRequests extends PaginatedQuery to fetch pull requests associated with a specific user.
     It navigates through potentially large sets of pull request data with pagination.
     """
     
+    created_order_field = "CREATED_AT"
+
     def __init__(self,user:str,pg_size:int) -> None:
         """
         Initializes the UserPullRequests query with necessary fields and pagination support.
@@ -20,7 +23,7 @@ class UserPullRequests(PaginatedQuery):
             fields=[
                 QueryNode(
                     NODE_USER,
-                    args={ARG_LOGIN: user},
+                    args={ARG_LOGIN: QueryVariable(ARG_LOGIN, TYPE_LOGIN, user)},
                     fields=[
                         NODE_LOGIN,
                         QueryNodePaginator(
@@ -69,9 +72,10 @@ class UserPullRequests(PaginatedQuery):
         Returns:
             int: The count of pull requests created before the specified time.
         """
+        cutoff = helper.parse_time(time)
         counter = 0
         for pull_request in pull_requests:
-            if helper.created_before(pull_request.get(FIELD_CREATED_AT, ""), time):
+            if helper.created_before(pull_request.get(FIELD_CREATED_AT, ""), cutoff):
                 counter += 1
             else:
                 break
@@ -2,11 +2,12 @@
 to extract repositories created by the user based on a given user ID."""
 
 import backend.app.services.github_query.utils.helper as helper
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 from backend.app.services.github_query.github_graphql.query import (
     QueryNode,
     PaginatedQuery,
     QueryNodePaginator,
+    QueryVariable,
 )
 from backend.app.services.github_query.queries.constants import (
     NODE_USER,
@@ -27,6 +28,7 @@ from backend.app.services.github_query.queries.constants import (
     NODE_NODES,
     NODE_PAGE_INFO,
     ARG_LOGIN,
+    TYPE_LOGIN,
     ARG_FIRST,
     ARG_IS_FORK,
     ARG_OWNER_AFFILIATIONS,
@@ -60,7 +62,7 @@ class UserRepositories(PaginatedQuery):
             fields=[
                 QueryNode(
                     NODE_USER,
-                    args={ARG_LOGIN: login},
+                    args={ARG_LOGIN: QueryVariable(ARG_LOGIN, TYPE_LOGIN, login)},
                     fields=[
                         QueryNodePaginator(
                             NODE_REPOSITORIES,
@@ -152,35 +154,63 @@ class UserRepositories(PaginatedQuery):
         Returns:
             None: Modifies the repo_stats and lang_stats dictionaries in place.
         """
-        for repo in repo_list:
-            if direction == "before" and not helper.created_before(
-                repo[FIELD_CREATED_AT], start
-            ):
-                continue
-            elif direction == "after" and not helper.created_after(
-                repo[FIELD_CREATED_AT], start
-            ):
-                continue
-            elif direction == "between" and not helper.in_time_period(
-                repo[FIELD_CREATED_AT], start, end
-            ):
-                continue
+        UserRepositories.windowed_repository_stats(repo_list, [(direction, start, end)], [(repo_stats, lang_stats)])
+
+    @staticmethod
+    def windowed_repository_stats(
+        repo_list: List[Dict[str, Any]],
+        windows: List[Tuple[str, str, Optional[str]]],
+        buckets: Optional[List[Tuple[Dict[str, int], Dict[str, int]]]] = None,
+    ) -> List[Tuple[Dict[str, int], Dict[str, int]]]:
+        """
+        Aggregates the statistics of several time windows over the repositories in a single pass,
+        e.g. the repositories created before, after and during a semester at once. Each creation
+        time and each window bound is parsed once.
 
-            if repo[NODE_LANGUAGES][FIELD_TOTAL_SIZE] == 0:
+        Args:
+            repo_list: List of repositories to be analyzed.
+            windows: One (direction, start, end) tuple per window, with the meaning of the arguments
+                     of cumulated_repository_stats. end is only used by "between" windows.
+            buckets: One (repo_stats, lang_stats) pair per window to accumulate into. Empty ones are
+                     created if omitted.
+
+        Returns:
+            The (repo_stats, lang_stats) pair of each window, in the order of the windows.
+        """
+        if buckets is None:
+            buckets = [
+                ({"total_count": 0, "fork_count": 0, "stargazer_count": 0, "watchers_count": 0, "total_size": 0}, {})
+                for _ in windows
+            ]
+        # every window becomes an inclusive or exclusive range of timestamps
+        ranges = []
+        for direction, start, end in windows:
+            if direction == "before":
+                ranges.append((None, helper.parse_time(start), False))
+            elif direction == "after":
+                ranges.append((helper.parse_time(start), None, False))
+            elif direction == "between":
+                ranges.append((helper.parse_time(start), helper.parse_time(end), True))
+            else:
+                ranges.append((None, None, True))
+
+        for repo in repo_list:
+            languages = repo[NODE_LANGUAGES]
+            if languages[FIELD_TOTAL_SIZE] == 0:
                 continue
-            repo_stats["total_count"] += 1
-            repo_stats["fork_count"] += repo[FIELD_FORK_COUNT]
-            repo_stats["stargazer_count"] += repo[FIELD_STARGAZER_COUNT]
-            repo_stats["watchers_count"] += repo[FIELD_WATCHERS][FIELD_TOTAL_COUNT]
-            repo_stats["total_size"] += repo[NODE_LANGUAGES][FIELD_TOTAL_SIZE]
-            language_list_sorted = sorted(
-                repo[NODE_LANGUAGES][NODE_EDGES], key=lambda s: s[FIELD_SIZE], reverse=True
-            )
-            if language_list_sorted:
-                for language in language_list_sorted:
+            created = helper.parse_time(repo[FIELD_CREATED_AT])
+            for (low, high, inclusive), (repo_stats, lang_stats) in zip(ranges, buckets):
+                if inclusive:
+                    if (low is not None and created < low) or (high is not None and created > high):
+                        continue
+                elif (low is not None and created <= low) or (high is not None and created >= high):
+                    continue
+                repo_stats["total_count"] += 1
+                repo_stats["fork_count"] += repo[FIELD_FORK_COUNT]
+                repo_stats["stargazer_count"] += repo[FIELD_STARGAZER_COUNT]
+                repo_stats["watchers_count"] += repo[FIELD_WATCHERS][FIELD_TOTAL_COUNT]
+                repo_stats["total_size"] += languages[FIELD_TOTAL_SIZE]
+                for language in languages[NODE_EDGES]:
                     name = language[NODE_NODE][FIELD_NAME]
-                    size = language[FIELD_SIZE]
-                    if name not in lang_stats:
-                        lang_stats[name] = int(size)
-                    else:
-                        lang_stats[name] += int(size)
+                    lang_stats[name] = lang_stats.get(name, 0) + int(language[FIELD_SIZE])
+        return buckets
@@ -1,11 +1,13 @@
 from typing import List, Dict, Any
-from backend.app.services.github_query.github_graphql.query import QueryNode, PaginatedQuery, QueryNodePaginator
+from backend.app.services.github_query.github_graphql.query import QueryNode, QueryNodePaginator, QueryVariable
+from backend.app.services.github_query.queries.windowed_query import WindowedPaginatedQuery
 import backend.app.services.github_query.utils.helper as helper
 from datetime import datetime
 
 from backend.app.services.github_query.queries.constants import (
     NODE_USER,
     ARG_LOGIN,
+    TYPE_LOGIN,
     ARG_FIRST,
     FIELD_LOGIN,
     NODE_REPOSITORY_DISCUSSIONS,
@@ -17,14 +19,16 @@ from backend.app.services.github_query.queries.constants import (
     FIELD_HAS_NEXT_PAGE
 )
 
-class UserRepositoryDiscussions(PaginatedQuery):
+class UserRepositoryDiscussions(WindowedPaginatedQuery):
+    created_order_field = "CREATED_AT"
+
     def __init__(self,user:str,pg_size:int) -> None:
         """Initializes a paginated query for GitHub user repository discussions."""
         super().__init__(
             fields=[
                 QueryNode(
                     NODE_USER,
-                    args={ARG_LOGIN: user},
+                    args={ARG_LOGIN: QueryVariable(ARG_LOGIN, TYPE_LOGIN, user)},
                     fields=[
                         FIELD_LOGIN,
                         QueryNodePaginator(
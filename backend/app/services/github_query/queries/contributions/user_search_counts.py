@@ -0,0 +1,140 @@
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+from backend.app.services.github_query.github_graphql.query import QueryNode, Query, QueryVariable
+
+# the search qualifier of each counted kind, keyed by the GitHubUserData column the count is stored in
+SEARCH_KINDS = {
+    "issues": "is:issue",
+    "prs": "is:pr",
+}
+# the most counters packed into one request, to stay well within GitHub's query complexity limits
+MAX_COUNTERS = 50
+
+_ALIAS = re.compile(r"^[_A-Za-z][_0-9A-Za-z]*$")
+
+
+class UserSearchCounts(Query):
+    def __init__(self, counters: Dict[str, str]) -> None:
+        """
+        Initializes a query counting the results of many issue searches at once, aliasing one
+        search(type: ISSUE) { issueCount } per counter, so no result node is ever fetched.
+
+        Args:
+            counters: The search string of each counter, keyed by alias. See search_string.
+
+        Raises:
+            ValueError: If there are no counters, too many of them, or an alias is not a GraphQL name.
+        """
+        if not counters or len(counters) > MAX_COUNTERS:
+            raise ValueError(f"Between 1 and {MAX_COUNTERS} counters can be packed into one request")
+        for alias in counters:
+            if not _ALIAS.match(alias):
+                raise ValueError(f"Invalid counter alias: {alias}")
+        super().__init__(
+            fields=[
+                QueryNode(
+                    f"{alias}: search",
+                    args={"type": "ISSUE", "query": QueryVariable(f"{alias}_query", "String!", search)},
+                    fields=["issueCount"],
+                )
+                for alias, search in counters.items()
+            ]
+        )
+        self.searches = list(counters.values())
+
+    def cache_ttl(self) -> Optional[float]:
+        """
+        Decides how long the response may be cached. Counts over windows that all ended in the past
+        can no longer change and are kept forever; otherwise they are refreshed after a few minutes.
+
+        Returns:
+            Optional[float]: The time to live in seconds, or None to never expire.
+        """
+        now = datetime.now(timezone.utc)
+        for search in self.searches:
+            # the end of a bounded window, or the qualifier itself for a window open towards the future
+            match = re.search(r"created:(?:\S*\.\.|<=)?(\S+)", search)
+            if not match:
+                return 300
+            try:
+                end = datetime.strptime(match.group(1), "%Y-%m-%dT%H:%M:%SZ").replace(tzinfo=timezone.utc)
+            except ValueError:
+                return 300
+            if end >= now:
+                return 300
+        return None
+
+    @staticmethod
+    def search_string(user: str, kind: str, start: Optional[str] = None, end: Optional[str] = None) -> str:
+        """
+        Builds the search string matching the issues or pull requests a user created in [start, end].
+
+        Args:
+            user: The login of the author.
+            kind: One of SEARCH_KINDS.
+            start: The start of the window, included, as "%Y-%m-%dT%H:%M:%SZ". Unbounded if omitted.
+            end: The end of the window, included, as "%Y-%m-%dT%H:%M:%SZ". Unbounded if omitted.
+
+        Returns:
+            The search string, e.g. "author:octocat is:pr created:2021-01-01T00:00:00Z..2021-06-30T00:00:00Z".
+
+        Raises:
+            ValueError: If the kind is unknown.
+        """
+        if kind not in SEARCH_KINDS:
+            raise ValueError(f"Unknown search kind: {kind}")
+        search = f"author:{user} {SEARCH_KINDS[kind]}"
+        if start and end:
+            search += f" created:{start}..{end}"
+        elif start:
+            search += f" created:>={start}"
+        elif end:
+            search += f" created:<={end}"
+        return search
+
+    @staticmethod
+    def counts(raw_data: Dict[str, Any]) -> Dict[str, int]:
+        """
+        Extracts the count of each counter from the raw data.
+
+        Args:
+            raw_data: The raw data returned by the GraphQL query.
+
+        Returns:
+            The issueCount of each counter, keyed by alias.
+        """
+        return {alias: search['issueCount'] for alias, search in raw_data.items()}
+
+    @staticmethod
+    def window_counts(
+        client: Any,
+        user: str,
+        windows: List[Tuple[Optional[str], Optional[str]]],
+        kinds: Tuple[str, ...] = tuple(SEARCH_KINDS),
+    ) -> List[Dict[str, int]]:
+        """
+        Counts the issues and pull requests a user created in each window, with one request per
+        MAX_COUNTERS counters instead of paging through every node of the user's history.
+
+        Args:
+            client: The client used to send the query.
+            user: The login of the author.
+            windows: The (start, end) windows to count, both bounds included.
+            kinds: The kinds to count, among SEARCH_KINDS.
+
+        Returns:
+            One dictionary per window, in the order given, with the count of each kind keyed by its
+            GitHubUserData column, ready to be merged into a snapshot.
+        """
+        counters = {
+            f"w{i}_{kind}": UserSearchCounts.search_string(user, kind, start, end)
+            for i, (start, end) in enumerate(windows)
+            for kind in kinds
+        }
+        aliases = list(counters)
+        counts: Dict[str, int] = {}
+        for i in range(0, len(aliases), MAX_COUNTERS):
+            query = UserSearchCounts({alias: counters[alias] for alias in aliases[i:i + MAX_COUNTERS]})
+            counts.update(UserSearchCounts.counts(client.execute(query)))
+        return [{kind: counts[f"w{i}_{kind}"] for kind in kinds} for i in range(len(windows))]
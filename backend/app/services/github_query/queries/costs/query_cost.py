@@ -1,7 +1,8 @@
 """The module defines the QueryCost class, which formulates the GraphQL query string
 to calculate the cost of the given GraphQL query."""
 
-from backend.app.services.github_query.github_graphql.query import QueryNode, Query
+from typing import List, Optional
+from backend.app.services.github_query.github_graphql.query import QueryNode, Query, QueryVariable
 from backend.app.services.github_query.queries.constants import (
     NODE_RATE_LIMIT,
     FIELD_COST,
@@ -17,13 +18,17 @@ class QueryCost(Query):
     It includes the 'rateLimit' field to determine the cost, remaining quota, and reset time for rate limiting purposes.
     """
 
-    def __init__(self, query: str, dryrun: bool) -> None:
+    def __init__(
+        self, query: str, dryrun: bool, variables: Optional[List[QueryVariable]] = None
+    ) -> None:
         """
         Initializes a QueryCost object with a test query that represents the actual query for which the cost is to be
         calculated.
 
         Args:
             query (str): The test query to be wrapped within the QueryCost structure.
+            dryrun (bool): Whether to only estimate the cost instead of charging it.
+            variables (Optional[List[QueryVariable]]): The variables used by the test query.
         """
         if not query:
             raise ValueError("Test query must not be empty")
@@ -40,5 +45,6 @@ class QueryCost(Query):
                         FIELD_RESET_AT,
                     ],
                 ),
-            ]
+            ],
+            variables=variables,
         )
@@ -1,6 +1,6 @@
 """The module defines several classes that formulate GraphQL query string to extract basic user profile information."""
 
-from backend.app.services.github_query.github_graphql.query import QueryNode, Query
+from backend.app.services.github_query.github_graphql.query import QueryNode, Query, QueryVariable
 from backend.app.services.github_query.queries.constants import (
     NODE_VIEWER,
     NODE_USER,
@@ -10,6 +10,7 @@ from backend.app.services.github_query.queries.constants import (
     FIELD_EMAIL,
     FIELD_CREATED_AT,
     ARG_LOGIN,
+    TYPE_LOGIN,
 )
 
 class UserLoginViewer(Query):
@@ -48,7 +49,7 @@ class UserLogin(Query):
                 QueryNode(
                     NODE_USER,
                     args={
-                        ARG_LOGIN: user  # Variable to be substituted with actual user login.
+                        ARG_LOGIN: QueryVariable(ARG_LOGIN, TYPE_LOGIN, user)  # Sent as the $login variable.
                     },
                     fields=[
                         FIELD_LOGIN,  # The username or login name of the user.
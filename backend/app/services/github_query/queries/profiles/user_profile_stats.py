@@ -2,7 +2,7 @@
 for a given GitHub ID. Only the used fields are queried, open to customization."""
 
 from typing import Dict, Any
-from backend.app.services.github_query.github_graphql.query import QueryNode, Query
+from backend.app.services.github_query.github_graphql.query import QueryNode, Query, QueryVariable
 from backend.app.services.github_query.queries.constants import (
     FIELD_LOGIN,
     FIELD_NAME,
@@ -11,6 +11,7 @@ from backend.app.services.github_query.queries.constants import (
     FIELD_TOTAL_COUNT,
     NODE_USER,
     ARG_LOGIN,
+    TYPE_LOGIN,
     NODE_ISSUES,
     NODE_PULL_REQUESTS,
     NODE_REPOSITORIES,
@@ -36,7 +37,7 @@ class UserProfileStats(Query):
             fields=[
                 QueryNode(
                     NODE_USER,
-                    args={ARG_LOGIN: user},
+                    args={ARG_LOGIN: QueryVariable(ARG_LOGIN, TYPE_LOGIN, user)},
                     fields=[
                         FIELD_LOGIN,
                         FIELD_NAME,
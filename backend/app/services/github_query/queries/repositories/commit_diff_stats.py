@@ -0,0 +1,62 @@
+from typing import Any, Dict, List, Optional
+from backend.app.services.github_query.github_graphql.query import QueryNode, Query, QueryVariable
+
+# the diff stats left out of history skeletons and fetched by CommitDiffStats instead
+DIFF_STATS_FIELDS = ["additions", "deletions", "changedFilesIfAvailable"]
+# the most node ids GitHub resolves in one nodes(ids:) lookup
+MAX_IDS = 100
+
+
+class CommitDiffStats(Query):
+    def __init__(self, ids: List[str]) -> None:
+        """
+        Initializes a query fetching the diff stats of many commits at once by their node ids.
+
+        Args:
+            ids: The node ids of the commits, at most MAX_IDS of them.
+
+        Raises:
+            ValueError: If there are no ids or too many of them.
+        """
+        if not ids or len(ids) > MAX_IDS:
+            raise ValueError(f"Between 1 and {MAX_IDS} commit ids can be looked up at once")
+        super().__init__(
+            fields=[
+                QueryNode(
+                    "nodes",
+                    args={"ids": QueryVariable("ids", "[ID!]!", list(ids))},
+                    fields=[
+                        QueryNode(
+                            "... on Commit",
+                            fields=["id"] + DIFF_STATS_FIELDS
+                        )
+                    ]
+                )
+            ]
+        )
+
+    def cache_ttl(self) -> Optional[float]:
+        """
+        Decides how long the response may be cached: the diff of a commit never changes.
+
+        Returns:
+            Optional[float]: None, to never expire.
+        """
+        return None
+
+    @staticmethod
+    def diff_stats(raw_data: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+        """
+        Extracts the diff stats of each commit from the raw data.
+
+        Args:
+            raw_data: The raw data returned by the GraphQL query.
+
+        Returns:
+            The additions, deletions and changedFilesIfAvailable of each commit, keyed by node id.
+            Ids that could not be resolved are left out.
+        """
+        return {
+            node['id']: {field: node[field] for field in DIFF_STATS_FIELDS}
+            for node in raw_data['nodes'] if node
+        }
@@ -1,14 +1,60 @@
-from typing import Dict, List, Optional
-from backend.app.services.github_query.github_graphql.query import QueryNode, PaginatedQuery, QueryNodePaginator
+from typing import Any, Dict, List, Optional, Tuple, Union
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+import pandas as pd
+from backend.app.services.github_query.github_graphql.query import QueryNode, Query, PaginatedQuery, QueryNodePaginator
+from backend.app.services.github_query.queries.repositories.commit_diff_stats import CommitDiffStats, MAX_IDS
+
+TIME_FORMAT = "%Y-%m-%dT%H:%M:%SZ"
+COMMIT_TOTALS = ['total_additions', 'total_deletions', 'total_files', 'total_commits']
 
 class RepositoryCommits(PaginatedQuery):
-    def __init__(self) -> None:
-        """Initializes a paginated query for repository commits with specific fields and pagination controls."""
+    def __init__(
+        self,
+        owner: str,
+        repo_name: str,
+        pg_size: int,
+        since: Optional[str] = None,
+        until: Optional[str] = None,
+        include_oid: bool = False,
+        diff_stats: bool = True,
+    ) -> None:
+        """
+        Initializes a paginated query for repository commits with specific fields and pagination controls.
+
+        Args:
+            owner: The login of the repository owner.
+            repo_name: The name of the repository.
+            pg_size: The number of commits per page.
+            since: Optional start of the time window (inclusive), formatted as "%Y-%m-%dT%H:%M:%SZ".
+            until: Optional end of the time window (inclusive), formatted as "%Y-%m-%dT%H:%M:%SZ".
+            include_oid: Whether to also fetch the object id of each commit, as needed by incremental syncs.
+            diff_stats: Whether to fetch the diff stats and message of each commit. Without them, the query
+                        crawls a cheap skeleton of the history, with the node id of each commit so that
+                        enrich_diff_stats can look the diff stats up later.
+        """
+        history_args = {"first": pg_size}
+        if since:
+            history_args["since"] = f'"{since}"'
+        if until:
+            history_args["until"] = f'"{until}"'
+        node_fields = ["oid"] if include_oid else []
+        if diff_stats:
+            node_fields += [
+                "authoredDate",  # Date when the commit was authored
+                "changedFilesIfAvailable",  # Number of files changed, if available
+                "additions",  # Number of additions made in the commit
+                "deletions",  # Number of deletions made in the commit
+                "message",  # Commit message
+            ]
+        else:
+            node_fields = ["id"] + node_fields + ["authoredDate"]
         super().__init__(
             fields=[
                 QueryNode(
                     "repository",
-                    args={"owner": "$owner", "name": "$repo_name"},  # Query arguments for specifying the repository
+                    args={"owner": owner, "name": repo_name},  # Query arguments for specifying the repository
                     fields=[
                         QueryNode(
                             "defaultBranchRef",  # Points to the default branch of the repository
@@ -21,17 +67,12 @@ class RepositoryCommits(PaginatedQuery):
                                             fields=[
                                                 QueryNodePaginator(
                                                     "history",  # Paginated history of commits
-                                                    args={"first": "$pg_size"},  # Pagination control arguments
+                                                    args=history_args,  # Pagination control arguments
                                                     fields=[
                                                         'totalCount',  # Total number of commits in the history
                                                         QueryNode(
                                                             "nodes",  # List of commit nodes
-                                                            fields=[
-                                                                "authoredDate",  # Date when the commit was authored
-                                                                "changedFilesIfAvailable",  # Number of files changed, if available
-                                                                "additions",  # Number of additions made in the commit
-                                                                "deletions",  # Number of deletions made in the commit
-                                                                "message",  # Commit message
+                                                            fields=node_fields + [
                                                                 QueryNode(
                                                                     "parents (first: 2)",  # Parent commits of the commit, limited to 2
                                                                     fields=[
@@ -140,3 +181,399 @@ class RepositoryCommits(PaginatedQuery):
                             cumulative_commits[name]['total_files'] = files
                             cumulative_commits[name]['total_commits'] = 1
         return cumulative_commits
+
+    @staticmethod
+    def _author_totals(pages: List[Dict[str, Dict]]) -> Dict[Tuple[Any, Optional[str]], List[int]]:
+        """
+        Sums the commits counted by commits_list per (name, login) author in one pass over the pages.
+        The flat key avoids the nested lookups and branches of commits_list for every commit.
+
+        Args:
+            pages: The raw data of each page, as returned by the GraphQL query.
+
+        Returns:
+            The additions, deletions, changed files and commits of each author, in order of first appearance.
+            The login is None for commits whose author is not linked to a GitHub user.
+        """
+        totals: Dict[Tuple[Any, Optional[str]], List[int]] = {}
+        for page in pages:
+            for node in page['repository']['defaultBranchRef']['target']['history']['nodes']:
+                parents = node['parents']
+                if parents and parents['totalCount'] < 2:
+                    author = node['author']
+                    user = author['user']
+                    key = (author['name'], (user['login'] if user else None) or None)
+                    total = totals.get(key)
+                    if total is None:
+                        totals[key] = [node['additions'], node['deletions'], node['changedFilesIfAvailable'], 1]
+                    else:
+                        total[0] += node['additions']
+                        total[1] += node['deletions']
+                        total[2] += node['changedFilesIfAvailable']
+                        total[3] += 1
+        return totals
+
+    @staticmethod
+    def commits_frame(pages: List[Dict[str, Dict]]) -> pd.DataFrame:
+        """
+        Builds a table of the commit data per author over many pages.
+
+        Args:
+            pages: The raw data of each page, as returned by the GraphQL query.
+
+        Returns:
+            A DataFrame with one row per (name, login) author, in order of first appearance, and the
+            total_additions, total_deletions, total_files and total_commits columns. The login is None
+            for commits whose author is not linked to a GitHub user.
+        """
+        totals = RepositoryCommits._author_totals(pages)
+        frame = pd.DataFrame(
+            np.array(list(totals.values()), dtype=np.int64).reshape(-1, len(COMMIT_TOTALS)),
+            columns=COMMIT_TOTALS,
+        )
+        frame.insert(0, 'name', [name for name, _ in totals])
+        frame.insert(1, 'login', [login for _, login in totals])
+        return frame
+
+    @staticmethod
+    def aggregate_commits(
+        pages: List[Dict[str, Dict]],
+        cumulative_commits: Optional[Dict[str, Dict]] = None,
+        as_frame: bool = False,
+    ) -> Union[Dict[str, Dict], pd.DataFrame]:
+        """
+        Accumulates commit data per author over many pages at once. The result is identical to calling
+        commits_list on every page in turn, but authors are only looked up in the nested dictionary once.
+
+        Args:
+            pages: The raw data of each page, as returned by the GraphQL query.
+            cumulative_commits: Optional cumulative commits dictionary to accumulate results.
+            as_frame: Whether to return the per-author DataFrame of commits_frame instead of the nested dictionary.
+
+        Returns:
+            A dictionary of cumulative commit data per author, as returned by commits_list, or a DataFrame.
+
+        Raises:
+            ValueError: If a DataFrame is requested along with cumulative commits to accumulate into.
+        """
+        if as_frame:
+            if cumulative_commits:
+                raise ValueError("Cumulative commits cannot be accumulated into a DataFrame")
+            return RepositoryCommits.commits_frame(pages)
+        if cumulative_commits is None:
+            cumulative_commits = {}
+        for (name, login), values in RepositoryCommits._author_totals(pages).items():
+            entry = cumulative_commits.setdefault(name, {})
+            target = entry.setdefault(login, {}) if login else entry
+            for key, value in zip(COMMIT_TOTALS, values):
+                target[key] = target[key] + value if key in target else value
+        return cumulative_commits
+
+    @staticmethod
+    def merge_commits(commits: Dict[str, Dict], cumulative_commits: Optional[Dict[str, Dict]] = None) -> Dict[str, Dict]:
+        """
+        Adds commit data per author, as returned by commits_list, to cumulative commits.
+
+        Args:
+            commits: The commit data per author to add.
+            cumulative_commits: Optional cumulative commits dictionary to accumulate results.
+
+        Returns:
+            A dictionary of cumulative commit data per author, as returned by commits_list.
+        """
+        if cumulative_commits is None:
+            cumulative_commits = {}
+        for name, entry in commits.items():
+            target = cumulative_commits.setdefault(name, {})
+            for key, value in entry.items():
+                if key in COMMIT_TOTALS:
+                    target[key] = target[key] + value if key in target else value
+                else:  # a login, holding the totals of its commits
+                    totals = target.setdefault(key, {})
+                    for total, count in value.items():
+                        totals[total] = totals[total] + count if total in totals else count
+        return cumulative_commits
+
+    @staticmethod
+    def _history_counts(client: Any, owner: str, repo_name: str, windows: List[Tuple[str, str]]) -> List[int]:
+        """
+        Fetches the number of commits in each time window with a single request, aliasing one
+        history(since, until) { totalCount } per window.
+
+        Args:
+            client: The client used to send the query.
+            owner: The login of the repository owner.
+            repo_name: The name of the repository.
+            windows: The (since, until) windows to count.
+
+        Returns:
+            The number of commits in each window, in the order given.
+        """
+        query = Query(
+            fields=[
+                QueryNode(
+                    "repository",
+                    args={"owner": owner, "name": repo_name},
+                    fields=[
+                        QueryNode(
+                            "defaultBranchRef",
+                            fields=[
+                                QueryNode(
+                                    "target",
+                                    fields=[
+                                        QueryNode(
+                                            "... on Commit",
+                                            fields=[
+                                                QueryNode(
+                                                    f"w{i}: history",
+                                                    args={"since": f'"{since}"', "until": f'"{until}"'},
+                                                    fields=["totalCount"],
+                                                )
+                                                for i, (since, until) in enumerate(windows)
+                                            ],
+                                        )
+                                    ],
+                                )
+                            ],
+                        )
+                    ],
+                )
+            ]
+        )
+        target = client.execute(query)['repository']['defaultBranchRef']['target']
+        return [target[f"w{i}"]['totalCount'] for i in range(len(windows))]
+
+    @staticmethod
+    def time_windows(
+        client: Any, owner: str, repo_name: str, since: str, until: str, max_commits: int
+    ) -> List[Tuple[str, str]]:
+        """
+        Splits [since, until] into adjacent, non-overlapping windows of at most max_commits commits each.
+        Windows that are too large are halved until they fit, and every round of splitting is counted
+        with one request.
+
+        Args:
+            client: The client used to probe the commit counts.
+            owner: The login of the repository owner.
+            repo_name: The name of the repository.
+            since: The start of the crawl, formatted as "%Y-%m-%dT%H:%M:%SZ".
+            until: The end of the crawl, formatted as "%Y-%m-%dT%H:%M:%SZ".
+            max_commits: The target number of commits per window.
+
+        Returns:
+            The windows as (since, until) pairs, newest first like the commit history itself.
+        """
+        done: List[Tuple[datetime, datetime]] = []
+        pending = [(datetime.strptime(since, TIME_FORMAT), datetime.strptime(until, TIME_FORMAT))]
+        while pending:
+            counts = RepositoryCommits._history_counts(
+                client, owner, repo_name,
+                [(start.strftime(TIME_FORMAT), end.strftime(TIME_FORMAT)) for start, end in pending],
+            )
+            next_pending = []
+            for (start, end), count in zip(pending, counts):
+                if count == 0:
+                    continue
+                if count <= max_commits or end - start < timedelta(seconds=2):
+                    done.append((start, end))
+                    continue
+                middle = start + (end - start) / 2
+                middle = middle.replace(microsecond=0)
+                # until is inclusive, so the second half starts one second after the first one ends
+                next_pending += [(start, middle), (middle + timedelta(seconds=1), end)]
+            pending = next_pending
+        done.sort(key=lambda window: window[0], reverse=True)
+        return [(start.strftime(TIME_FORMAT), end.strftime(TIME_FORMAT)) for start, end in done]
+
+    @staticmethod
+    def parallel_commits_list(
+        client: Any,
+        owner: str,
+        repo_name: str,
+        since: str,
+        until: str,
+        pg_size: int = 100,
+        pages_per_window: int = 10,
+        max_workers: int = 4,
+        cumulative_commits: Optional[Dict[str, Dict]] = None,
+        store: Any = None,
+    ) -> Dict[str, Dict]:
+        """
+        Crawls the commit history between since and until in parallel time windows and accumulates
+        commit data per author, like commits_list does for a sequential crawl.
+
+        Windows are crawled concurrently through the same client, so they share its connection pool and
+        rate limit budget. Pages are merged in history order (newest window first, pages in order), so the
+        result does not depend on which window finishes first.
+
+        Args:
+            client: The client used to send the queries. Its pool should allow max_workers connections.
+            owner: The login of the repository owner.
+            repo_name: The name of the repository.
+            since: The start of the crawl, formatted as "%Y-%m-%dT%H:%M:%SZ".
+            until: The end of the crawl, formatted as "%Y-%m-%dT%H:%M:%SZ".
+            pg_size: The number of commits per page.
+            pages_per_window: The target number of pages per window.
+            max_workers: The number of windows crawled at the same time.
+            cumulative_commits: Optional cumulative commits dictionary to accumulate results.
+            store: Optional CheckpointStore; each window is then crawled with resumable_commits_list, so
+                crawling the same range again after a failure continues the windows left unfinished.
+
+        Returns:
+            A dictionary of cumulative commit data per author, as returned by commits_list.
+        """
+        windows = RepositoryCommits.time_windows(
+            client, owner, repo_name, since, until, pg_size * pages_per_window
+        )
+
+        if store is not None:
+            def crawl_resumable(window: Tuple[str, str]) -> Dict[str, Dict]:
+                return RepositoryCommits.resumable_commits_list(
+                    client, store, owner, repo_name, pg_size, since=window[0], until=window[1]
+                )
+
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                window_commits = list(executor.map(crawl_resumable, windows))
+            for commits in window_commits:
+                cumulative_commits = RepositoryCommits.merge_commits(commits, cumulative_commits)
+            return cumulative_commits if cumulative_commits is not None else {}
+
+        def crawl(window: Tuple[str, str]) -> List[Dict[str, Dict]]:
+            query = RepositoryCommits(owner, repo_name, pg_size, since=window[0], until=window[1])
+            return list(client.execute(query))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            window_pages = list(executor.map(crawl, windows))
+
+        return RepositoryCommits.aggregate_commits(
+            [page for pages in window_pages for page in pages], cumulative_commits
+        )
+
+    @staticmethod
+    def new_history_nodes(
+        client: Any, query: PaginatedQuery, head_oid: Optional[str]
+    ) -> Tuple[List[Dict[str, Any]], Optional[str], bool]:
+        """
+        Pages through a commit history, newest first, until the commit a previous crawl started from.
+        The query must fetch the oid of each commit.
+
+        Args:
+            client: The client used to send the query.
+            query: A paginated query over defaultBranchRef.target.history.
+            head_oid: The newest commit seen by the previous crawl, or None if there was none.
+
+        Returns:
+            The commits newer than head_oid, the current head of the history, and whether head_oid was reached.
+            When head_oid is given but not reached, the history was rewritten and the commits are the whole history.
+        """
+        new_nodes: List[Dict[str, Any]] = []
+        new_head = None
+        for page in client.execute(query):
+            nodes = page['repository']['defaultBranchRef']['target']['history']['nodes']
+            if new_head is None and nodes:
+                new_head = nodes[0]['oid']
+            for node in nodes:
+                if head_oid is not None and node['oid'] == head_oid:
+                    return new_nodes, new_head or head_oid, True
+                new_nodes.append(node)
+        return new_nodes, new_head or head_oid, False
+
+    @staticmethod
+    def incremental_commits_list(
+        client: Any, store: Any, owner: str, repo_name: str, pg_size: int = 100, max_workers: int = 1
+    ) -> Dict[str, Dict]:
+        """
+        Accumulates commit data per author like commits_list, fetching only the commits made since the
+        checkpoint stored by the previous call and folding them into the stored totals.
+
+        The commits are crawled in two phases: the history is paged through without diff stats, which are
+        the expensive part of every page, then the diff stats of the new commits are looked up in batches
+        with enrich_diff_stats.
+
+        Args:
+            client: The client used to send the queries.
+            store: The CheckpointStore holding the head oid and per-author totals of each repository.
+            owner: The login of the repository owner.
+            repo_name: The name of the repository.
+            pg_size: The number of commits per skeleton page.
+            max_workers: The number of diff stats lookups sent at the same time.
+
+        Returns:
+            A dictionary of cumulative commit data per author, as returned by commits_list.
+        """
+        subject = f"{owner}/{repo_name}"
+        checkpoint = store.get("RepositoryCommits", subject) or {"head_oid": None, "commits": {}}
+        query = RepositoryCommits(owner, repo_name, pg_size, include_oid=True, diff_stats=False)
+        nodes, head_oid, found = RepositoryCommits.new_history_nodes(client, query, checkpoint["head_oid"])
+        RepositoryCommits.enrich_diff_stats(client, nodes, max_workers=max_workers)
+        # a rewritten history was crawled in full, so the stored totals are rebuilt instead of extended
+        commits = checkpoint["commits"] if found else {}
+        RepositoryCommits.aggregate_commits(
+            [{'repository': {'defaultBranchRef': {'target': {'history': {'nodes': nodes}}}}}], commits
+        )
+        store.put("RepositoryCommits", subject, {"head_oid": head_oid, "commits": commits})
+        return commits
+
+    @staticmethod
+    def resumable_commits_list(
+        client: Any, store: Any, owner: str, repo_name: str, pg_size: int = 100,
+        since: Optional[str] = None, until: Optional[str] = None,
+    ) -> Dict[str, Dict]:
+        """
+        Accumulates commit data per author like commits_list, checkpointing the cursor and the totals after
+        every page, so that a crawl that failed midway continues from its last page when called again.
+
+        Args:
+            client: The client used to send the queries.
+            store: The CheckpointStore holding the progress of unfinished crawls.
+            owner: The login of the repository owner.
+            repo_name: The name of the repository.
+            pg_size: The number of commits per page.
+            since: Optional start of the crawl, formatted as "%Y-%m-%dT%H:%M:%SZ".
+            until: Optional end of the crawl, formatted as "%Y-%m-%dT%H:%M:%SZ".
+
+        Returns:
+            A dictionary of cumulative commit data per author, as returned by commits_list.
+        """
+        query = RepositoryCommits(owner, repo_name, pg_size, since=since, until=until)
+        return client.execute_resumable(
+            query,
+            lambda commits, page: RepositoryCommits.aggregate_commits([page], commits),
+            {},
+            subject=f"{owner}/{repo_name}@{since or ''}..{until or ''}/{pg_size}",
+            store=store,
+        )
+
+    @staticmethod
+    def enrich_diff_stats(
+        client: Any, nodes: List[Dict[str, Any]], batch_size: int = MAX_IDS, max_workers: int = 1
+    ) -> List[Dict[str, Any]]:
+        """
+        Adds the diff stats to commit nodes crawled without them, looking them up in batches by node id.
+        Only the commits the aggregations count, those with fewer than 2 parents, are looked up.
+
+        Args:
+            client: The client used to send the queries.
+            nodes: Commit nodes of a history skeleton, i.e. crawled with diff_stats=False.
+            batch_size: The number of commits looked up per request, at most MAX_IDS.
+            max_workers: The number of lookups sent at the same time.
+
+        Returns:
+            The nodes, with additions, deletions and changedFilesIfAvailable set on every counted commit.
+
+        Raises:
+            ValueError: If the diff stats of a counted commit could not be found.
+        """
+        counted = [node for node in nodes if node['parents'] and node['parents']['totalCount'] < 2]
+        batches = [counted[i:i + batch_size] for i in range(0, len(counted), batch_size)]
+
+        def lookup(batch: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+            return CommitDiffStats.diff_stats(client.execute(CommitDiffStats([node['id'] for node in batch])))
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for batch, stats in zip(batches, executor.map(lookup, batches)):
+                for node in batch:
+                    if node['id'] not in stats:
+                        raise ValueError(f"The diff stats of commit {node['id']} could not be found")
+                    node.update(stats[node['id']])
+        return nodes
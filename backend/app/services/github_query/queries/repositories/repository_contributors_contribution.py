@@ -1,17 +1,41 @@
 from typing import Dict, List, Optional, Any
 from backend.app.services.github_query.github_graphql.query import QueryNode, PaginatedQuery, QueryNodePaginator
+from backend.app.services.github_query.queries.repositories.repository_commits import RepositoryCommits
 
 class RepositoryContributorsContribution(PaginatedQuery):
-    def __init__(self) -> None:
+    def __init__(
+        self,
+        owner: str,
+        repo_name: str,
+        author_id: str,
+        pg_size: int,
+        include_oid: bool = False,
+        diff_stats: bool = True,
+    ) -> None:
         """
         Initializes a paginated query to extract contributions made by contributors in a specific repository.
         Focuses on the commit history of the repository's default branch, targeting individual contributions.
+
+        Args:
+            owner: The login of the repository owner.
+            repo_name: The name of the repository.
+            author_id: The node id of the GitHub user whose commits are fetched.
+            pg_size: The number of commits per page.
+            include_oid: Whether to also fetch the object id of each commit, as needed by incremental syncs.
+            diff_stats: Whether to fetch the diff stats and message of each commit. Without them, the query
+                        crawls a cheap skeleton of the history for RepositoryCommits.enrich_diff_stats.
         """
+        author = {"id": f'"{author_id}"'}
+        node_fields = ["oid"] if include_oid else []
+        if diff_stats:
+            node_fields += ["authoredDate", "changedFilesIfAvailable", "additions", "deletions", "message"]
+        else:
+            node_fields = ["id"] + node_fields + ["authoredDate"]
         super().__init__(
             fields=[
                 QueryNode(
                     "repository",
-                    args={"owner": "$owner", "name": "$repo_name"},
+                    args={"owner": owner, "name": repo_name},
                     fields=[
                         QueryNode(
                             "defaultBranchRef",
@@ -24,17 +48,12 @@ class RepositoryContributorsContribution(PaginatedQuery):
                                             fields=[
                                                 QueryNodePaginator(
                                                     "history",
-                                                    args={"author": "$id", "first": "$pg_size"},
+                                                    args={"author": author, "first": pg_size},
                                                     fields=[
                                                         "totalCount",
                                                         QueryNode(
                                                             "nodes",
-                                                            fields=[
-                                                                "authoredDate",
-                                                                "changedFilesIfAvailable",
-                                                                "additions",
-                                                                "deletions",
-                                                                "message",
+                                                            fields=node_fields + [
                                                                 QueryNode(
                                                                     "parents (first: 2)",
                                                                     fields=["totalCount"]
@@ -83,6 +102,44 @@ class RepositoryContributorsContribution(PaginatedQuery):
         
         return cumulative_contribution
 
+    @staticmethod
+    def incremental_user_contribution(
+        client: Any, store: Any, owner: str, repo_name: str, author_id: str, pg_size: int = 100,
+        max_workers: int = 1,
+    ) -> Dict[str, int]:
+        """
+        Calculates cumulative contribution statistics like user_cumulated_contribution, fetching only the
+        commits made since the checkpoint stored by the previous call and folding them into the stored totals.
+        The history of the author is crawled without diff stats, then the diff stats of the new commits are
+        looked up in batches with RepositoryCommits.enrich_diff_stats.
+
+        Args:
+            client: The client used to send the queries.
+            store: The CheckpointStore holding the head oid and totals of each repository and author.
+            owner: The login of the repository owner.
+            repo_name: The name of the repository.
+            author_id: The node id of the GitHub user.
+            pg_size: The number of commits per skeleton page.
+            max_workers: The number of diff stats lookups sent at the same time.
+
+        Returns:
+            Dict[str, int]: A dictionary containing the cumulative statistics: total additions, deletions, and commits.
+        """
+        subject = f"{owner}/{repo_name}/{author_id}"
+        checkpoint = store.get("RepositoryContributorsContribution", subject) or {"head_oid": None, "contribution": None}
+        query = RepositoryContributorsContribution(owner, repo_name, author_id, pg_size, include_oid=True, diff_stats=False)
+        nodes, head_oid, found = RepositoryCommits.new_history_nodes(client, query, checkpoint["head_oid"])
+        RepositoryCommits.enrich_diff_stats(client, nodes, max_workers=max_workers)
+        # a rewritten history was crawled in full, so the stored totals are rebuilt instead of extended
+        contribution = RepositoryContributorsContribution.user_cumulated_contribution(
+            {'repository': {'defaultBranchRef': {'target': {'history': {'nodes': nodes}}}}},
+            checkpoint["contribution"] if found else None,
+        )
+        store.put(
+            "RepositoryContributorsContribution", subject, {"head_oid": head_oid, "contribution": contribution}
+        )
+        return contribution
+
     @staticmethod
     def user_commit_contribution(raw_data: Dict[str, Any], commit_contributions: Optional[List[Dict[str, int]]] = None) -> List[Dict[str, int]]:
         """
@@ -1,5 +1,7 @@
 from .user_contributions_collection import UserContributionsCollection
+from .user_semester_snapshots import UserSemesterSnapshots
 
 __all__ = [
     "UserContributionsCollection",
+    "UserSemesterSnapshots",
 ]
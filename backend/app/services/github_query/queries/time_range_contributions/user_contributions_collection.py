@@ -1,131 +1,169 @@
-
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional, Tuple
 from collections import Counter
-from backend.app.services.github_query.github_graphql.query import QueryNode, Query
+from datetime import datetime, timedelta, timezone
+from backend.app.services.github_query.github_graphql.query import QueryNode, Query, QueryVariable
+from backend.app.services.github_query.utils.helper import TIME_FORMAT, parse_datetime
 from backend.app.services.github_query.queries.constants import (
-    FIELD_LOGIN, FIELD_STARTED_AT, FIELD_ENDED_AT, FIELD_RESTRICTED_CONTRIBUTIONS_COUNT,
+    FIELD_STARTED_AT, FIELD_ENDED_AT, FIELD_RESTRICTED_CONTRIBUTIONS_COUNT,
     FIELD_TOTAL_COMMIT_CONTRIBUTIONS, FIELD_TOTAL_ISSUE_CONTRIBUTIONS,
     FIELD_TOTAL_PULL_REQUEST_CONTRIBUTIONS, FIELD_TOTAL_PULL_REQUEST_REVIEW_CONTRIBUTIONS,
-    FIELD_TOTAL_REPOSITORY_CONTRIBUTIONS, NODE_USER, NODE_CONTRIBUTIONS_COLLECTION
+    FIELD_TOTAL_REPOSITORY_CONTRIBUTIONS, NODE_USER, NODE_CONTRIBUTIONS_COLLECTION, ARG_LOGIN, ARG_FROM, ARG_TO,
+    TYPE_LOGIN, TYPE_DATE_TIME
 )
 
+# GitHub rejects a contributionsCollection spanning more than a year
+MAX_WINDOW = timedelta(days=365)
+
+CONTRIBUTION_FIELDS = [
+    FIELD_STARTED_AT,
+    FIELD_ENDED_AT,
+    FIELD_RESTRICTED_CONTRIBUTIONS_COUNT,
+    FIELD_TOTAL_COMMIT_CONTRIBUTIONS,
+    FIELD_TOTAL_ISSUE_CONTRIBUTIONS,
+    FIELD_TOTAL_PULL_REQUEST_CONTRIBUTIONS,
+    FIELD_TOTAL_PULL_REQUEST_REVIEW_CONTRIBUTIONS,
+    FIELD_TOTAL_REPOSITORY_CONTRIBUTIONS,
+]
+
+
 class UserContributionsCollection(Query):
     def __init__(self, user: str, start_date: str, end_date: str) -> None:
         """
-        Initializes a UserContributionsCollection query object.
+        Initializes a UserContributionsCollection query object to fetch the contribution counts of a user
+        between two dates. Ranges longer than a year are split into windows of at most a year, each
+        requested as an aliased contributionsCollection (w0, w1, ...) of the same document. The login and
+        the window bounds are sent as variables, so every user and range of the same length shares a document.
+
+        Args:
+            user: The login of the user.
+            start_date: The start of the range, as an ISO 8601 date or date-time, e.g. "%Y-%m-%dT%H:%M:%SZ".
+            end_date: The end of the range, in the same formats as start_date.
+
+        Raises:
+            ValueError: If a date is malformed or the range is empty.
         """
+        self.windows = UserContributionsCollection.split_windows(start_date, end_date)
         super().__init__(
             fields=[
                 QueryNode(
                     NODE_USER,
                     args={
-                        FIELD_LOGIN: user  # Remove extra quotes, QueryNode will handle it
+                        ARG_LOGIN: QueryVariable(ARG_LOGIN, TYPE_LOGIN, user)
                     },
                     fields=[
                         QueryNode(
-                            NODE_CONTRIBUTIONS_COLLECTION,
+                            f"w{i}: {NODE_CONTRIBUTIONS_COLLECTION}",
                             args={
-                                FIELD_STARTED_AT: start_date,  # Remove extra quotes
-                                FIELD_ENDED_AT: end_date,
+                                ARG_FROM: QueryVariable(f"w{i}_from", TYPE_DATE_TIME, window_start),
+                                ARG_TO: QueryVariable(f"w{i}_to", TYPE_DATE_TIME, window_end),
                             },
-                            fields=[
-                                FIELD_STARTED_AT,
-                                FIELD_ENDED_AT,
-                                FIELD_RESTRICTED_CONTRIBUTIONS_COUNT,
-                                FIELD_TOTAL_COMMIT_CONTRIBUTIONS,
-                                FIELD_TOTAL_ISSUE_CONTRIBUTIONS,
-                                FIELD_TOTAL_PULL_REQUEST_CONTRIBUTIONS,
-                                FIELD_TOTAL_PULL_REQUEST_REVIEW_CONTRIBUTIONS,
-                                FIELD_TOTAL_REPOSITORY_CONTRIBUTIONS,
-                            ],
-                        ),
+                            fields=CONTRIBUTION_FIELDS,
+                        )
+                        for i, (window_start, window_end) in enumerate(self.windows)
                     ],
                 )
             ]
         )
+        self.end_date = end_date
 
-    @staticmethod
-    def user_contributions_collection(cumulated_contributions_collection: dict) -> Counter:
-        """Process the contributions data"""
+    def cache_ttl(self) -> Optional[float]:
+        """
+        Decides how long the response may be cached. A window that ended in the past can no longer
+        change and is kept forever; an open window is refreshed after a few minutes.
+
+        Returns:
+            Optional[float]: The time to live in seconds, or None to never expire.
+        """
         try:
-            if 'data' in cumulated_contributions_collection:
-                cumulated_contributions_collection = cumulated_contributions_collection['data']
-                
-            raw_data = cumulated_contributions_collection[NODE_USER][NODE_CONTRIBUTIONS_COLLECTION]
-            return Counter({
-                "res_con": raw_data[FIELD_RESTRICTED_CONTRIBUTIONS_COUNT],
-                "commit": raw_data[FIELD_TOTAL_COMMIT_CONTRIBUTIONS],
-                "issue": raw_data[FIELD_TOTAL_ISSUE_CONTRIBUTIONS],
-                "pr": raw_data[FIELD_TOTAL_PULL_REQUEST_CONTRIBUTIONS],
-                "pr_review": raw_data[FIELD_TOTAL_PULL_REQUEST_REVIEW_CONTRIBUTIONS],
-                "repository": raw_data[FIELD_TOTAL_REPOSITORY_CONTRIBUTIONS],
-            })
-        except Exception as e:
-            print(f"Error processing data: {str(e)}")
-            print(f"Raw data: {cumulated_contributions_collection}")
-            raise
-    def __init__(self, user: str, start_date: str, end_date: str) -> None:
+            end = parse_datetime(self.end_date).replace(tzinfo=timezone.utc)
+        except (TypeError, ValueError):
+            return 300
+        return None if end < datetime.now(timezone.utc) else 300
+
+    @staticmethod
+    def split_windows(start_date: str, end_date: str) -> List[Tuple[str, str]]:
         """
-        Initializes a UserContributionsCollection query object.
+        Splits a date range into consecutive windows that GitHub accepts, each spanning at most MAX_WINDOW.
+        A window ends one second before the next one starts, so no contribution is counted twice.
+
+        Args:
+            start_date: The start of the range, as an ISO 8601 date or date-time, e.g. "%Y-%m-%dT%H:%M:%SZ".
+            end_date: The end of the range, in the same formats as start_date.
+
+        Returns:
+            The (from, to) windows covering the range in UTC, formatted as "%Y-%m-%dT%H:%M:%SZ", oldest first.
+
+        Raises:
+            ValueError: If a date is malformed or the range is empty.
         """
-        # Format the query with proper quotes
-        query = f'''
-            query {{
-                user(login: "{user}") {{
-                    contributionsCollection(from: "{start_date}", to: "{end_date}") {{
-                        restrictedContributionsCount
-                        totalCommitContributions
-                        totalIssueContributions
-                        totalPullRequestContributions
-                        totalPullRequestReviewContributions
-                        totalRepositoryContributions
-                    }}
-                }}
-            }}
-        '''
-        super().__init__(query=query)
+        start = parse_datetime(start_date).replace(microsecond=0)
+        end = parse_datetime(end_date).replace(microsecond=0)
+        if end <= start:
+            raise ValueError("The end of the range must be after its start")
+        windows = []
+        while end - start > MAX_WINDOW:
+            window_end = start + MAX_WINDOW - timedelta(seconds=1)
+            windows.append((start.strftime(TIME_FORMAT), window_end.strftime(TIME_FORMAT)))
+            start += MAX_WINDOW
+        windows.append((start.strftime(TIME_FORMAT), end.strftime(TIME_FORMAT)))
+        return windows
 
     @staticmethod
-    def user_contributions_collection(cumulated_contributions_collection: dict) -> Counter:
-        raw_data = cumulated_contributions_collection.get('user', {}).get('contributionsCollection', {})
+    def _window_collections(raw_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        if 'data' in raw_data:
+            raw_data = raw_data['data']
+        user = raw_data.get(NODE_USER) or {}
+        if NODE_CONTRIBUTIONS_COLLECTION in user:
+            # a response to a single unaliased contributionsCollection
+            return [user[NODE_CONTRIBUTIONS_COLLECTION] or {}]
+        aliases = sorted((alias for alias in user if alias[:1] == "w" and alias[1:].isdigit()),
+                         key=lambda alias: int(alias[1:]))
+        return [user[alias] or {} for alias in aliases]
+
+    @staticmethod
+    def _counts(raw_data: Dict[str, Any]) -> Counter:
         return Counter({
-            "res_con": raw_data.get('restrictedContributionsCount', 0),
-            "commit": raw_data.get('totalCommitContributions', 0),
-            "issue": raw_data.get('totalIssueContributions', 0),
-            "pr": raw_data.get('totalPullRequestContributions', 0),
-            "pr_review": raw_data.get('totalPullRequestReviewContributions', 0),
-            "repository": raw_data.get('totalRepositoryContributions', 0),
+            "res_con": raw_data.get(FIELD_RESTRICTED_CONTRIBUTIONS_COUNT, 0),
+            "commit": raw_data.get(FIELD_TOTAL_COMMIT_CONTRIBUTIONS, 0),
+            "issue": raw_data.get(FIELD_TOTAL_ISSUE_CONTRIBUTIONS, 0),
+            "pr": raw_data.get(FIELD_TOTAL_PULL_REQUEST_CONTRIBUTIONS, 0),
+            "pr_review": raw_data.get(FIELD_TOTAL_PULL_REQUEST_REVIEW_CONTRIBUTIONS, 0),
+            "repository": raw_data.get(FIELD_TOTAL_REPOSITORY_CONTRIBUTIONS, 0),
         })
-    def __init__(self, user: str, start_date: str, end_date: str) -> None:
+
+    @staticmethod
+    def user_contributions_collection(cumulated_contributions_collection: dict) -> Counter:
         """
-        Initializes a UserContributionsCollection query object to fetch detailed contribution information of a user.
+        Merges the contribution counts of every window of the response into one Counter.
+
+        Args:
+            cumulated_contributions_collection: The raw data returned by the GraphQL query.
+
+        Returns:
+            Counter: The contribution counts over the whole range, missing values counting as 0.
         """
-        super().__init__(
-            fields=[
-                QueryNode(
-                    NODE_USER,
-                    args={
-                        FIELD_LOGIN: f'"{user}"'  # Add quotes around the username
-                    },
-                    fields=[
-                        QueryNode(
-                            NODE_CONTRIBUTIONS_COLLECTION,
-                            args={
-                                FIELD_STARTED_AT: f'"{start_date}"',  # Add quotes around dates
-                                FIELD_ENDED_AT: f'"{end_date}"',
-                            },
-                            fields=[
-                                FIELD_STARTED_AT,
-                                FIELD_ENDED_AT,
-                                FIELD_RESTRICTED_CONTRIBUTIONS_COUNT,
-                                FIELD_TOTAL_COMMIT_CONTRIBUTIONS,
-                                FIELD_TOTAL_ISSUE_CONTRIBUTIONS,
-                                FIELD_TOTAL_PULL_REQUEST_CONTRIBUTIONS,
-                                FIELD_TOTAL_PULL_REQUEST_REVIEW_CONTRIBUTIONS,
-                                FIELD_TOTAL_REPOSITORY_CONTRIBUTIONS,
-                            ],
-                        ),
-                    ],
-                )
-            ]
-        )
\ No newline at end of file
+        total = Counter(dict.fromkeys(["res_con", "commit", "issue", "pr", "pr_review", "repository"], 0))
+        for window in UserContributionsCollection._window_collections(cumulated_contributions_collection):
+            # Counter.update adds, unlike the + operator it keeps the zero counts
+            total.update(UserContributionsCollection._counts(window))
+        return total
+
+    @staticmethod
+    def contributions_by_window(cumulated_contributions_collection: dict) -> List[Dict[str, Any]]:
+        """
+        Breaks the contribution counts of the response down by window.
+
+        Args:
+            cumulated_contributions_collection: The raw data returned by the GraphQL query.
+
+        Returns:
+            list: The startedAt, endedAt and contribution counts of each window, oldest first.
+        """
+        return [
+            {
+                "start": window.get(FIELD_STARTED_AT),
+                "end": window.get(FIELD_ENDED_AT),
+                "counts": UserContributionsCollection._counts(window),
+            }
+            for window in UserContributionsCollection._window_collections(cumulated_contributions_collection)
+        ]
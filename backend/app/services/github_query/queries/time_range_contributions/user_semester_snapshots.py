@@ -0,0 +1,99 @@
+from typing import Dict, Any, List, Tuple
+from datetime import datetime
+from backend.app.services.github_query.github_graphql.query import QueryNode, Query, QueryVariable
+from backend.app.services.github_query.utils.helper import TIME_FORMAT
+from backend.app.services.github_query.queries.time_range_contributions.user_contributions_collection import (
+    UserContributionsCollection, CONTRIBUTION_FIELDS
+)
+from backend.app.services.github_query.queries.constants import (
+    ARG_LOGIN, ARG_FROM, ARG_TO, FIELD_LOGIN, FIELD_CREATED_AT,
+    FIELD_RESTRICTED_CONTRIBUTIONS_COUNT, FIELD_TOTAL_COMMIT_CONTRIBUTIONS, FIELD_TOTAL_ISSUE_CONTRIBUTIONS,
+    FIELD_TOTAL_PULL_REQUEST_CONTRIBUTIONS, FIELD_TOTAL_PULL_REQUEST_REVIEW_CONTRIBUTIONS,
+    FIELD_TOTAL_REPOSITORY_CONTRIBUTIONS, NODE_USER, NODE_CONTRIBUTIONS_COLLECTION, TYPE_LOGIN, TYPE_DATE_TIME
+)
+
+# GitHubUserData columns counted per window, and the contributionsCollection field each one comes from.
+# The gists, discussions and comments columns are left out: GitHub only reports them as lifetime profile
+# totals, which do not belong to any one semester.
+WINDOW_COLUMNS = {
+    "private_contributions": FIELD_RESTRICTED_CONTRIBUTIONS_COUNT,
+    "commits": FIELD_TOTAL_COMMIT_CONTRIBUTIONS,
+    "issues": FIELD_TOTAL_ISSUE_CONTRIBUTIONS,
+    "prs": FIELD_TOTAL_PULL_REQUEST_CONTRIBUTIONS,
+    "pr_reviews": FIELD_TOTAL_PULL_REQUEST_REVIEW_CONTRIBUTIONS,
+    "repos": FIELD_TOTAL_REPOSITORY_CONTRIBUTIONS,
+}
+class UserSemesterSnapshots(Query):
+    def __init__(self, user: str, windows: List[Tuple[str, str]]) -> None:
+        """
+        Initializes a query fetching everything needed to build the snapshots of a user for several
+        semesters at once: one aliased contributionsCollection per semester (s<i>_0, s<i>_1, ... when
+        a semester spans more than a year), all in a single document.
+
+        Args:
+            user: The login of the user.
+            windows: The (start, end) window of each semester, as "%Y-%m-%dT%H:%M:%SZ".
+
+        Raises:
+            ValueError: If there are no windows, or one of them is malformed or empty.
+        """
+        if not windows:
+            raise ValueError("At least one semester window is needed")
+        self.windows = [UserContributionsCollection.split_windows(start, end) for start, end in windows]
+        super().__init__(
+            fields=[
+                QueryNode(
+                    NODE_USER,
+                    args={ARG_LOGIN: QueryVariable(ARG_LOGIN, TYPE_LOGIN, user)},
+                    fields=[
+                        FIELD_LOGIN,
+                        FIELD_CREATED_AT,
+                    ] + [
+                        QueryNode(
+                            f"s{i}_{j}: {NODE_CONTRIBUTIONS_COLLECTION}",
+                            args={
+                                ARG_FROM: QueryVariable(f"s{i}_{j}_from", TYPE_DATE_TIME, window_start),
+                                ARG_TO: QueryVariable(f"s{i}_{j}_to", TYPE_DATE_TIME, window_end),
+                            },
+                            fields=CONTRIBUTION_FIELDS,
+                        )
+                        for i, sub_windows in enumerate(self.windows)
+                        for j, (window_start, window_end) in enumerate(sub_windows)
+                    ],
+                )
+            ]
+        )
+
+    def snapshots(self, raw_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """
+        Builds the GitHubUserData columns of each semester from the raw data.
+
+        Args:
+            raw_data: The raw data returned by the GraphQL query.
+
+        Returns:
+            list: One dictionary per semester, in the order of the windows, with its github_login,
+            start_at, end_at, period and lifetime (in days), and its contribution counts.
+        """
+        if 'data' in raw_data:
+            raw_data = raw_data['data']
+        user = raw_data[NODE_USER]
+        account_created = datetime.strptime(user[FIELD_CREATED_AT], TIME_FORMAT)
+
+        snapshots = []
+        for i, sub_windows in enumerate(self.windows):
+            start_at = datetime.strptime(sub_windows[0][0], TIME_FORMAT)
+            end_at = datetime.strptime(sub_windows[-1][1], TIME_FORMAT)
+            snapshot = {
+                "github_login": user[FIELD_LOGIN],
+                "start_at": start_at,
+                "end_at": end_at,
+                "period": (end_at - start_at).days,
+                "lifetime": max(0, (end_at - account_created).days),
+            }
+            for column, field in WINDOW_COLUMNS.items():
+                snapshot[column] = sum(
+                    (user.get(f"s{i}_{j}") or {}).get(field, 0) for j in range(len(sub_windows))
+                )
+            snapshots.append(snapshot)
+        return snapshots
@@ -0,0 +1,107 @@
+"""The module defines the WindowedPaginatedQuery class, the base of the user contribution and comment queries,
+which pages through a connection in creation order and stops as soon as its nodes leave a time window."""
+
+import math
+from typing import Any, Dict, Optional
+import backend.app.services.github_query.utils.helper as helper
+from backend.app.services.github_query.github_graphql.query import PaginatedQuery
+from backend.app.services.github_query.queries.constants import (
+    NODE_NODES,
+    FIELD_CREATED_AT,
+    FIELD_TOTAL_COUNT,
+    ARG_FIRST,
+    ARG_ORDER_BY,
+    ARG_FIELD,
+    ARG_DIRECTION,
+)
+
+
+class WindowedPaginatedQuery(PaginatedQuery):
+    """
+    WindowedPaginatedQuery is a PaginatedQuery over a connection of nodes with a createdAt field.
+    Its windowed_nodes method only fetches the pages needed to collect the nodes created in a time window,
+    instead of the whole history of the user.
+    """
+
+    # the orderBy field sorting the connection by creation time, or None if GitHub offers none; the
+    # connection is then assumed to come in its default order, oldest first
+    created_order_field: Optional[str] = None
+
+    def order_by_creation(self, descending: bool = False) -> None:
+        """
+        Requests the nodes of the connection sorted by creation time.
+
+        Args:
+            descending (bool): Whether to request the newest nodes first.
+
+        Raises:
+            ValueError: If newest first is requested from a connection that cannot be ordered.
+        """
+        if self.created_order_field is not None:
+            self.paginator.args[ARG_ORDER_BY] = {
+                ARG_FIELD: self.created_order_field,
+                ARG_DIRECTION: "DESC" if descending else "ASC",
+            }
+        elif descending:
+            raise ValueError(f"{type(self).__name__} cannot be ordered newest first")
+
+    def windowed_nodes(
+        self,
+        client: Any,
+        start: Optional[str] = None,
+        end: Optional[str] = None,
+        descending: bool = False,
+    ) -> Dict[str, Any]:
+        """
+        Pages through the connection in creation order, collecting the nodes created in [start, end),
+        and stops paginating once a node crosses the far end of the window.
+
+        Args:
+            client (Any): The client used to send the query.
+            start (Optional[str]): The start of the window, included. Unbounded if omitted.
+            end (Optional[str]): The end of the window, excluded. Unbounded if omitted.
+            descending (bool): Whether to page from the newest node, which is cheaper for recent windows
+                of long histories. Only supported by connections with a created_order_field.
+
+        Returns:
+            Dict[str, Any]: The nodes in the window, the number of pages fetched, the number of pages
+            skipped thanks to the early stop (None if the page size is not known), and the totalCount
+            of the connection.
+        """
+        self.order_by_creation(descending)
+        low = helper.parse_time(start) if start else None
+        high = helper.parse_time(end) if end else None
+
+        nodes = []
+        pages = 0
+        total_count = None
+        for page in client.execute(self):
+            pages += 1
+            connection = page
+            for field_name in self.path:
+                connection = connection[field_name]
+            total_count = connection.get(FIELD_TOTAL_COUNT, total_count)
+
+            crossed = False
+            for node in connection[NODE_NODES]:
+                created = helper.parse_time(node[FIELD_CREATED_AT])
+                before_window = low is not None and created < low
+                after_window = high is not None and created >= high
+                if (after_window and not descending) or (before_window and descending):
+                    crossed = True
+                    break
+                if not (before_window or after_window):
+                    nodes.append(node)
+            if crossed:
+                break
+
+        pg_size = self.paginator.args.get(ARG_FIRST)
+        pages_skipped = None
+        if isinstance(pg_size, int) and total_count is not None:
+            pages_skipped = max(0, math.ceil(total_count / pg_size) - pages)
+        return {
+            "nodes": nodes,
+            "pages_fetched": pages,
+            "pages_skipped": pages_skipped,
+            "total_count": total_count,
+        }
@@ -2,7 +2,8 @@ import os
 import re
 import string
 import random
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
+from typing import Union
 from backend.app.services.github_query.github_graphql.query import Query
 from backend.app.services.github_query.github_graphql.client import Client
 from backend.app.services.github_query.queries.costs.query_cost import QueryCost
@@ -107,53 +108,104 @@ def minus_by_days(time_string: str, days: int) -> str:
     return new_time_string
 
 
-def in_time_period(time: str, start: str, end: str) -> bool:
+TIME_FORMAT = '%Y-%m-%dT%H:%M:%SZ'
+_EPOCH = datetime(1970, 1, 1)
+
+
+def parse_time(time_string: str) -> float:
+    """
+    Converts a time string formatted as "%Y-%m-%dT%H:%M:%SZ" (as returned by GitHub) to seconds since the epoch.
+    Well-formed strings take the fromisoformat fast path; anything else goes through strptime, which raises
+    the same ValueError as before on invalid input.
+
+    Args:
+        time_string (str): The time string.
+
+    Returns:
+        float: The UTC timestamp of the time string.
+    """
+    if len(time_string) == 20 and time_string[10] == 'T' and time_string[19] == 'Z':
+        try:
+            return (datetime.fromisoformat(time_string[:19]) - _EPOCH).total_seconds()
+        except ValueError:
+            pass
+    return (datetime.strptime(time_string, TIME_FORMAT) - _EPOCH).total_seconds()
+
+
+def parse_datetime(value: str) -> datetime:
+    """
+    Parses an ISO 8601 date or date-time as GitHub's DateTime inputs accept them, e.g. "2021-01-01",
+    "2021-01-01T00:00:00Z" or "2021-01-01T02:00:00.000+02:00".
+
+    Args:
+        value (str): The date or date-time. A date means its midnight, and no offset means UTC.
+
+    Returns:
+        datetime: The naive UTC datetime.
+
+    Raises:
+        ValueError: If the value is not an ISO 8601 date or date-time.
+    """
+    parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00").replace("z", "+00:00"))
+    if parsed.tzinfo is not None:
+        parsed = parsed.astimezone(timezone.utc).replace(tzinfo=None)
+    return parsed
+
+
+def to_timestamp(time: Union[str, float]) -> float:
+    """
+    Returns the timestamp of a time string, or the time itself if it was already parsed with parse_time.
+    This lets callers parse a constant cutoff once and pass it to the predicates below for every node.
+
+    Args:
+        time (Union[str, float]): A time string or a timestamp.
+
+    Returns:
+        float: The UTC timestamp.
+    """
+    return parse_time(time) if isinstance(time, str) else time
+
+
+def in_time_period(time: Union[str, float], start: Union[str, float], end: Union[str, float]) -> bool:
     """
     Determines if a given time is within a specified time period.
     
     Args:
-        time (str): The time to check.
-        start (str): The start of the period.
-        end (str): The end of the period.
+        time (Union[str, float]): The time to check.
+        start (Union[str, float]): The start of the period.
+        end (Union[str, float]): The end of the period.
     
     Returns:
         bool: True if the time is within the period; False otherwise.
     """
-    time = datetime.strptime(time, '%Y-%m-%dT%H:%M:%SZ')
-    start = datetime.strptime(start, '%Y-%m-%dT%H:%M:%SZ')
-    end = datetime.strptime(end, '%Y-%m-%dT%H:%M:%SZ')
-    return end >= time >= start
+    return to_timestamp(end) >= to_timestamp(time) >= to_timestamp(start)
 
 
-def created_before(created: str, time: str) -> bool:
+def created_before(created: Union[str, float], time: Union[str, float]) -> bool:
     """
     Determines if an object was created before a certain time.
     
     Args:
-        created (str): The creation time of the object.
-        time (str): The time to compare against.
+        created (Union[str, float]): The creation time of the object.
+        time (Union[str, float]): The time to compare against.
     
     Returns:
         bool: True if created before the specified time; False otherwise.
     """
-    time = datetime.strptime(time, '%Y-%m-%dT%H:%M:%SZ')
-    created = datetime.strptime(created, '%Y-%m-%dT%H:%M:%SZ')
-    return created < time
+    return to_timestamp(created) < to_timestamp(time)
 
-def created_after(created: str, time: str) -> bool:
+def created_after(created: Union[str, float], time: Union[str, float]) -> bool:
     """
     Determines if an object was created after a certain time.
     
     Args:
-        created (str): The creation time of the object.
-        time (str): The time to compare against.
+        created (Union[str, float]): The creation time of the object.
+        time (Union[str, float]): The time to compare against.
     
     Returns:
         bool: True if created after the specified time; False otherwise.
     """
-    time = datetime.strptime(time, '%Y-%m-%dT%H:%M:%SZ')
-    created = datetime.strptime(created, '%Y-%m-%dT%H:%M:%SZ')
-    return created > time
+    return to_timestamp(created) > to_timestamp(time)
 
 
 def write_csv(file: str, data_row: str) -> None:
@@ -0,0 +1,92 @@
+from typing import Dict, Any, Optional
+from flask import session
+from app.services.github_query.github_graphql.client import (
+    Client,
+    QueryFailedException,
+)
+from app.services.github_query.github_graphql.authentication import (
+    PersonalAccessTokenAuthenticator,
+)
+from backend.app.services.github_query.github_graphql.checkpoint import get_default_checkpoint_store
+
+from app.services.github_query.queries.repositories.repository_commits import (RepositoryCommits)
+from app.services.github_query.queries.repositories.repository_contributors_contribution import (RepositoryContributorsContribution)
+
+
+def get_repository_commits(owner: str, repo_name: str, token: Optional[str] = None) -> Dict[str, Any]:
+    """
+    Returns the commit totals of each author of a repository. Only the commits made since the previous
+    sync of the repository are fetched; the totals are kept in the checkpoint store between calls.
+    """
+    auth_token = token or session.get("access_token")
+    if not auth_token:
+        return {"error": "User not authenticated"}
+
+    client = Client(
+        host="api.github.com",
+        is_enterprise=False,
+        authenticator=PersonalAccessTokenAuthenticator(token=auth_token),
+    )
+
+    try:
+        return RepositoryCommits.incremental_commits_list(
+            client, get_default_checkpoint_store(), owner, repo_name
+        )
+    except QueryFailedException as e:
+        return {"error": str(e)}
+
+
+def get_repository_commits_between(
+    owner: str, repo_name: str, since: str, until: str, token: Optional[str] = None, max_workers: int = 4
+) -> Dict[str, Any]:
+    """
+    Returns the commit totals of each author of a repository between two dates. The range is split
+    into time windows of similar commit counts, which are crawled in parallel; a crawl of the same
+    range that failed midway is continued from the checkpoints of its unfinished windows.
+
+    Raises:
+        ValueError: If a date is not formatted as "%Y-%m-%dT%H:%M:%SZ".
+    """
+    auth_token = token or session.get("access_token")
+    if not auth_token:
+        return {"error": "User not authenticated"}
+
+    client = Client(
+        host="api.github.com",
+        is_enterprise=False,
+        authenticator=PersonalAccessTokenAuthenticator(token=auth_token),
+        pool_maxsize=max(10, max_workers),
+    )
+
+    try:
+        return RepositoryCommits.parallel_commits_list(
+            client, owner, repo_name, since, until, max_workers=max_workers,
+            store=get_default_checkpoint_store(),
+        )
+    except QueryFailedException as e:
+        return {"error": str(e)}
+
+
+def get_repository_user_contribution(
+    owner: str, repo_name: str, author_id: str, token: Optional[str] = None
+) -> Dict[str, Any]:
+    """
+    Returns the additions, deletions and commits of one author to a repository. Only the commits made
+    since the previous sync of the repository and author are fetched.
+    """
+    auth_token = token or session.get("access_token")
+    if not auth_token:
+        return {"error": "User not authenticated"}
+
+    client = Client(
+        host="api.github.com",
+        is_enterprise=False,
+        authenticator=PersonalAccessTokenAuthenticator(token=auth_token),
+    )
+
+    try:
+        return RepositoryContributorsContribution.incremental_user_contribution(
+            client, get_default_checkpoint_store(), owner, repo_name, author_id
+        )
+    except QueryFailedException as e:
+        return {"error": str(e)}
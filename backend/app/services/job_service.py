@@ -0,0 +1,269 @@
+import json
+import time
+import uuid
+import hashlib
+import threading
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Iterator, Optional
+from flask import Flask, current_app
+from sqlalchemy.exc import IntegrityError
+
+from app.database import db
+from app.models.crawl_job import CrawlJob, CrawlJobPage
+from app.services.github_comments_service import (get_user_commit_comments,get_user_gist_comments,get_user_issue_comments)
+from app.services.github_contributions import (get_user_gists,get_issues,get_pull_requests,get_repo_discussions)
+from app.services.github_contributions_service import (get_user_contributions)
+from app.services.github_profile_services import (get_profiles_stats)
+from app.services.github_activity_service import (get_user_activity)
+from app.services.github_repository_service import (get_repository_commits_between)
+
+# crawls that can run as jobs; each is called with the job parameters and the token of the submitter
+JOB_KINDS = {
+    "commit_comments": get_user_commit_comments,
+    "gist_comments": get_user_gist_comments,
+    "issue_comments": get_user_issue_comments,
+    "gists": get_user_gists,
+    "issues": get_issues,
+    "pull_requests": get_pull_requests,
+    "repository_discussions": get_repo_discussions,
+    "contributions": get_user_contributions,
+    "activity": get_user_activity,
+    "profiles": get_profiles_stats,
+    "repository_commits": get_repository_commits_between,
+}
+
+# the parameters each kind of job accepts: their type, and whether they are required
+_USER_PAGES = {"user": (str, True), "pg_size": (int, False)}
+_USER_WINDOW = {**_USER_PAGES, "start": (str, False), "end": (str, False), "descending": (bool, False)}
+JOB_PARAMS = {
+    "commit_comments": _USER_PAGES,
+    "gist_comments": _USER_PAGES,
+    "issue_comments": _USER_PAGES,
+    "gists": _USER_WINDOW,
+    "issues": _USER_WINDOW,
+    "pull_requests": _USER_WINDOW,
+    "repository_discussions": _USER_WINDOW,
+    "contributions": {"user": (str, True), "start_date": (str, True), "end_date": (str, True)},
+    "activity": _USER_PAGES,
+    "profiles": {"users": (list, True), "batch_size": (int, False)},
+    "repository_commits": {
+        "owner": (str, True), "repo_name": (str, True), "since": (str, True), "until": (str, True),
+        "max_workers": (int, False),
+    },
+}
+
+FINISHED_STATUSES = ("succeeded", "failed")
+ACTIVE_STATUSES = ("queued", "running")
+# the number of pages read from the database at a time when a result is streamed back
+RESULT_CHUNK = 100
+
+
+class JobQueue:
+    """
+    JobQueue runs long crawls on a bounded pool of worker threads instead of the request thread.
+    The state, progress (pages fetched) and result of every job are persisted in the CrawlJob table,
+    so they can be polled from any request, and each page of a paginated crawl is stored as it arrives.
+    Submitting a crawl identical to one still queued or running, with the same parameters and token,
+    returns the id of the existing job, whichever process runs it.
+
+    The process running a job renews its heartbeat every few seconds. A job whose heartbeat is older than
+    the lease was left behind by a process that stopped, and is marked failed so it can be submitted again.
+    Tokens are only kept in memory, never persisted.
+    """
+
+    def __init__(self, app: Flask, max_workers: int = 4, lease_seconds: float = 60) -> None:
+        self._app = app
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="crawl-job")
+        self._lease = timedelta(seconds=lease_seconds)
+        # the jobs queued or running in this process, whose heartbeat it renews
+        self._owned = set()
+        self._lock = threading.Lock()
+        self._heartbeat = threading.Thread(target=self._renew_leases, name="crawl-job-heartbeat", daemon=True)
+        self._heartbeat.start()
+
+    @staticmethod
+    def dedup_key(kind: str, params: Dict[str, Any], token: str) -> str:
+        token_hash = hashlib.sha256(token.encode()).hexdigest()
+        return hashlib.sha256(json.dumps([kind, params, token_hash], sort_keys=True).encode()).hexdigest()
+
+    @staticmethod
+    def validate(kind: str, params: Any) -> None:
+        """
+        Checks that a crawl can run as a job: its kind is known, and its parameters are the ones the kind
+        accepts, with the expected types, so that they can safely be passed to the crawl as keyword arguments.
+
+        Raises:
+            ValueError: If the kind is unknown or the parameters are invalid.
+        """
+        if kind not in JOB_KINDS:
+            raise ValueError(f"Unknown job kind: {kind}")
+        if not isinstance(params, dict):
+            raise ValueError("params must be an object")
+        accepted = JOB_PARAMS[kind]
+        unknown = sorted(set(params) - set(accepted))
+        if unknown:
+            raise ValueError(f"Unknown parameters for {kind}: {', '.join(unknown)}")
+        for name, (expected, required) in accepted.items():
+            if name not in params:
+                if required:
+                    raise ValueError(f"Missing parameter for {kind}: {name}")
+            elif not isinstance(params[name], expected) or (isinstance(params[name], bool) and expected is not bool):
+                raise ValueError(f"Parameter {name} of {kind} must be of type {expected.__name__}")
+
+    def _renew_leases(self) -> None:
+        while True:
+            time.sleep(self._lease.total_seconds() / 4)
+            with self._lock:
+                owned = list(self._owned)
+            if not owned:
+                continue
+            try:
+                with self._app.app_context():
+                    CrawlJob.query.filter(CrawlJob.id.in_(owned)).update(
+                        {CrawlJob.heartbeat_at: datetime.utcnow()}, synchronize_session=False
+                    )
+                    db.session.commit()
+            except Exception:
+                # the next beat retries; the lease outlasts a few missed ones
+                continue
+
+    def reap(self) -> int:
+        """
+        Marks failed the queued or running jobs whose heartbeat expired, i.e. whose process stopped.
+
+        Returns:
+            int: The number of jobs marked failed.
+        """
+        now = datetime.utcnow()
+        reaped = CrawlJob.query.filter(
+            CrawlJob.status.in_(ACTIVE_STATUSES), CrawlJob.heartbeat_at < now - self._lease
+        ).update({
+            CrawlJob.status: "failed",
+            CrawlJob.error: "The process running the job stopped",
+            CrawlJob.finished_at: now,
+            CrawlJob.active_key: None,
+        }, synchronize_session=False)
+        db.session.commit()
+        return reaped
+
+    def submit(self, kind: str, params: Dict[str, Any], token: str) -> str:
+        """
+        Queues a crawl, unless an identical one is already queued or running.
+
+        Returns:
+            str: The id of the job running the crawl.
+
+        Raises:
+            ValueError: If the kind of crawl is unknown or its parameters are invalid.
+        """
+        JobQueue.validate(kind, params)
+        key = JobQueue.dedup_key(kind, params, token)
+        self.reap()
+        existing = CrawlJob.query.filter_by(active_key=key).first()
+        if existing is not None:
+            return existing.id
+        job = CrawlJob(id=str(uuid.uuid4()), kind=kind, params=json.dumps(params), dedup_key=key,
+                       active_key=key, status="queued", progress=0, heartbeat_at=datetime.utcnow())
+        db.session.add(job)
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # another process queued the same crawl in the meantime
+            db.session.rollback()
+            existing = CrawlJob.query.filter_by(active_key=key).first()
+            if existing is None:
+                raise
+            return existing.id
+        job_id = job.id
+        with self._lock:
+            self._owned.add(job_id)
+        self._executor.submit(self._run, job_id, kind, params, token)
+        return job_id
+
+    def _run(self, job_id: str, kind: str, params: Dict[str, Any], token: str) -> None:
+        with self._app.app_context():
+            job = db.session.get(CrawlJob, job_id)
+            try:
+                job.status = "running"
+                job.started_at = job.heartbeat_at = datetime.utcnow()
+                db.session.commit()
+
+                data = JOB_KINDS[kind](token=token, **params)
+                if isinstance(data, dict):
+                    if set(data) == {"error"}:
+                        raise RuntimeError(data["error"])
+                    job.result = json.dumps(data)
+                    job.progress = 1
+                else:
+                    # paginated crawls return a page generator: each page is stored as it arrives,
+                    # so neither the worker nor the database holds the whole crawl in one value
+                    for seq, page in enumerate(data):
+                        db.session.add(CrawlJobPage(job_id=job_id, seq=seq, data=json.dumps(page)))
+                        job.progress = seq + 1
+                        job.heartbeat_at = datetime.utcnow()
+                        db.session.commit()
+
+                job.status = "succeeded"
+            except Exception as e:
+                db.session.rollback()
+                job = db.session.get(CrawlJob, job_id)
+                job.status = "failed"
+                job.error = str(e)
+            finally:
+                job.finished_at = datetime.utcnow()
+                job.active_key = None
+                db.session.commit()
+                with self._lock:
+                    self._owned.discard(job_id)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Returns the state of a job, or None if there is no such job.
+        """
+        self.reap()
+        job = db.session.get(CrawlJob, job_id, populate_existing=True)
+        return job.to_dict() if job else None
+
+    def result(self, job_id: str) -> Any:
+        """
+        Returns the result of a job that succeeded, or None if it has not (yet). The result of a paginated
+        crawl is a generator of its pages, read from the database RESULT_CHUNK pages at a time.
+        """
+        job = db.session.get(CrawlJob, job_id, populate_existing=True)
+        if job is None or job.status != "succeeded":
+            return None
+        if job.result is not None:
+            return json.loads(job.result)
+        return self._pages(job_id)
+
+    @staticmethod
+    def _pages(job_id: str) -> Iterator[Any]:
+        seq = 0
+        while True:
+            chunk = (CrawlJobPage.query.filter(CrawlJobPage.job_id == job_id, CrawlJobPage.seq >= seq)
+                     .order_by(CrawlJobPage.seq).limit(RESULT_CHUNK).all())
+            for page in chunk:
+                yield json.loads(page.data)
+            if len(chunk) < RESULT_CHUNK:
+                return
+            seq = chunk[-1].seq + 1
+
+
+_queue_lock = threading.Lock()
+
+
+def get_job_queue() -> JobQueue:
+    """
+    Returns the job queue of the current app, creating it on first use with CRAWL_JOB_WORKERS workers
+    and a lease of CRAWL_JOB_LEASE_SECONDS. The jobs left behind by a previous process are reaped then.
+    """
+    app = current_app._get_current_object()
+    with _queue_lock:
+        if "crawl_jobs" not in app.extensions:
+            queue = JobQueue(
+                app, app.config.get("CRAWL_JOB_WORKERS", 4), app.config.get("CRAWL_JOB_LEASE_SECONDS", 60)
+            )
+            queue.reap()
+            app.extensions["crawl_jobs"] = queue
+        return app.extensions["crawl_jobs"]
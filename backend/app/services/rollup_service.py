@@ -0,0 +1,400 @@
+from collections import defaultdict
+from datetime import datetime, timedelta
+from typing import Dict, Any, Iterable, Iterator, List, Optional, Tuple
+from sqlalchemy import event, func, inspect, or_, select, tuple_
+from sqlalchemy.orm import Session
+
+from app.database import db
+from app.models.github_user_data import GitHubUserData
+from app.models.contribution_rollup import ContributionRollup
+
+GRANULARITIES = ("day", "week", "semester")
+
+# rollup counters and how each one is computed from a GitHubUserData snapshot
+ROLLUP_COUNTS = {
+    "commits": ("commits",),
+    "prs": ("prs",),
+    "issues": ("issues",),
+    "pr_reviews": ("pr_reviews",),
+    "comments": ("commit_comments", "issue_comments", "gist_comments", "repository_discussion_comments"),
+}
+ROLLUP_KEY = ("user_id", "granularity", "bucket")
+
+# the GitHubUserData columns a rollup is computed from
+_SNAPSHOT_COLUMNS = sorted(
+    {"user_id", "github_login", "semester", "created_at", "start_at", "end_at"}
+    | {column for columns in ROLLUP_COUNTS.values() for column in columns}
+)
+
+
+def upsert_statement(table, key: Iterable[str], columns: Iterable[str]):
+    """
+    Builds the dialect's INSERT ... ON DUPLICATE KEY / ON CONFLICT statement replacing the values of
+    an existing row with the same key, so concurrent writers of one row never race into a unique violation.
+
+    Args:
+        table: The table to write to.
+        key: The columns of its unique key.
+        columns: The columns written.
+
+    Raises:
+        ValueError: If the dialect of the database has no upsert.
+    """
+    dialect = db.engine.dialect.name
+    updated = [column for column in columns if column not in key]
+    if dialect == "mysql":
+        from sqlalchemy.dialects.mysql import insert
+        statement = insert(table)
+        return statement.on_duplicate_key_update({column: statement.inserted[column] for column in updated})
+    if dialect in ("sqlite", "postgresql"):
+        if dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert
+        else:
+            from sqlalchemy.dialects.postgresql import insert
+        statement = insert(table)
+        return statement.on_conflict_do_update(
+            index_elements=list(key),
+            set_={column: statement.excluded[column] for column in updated},
+        )
+    raise ValueError(f"Upserts are not supported by the {dialect} dialect")
+
+
+def snapshot_period(snapshot: GitHubUserData) -> Tuple[datetime, datetime]:
+    """
+    Determines the period a snapshot covers, as its first second and the second after its last one.
+    A snapshot without a start_at covers the second it ends at, or was taken at.
+    """
+    end = snapshot.end_at or snapshot.created_at or datetime.utcnow()
+    start = min(snapshot.start_at or end, end)
+    return start, max(end, start + timedelta(seconds=1))
+
+
+def _calendar_buckets(granularity: str, start: datetime, end: datetime) -> Iterator[Tuple[str, datetime, datetime]]:
+    # the days, or the weeks starting on Monday, overlapping [start, end)
+    step = timedelta(days=1) if granularity == "day" else timedelta(weeks=1)
+    bucket_start = datetime(start.year, start.month, start.day)
+    if granularity == "week":
+        bucket_start -= timedelta(days=bucket_start.weekday())
+    while bucket_start < end:
+        yield bucket_start.date().isoformat(), bucket_start, bucket_start + step
+        bucket_start += step
+
+
+def snapshot_buckets(snapshot: GitHubUserData) -> List[Tuple[str, str, datetime, Tuple[int, int, int]]]:
+    """
+    Determines the rollup buckets a snapshot is counted in: every day and week (starting on Monday) its
+    period overlaps, and its semester if it has one. The counts of a snapshot are totals over its period,
+    so a day or a week only gets the share of them matching the part of the period it covers.
+
+    Returns:
+        list: One (granularity, bucket, bucket_start, share) tuple per bucket. The share (low, high, total)
+        is the part of the period covered by the bucket, in seconds from its start: the bucket gets
+        count * high // total - count * low // total, so the shares of a count always add up to it.
+    """
+    start, end = snapshot_period(snapshot)
+    total = int((end - start).total_seconds())
+    buckets = []
+    for granularity in ("day", "week"):
+        for bucket, bucket_start, bucket_end in _calendar_buckets(granularity, start, end):
+            low = int((max(start, bucket_start) - start).total_seconds())
+            high = int((min(end, bucket_end) - start).total_seconds())
+            buckets.append((granularity, bucket, bucket_start, (low, high, total)))
+    if snapshot.semester:
+        buckets.append(("semester", snapshot.semester, snapshot.start_at or start, (0, total, total)))
+    return buckets
+
+
+def bucket_range(granularity: str, bucket: str) -> Optional[Tuple[datetime, datetime]]:
+    """
+    Returns the [start, end) range of a day or week bucket, or None for a semester.
+    """
+    if granularity == "semester":
+        return None
+    start = datetime.fromisoformat(bucket)
+    return start, start + (timedelta(days=1) if granularity == "day" else timedelta(weeks=1))
+
+
+def snapshot_counts(snapshot: GitHubUserData) -> Dict[str, int]:
+    """
+    Computes the rollup counters of a snapshot, missing values counting as 0.
+    """
+    return {
+        name: sum(getattr(snapshot, column) or 0 for column in columns)
+        for name, columns in ROLLUP_COUNTS.items()
+    }
+
+
+def _distinct_periods(snapshots: List[GitHubUserData]) -> List[GitHubUserData]:
+    # the longest, then the latest, snapshots of a login first; any snapshot overlapping one already
+    # kept counts the same contributions again, e.g. a refresh or a shorter window inside a semester
+    kept: List[Tuple[datetime, datetime]] = []
+    distinct = []
+    for snapshot in sorted(
+        snapshots,
+        key=lambda s: (snapshot_period(s)[1] - snapshot_period(s)[0], s.created_at or datetime.min),
+        reverse=True,
+    ):
+        start, end = snapshot_period(snapshot)
+        if all(end <= other_start or other_end <= start for other_start, other_end in kept):
+            kept.append((start, end))
+            distinct.append(snapshot)
+    return distinct
+
+
+def compute_rollups(snapshots: Iterable[GitHubUserData]) -> Dict[Tuple[int, str, str], Dict[str, Any]]:
+    """
+    Computes the rollup rows of some snapshots. Within a bucket, the snapshots of a login covering
+    overlapping periods are only counted once.
+
+    Args:
+        snapshots (Iterable): Every snapshot overlapping the buckets to compute.
+
+    Returns:
+        dict: The ContributionRollup columns of each bucket, keyed by (user_id, granularity, bucket).
+    """
+    groups: Dict[Tuple[int, str, str], Dict[str, List[Tuple[GitHubUserData, Tuple[int, int, int]]]]] = \
+        defaultdict(lambda: defaultdict(list))
+    starts: Dict[Tuple[int, str, str], datetime] = {}
+    for snapshot in snapshots:
+        for granularity, bucket, bucket_start, share in snapshot_buckets(snapshot):
+            key = (snapshot.user_id, granularity, bucket)
+            groups[key][snapshot.github_login].append((snapshot, share))
+            starts[key] = min(starts.get(key, bucket_start), bucket_start)
+
+    rollups = {}
+    for key, logins in groups.items():
+        row = rollups[key] = dict(
+            zip(ROLLUP_KEY, key), bucket_start=starts[key], snapshots=0, **dict.fromkeys(ROLLUP_COUNTS, 0)
+        )
+        for login_snapshots in logins.values():
+            shares = {id(snapshot): share for snapshot, share in login_snapshots}
+            for snapshot in _distinct_periods([snapshot for snapshot, _ in login_snapshots]):
+                low, high, total = shares[id(snapshot)]
+                row["snapshots"] += 1
+                for name, value in snapshot_counts(snapshot).items():
+                    row[name] += value * high // total - value * low // total
+    return rollups
+
+
+def _store_rollups(connection, rollups: Dict[Tuple[int, str, str], Dict[str, Any]], existing) -> None:
+    # upserts the computed rows, and deletes the existing rows of buckets left without any snapshot
+    table = ContributionRollup.__table__
+    stale = [row.id for row in connection.execute(existing) if tuple(row)[1:] not in rollups]
+    for i in range(0, len(stale), 1000):
+        connection.execute(table.delete().where(table.c.id.in_(stale[i:i + 1000])))
+    values = list(rollups.values())
+    if values:
+        statement = upsert_statement(table, ROLLUP_KEY, list(values[0]))
+        for i in range(0, len(values), 1000):
+            connection.execute(statement, values[i:i + 1000])
+
+
+def write_rollups(connection, user_ids: Optional[List[int]] = None) -> int:
+    """
+    Recomputes the rollup rows of some users from their stored snapshots, upserting the buckets that
+    have snapshots and deleting those left without any.
+
+    Args:
+        connection: The connection of the transaction the snapshots were written in.
+        user_ids (Optional[list]): Only recompute the rollups of these users. All users if omitted.
+
+    Returns:
+        int: The number of snapshots rolled up.
+    """
+    table = ContributionRollup.__table__
+    snapshots = GitHubUserData.__table__
+    query = select(*(snapshots.c[column] for column in _SNAPSHOT_COLUMNS))
+    existing = select(table.c.id, *(table.c[column] for column in ROLLUP_KEY))
+    if user_ids is not None:
+        if not user_ids:
+            return 0
+        query = query.where(snapshots.c.user_id.in_(user_ids))
+        existing = existing.where(table.c.user_id.in_(user_ids))
+
+    rows = connection.execute(query).fetchall()
+    _store_rollups(connection, compute_rollups(rows), existing)
+    return len(rows)
+
+
+def write_buckets(connection, buckets: Iterable[Tuple[int, str, str]]) -> None:
+    """
+    Recomputes some rollup rows from the stored snapshots, reading only the snapshots overlapping them.
+
+    Args:
+        connection: The connection of the transaction the snapshots were written in.
+        buckets (Iterable): The (user_id, granularity, bucket) keys of the rows.
+    """
+    snapshots = GitHubUserData.__table__
+    table = ContributionRollup.__table__
+    by_user: Dict[int, List[Tuple[str, str]]] = defaultdict(list)
+    for user_id, granularity, bucket in set(buckets):
+        by_user[user_id].append((granularity, bucket))
+
+    for user_id, keys in by_user.items():
+        semesters = [bucket for granularity, bucket in keys if granularity == "semester"]
+        ranges = [bucket_range(granularity, bucket) for granularity, bucket in keys if granularity != "semester"]
+        overlapping = []
+        if semesters:
+            overlapping.append(snapshots.c.semester.in_(semesters))
+        if ranges:
+            end = func.coalesce(snapshots.c.end_at, snapshots.c.created_at)
+            overlapping.append(
+                (func.coalesce(snapshots.c.start_at, end) < max(high for _, high in ranges))
+                & (end >= min(low for low, _ in ranges))
+            )
+        rows = connection.execute(
+            select(*(snapshots.c[column] for column in _SNAPSHOT_COLUMNS))
+            .where(snapshots.c.user_id == user_id, or_(*overlapping))
+        ).fetchall()
+        rollups = {
+            key: row for key, row in compute_rollups(rows).items() if (key[1], key[2]) in set(keys)
+        }
+        existing = (select(table.c.id, *(table.c[column] for column in ROLLUP_KEY))
+                    .where(table.c.user_id == user_id,
+                           tuple_(table.c.granularity, table.c.bucket).in_(keys)))
+        _store_rollups(connection, rollups, existing)
+
+
+def _stored_buckets(session: Session, ids: List[int]) -> set:
+    # the rollup buckets the stored state of some snapshots is counted in
+    snapshots = GitHubUserData.__table__
+    buckets = set()
+    for i in range(0, len(ids), 1000):
+        rows = session.connection().execute(
+            select(*(snapshots.c[column] for column in _SNAPSHOT_COLUMNS))
+            .where(snapshots.c.id.in_(ids[i:i + 1000]))
+        )
+        for row in rows:
+            buckets.update((row.user_id, granularity, bucket) for granularity, bucket, _, _ in snapshot_buckets(row))
+    return buckets
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_flushed_snapshots(session: Session, flush_context, instances) -> None:
+    # the buckets the snapshots changed or deleted by the flush are counted in until then
+    stored = [snapshot.id for snapshot in (*session.dirty, *session.deleted)
+              if isinstance(snapshot, GitHubUserData) and snapshot.id is not None]
+    if stored:
+        session.info.setdefault("rollup_buckets", set()).update(_stored_buckets(session, stored))
+
+
+@event.listens_for(Session, "after_flush")
+def _rollup_flushed_snapshots(session: Session, flush_context) -> None:
+    # maintained in the same transaction as the snapshots, so rollups follow every insert, update and
+    # delete; only the buckets a snapshot was or is now counted in are recomputed
+    buckets = session.info.pop("rollup_buckets", set())
+    written = [snapshot.id for snapshot in (*session.new, *session.dirty)
+               if isinstance(snapshot, GitHubUserData) and snapshot.id is not None]
+    if written:
+        buckets.update(_stored_buckets(session, written))
+    if buckets:
+        write_buckets(session.connection(), buckets)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _rollup_bulk_snapshots(state) -> Any:
+    # bulk query(...).update() and .delete() statements bypass the flush: the rollups of every user
+    # whose snapshots they match are recomputed after them
+    if not (state.is_update or state.is_delete) or state.bind_mapper is not inspect(GitHubUserData):
+        return None
+    connection = state.session.connection()
+    snapshots = GitHubUserData.__table__
+    where = state.statement.whereclause
+    matched = select(snapshots.c.id, snapshots.c.user_id)
+    if where is not None:
+        matched = matched.where(where)
+    rows = connection.execute(matched).fetchall()
+    result = state.invoke_statement()
+    user_ids = {row.user_id for row in rows}
+    if state.is_update and rows:
+        ids = [row.id for row in rows]
+        for i in range(0, len(ids), 1000):
+            user_ids.update(connection.execute(
+                select(snapshots.c.user_id).where(snapshots.c.id.in_(ids[i:i + 1000]))
+            ).scalars())
+    write_rollups(connection, sorted(user_ids))
+    return result
+
+
+def rebuild_rollups(user_ids: Optional[List[int]] = None, commit: bool = True) -> int:
+    """
+    Recomputes rollup rows from the stored snapshots, e.g. to backfill the snapshots stored before the
+    rollup tables existed, or after snapshots were written without the ORM.
+
+    Args:
+        user_ids (Optional[list]): Only recompute the rollups of these users. All users if omitted.
+        commit (bool): Whether to commit, rather than leaving it to the caller's transaction.
+
+    Returns:
+        int: The number of snapshots rolled up.
+    """
+    count = write_rollups(db.session.connection(), user_ids)
+    if commit:
+        db.session.commit()
+    return count
+
+
+def cohort_totals(
+    user_ids: List[int],
+    granularity: str,
+    start: datetime,
+    end: datetime,
+    per_user: bool = False,
+) -> Dict[str, Any]:
+    """
+    Sums the rollups of a cohort of users over the buckets starting in [start, end), in the database.
+
+    Args:
+        user_ids (list): The users of the cohort.
+        granularity (str): One of GRANULARITIES.
+        start (datetime): The start of the range, included.
+        end (datetime): The end of the range, excluded.
+        per_user (bool): Whether to also break the totals down by user.
+
+    Returns:
+        dict: The totals of each counter, and their breakdown by user if asked for.
+
+    Raises:
+        ValueError: If the granularity is unknown.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"Unknown granularity: {granularity}")
+    sums = [func.coalesce(func.sum(getattr(ContributionRollup, name)), 0).label(name)
+            for name in ("snapshots", *ROLLUP_COUNTS)]
+    condition = (
+        (ContributionRollup.granularity == granularity)
+        & (ContributionRollup.bucket_start >= start)
+        & (ContributionRollup.bucket_start < end)
+        & ContributionRollup.user_id.in_(user_ids)
+    )
+
+    totals = db.session.query(*sums).filter(condition).one()
+    summary: Dict[str, Any] = {
+        "granularity": granularity,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "users": len(user_ids),
+        "totals": {name: int(value) for name, value in totals._mapping.items()},
+    }
+    if per_user:
+        rows = (db.session.query(ContributionRollup.user_id, *sums)
+                .filter(condition).group_by(ContributionRollup.user_id).all())
+        summary["per_user"] = {
+            row.user_id: {name: int(value) for name, value in row._mapping.items() if name != "user_id"}
+            for row in rows
+        }
+    return summary
+
+
+def parse_range(start: Optional[str], end: Optional[str]) -> Tuple[datetime, datetime]:
+    """
+    Parses an ISO-8601 date range, defaulting to everything up to now.
+
+    Raises:
+        ValueError: If a bound is not an ISO-8601 date or the range is empty.
+    """
+    start_at = datetime.fromisoformat(start) if start else datetime(1970, 1, 1)
+    end_at = datetime.fromisoformat(end) if end else datetime.utcnow() + timedelta(days=1)
+    if end_at <= start_at:
+        raise ValueError("The end of the range must be after its start")
+    return start_at, end_at
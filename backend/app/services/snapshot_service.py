@@ -0,0 +1,167 @@
+import time
+from datetime import datetime, timezone
+from typing import Dict, Any, List, Optional
+from flask import session
+
+from app.database import db
+from app.models.github_user_data import GitHubUserData
+from app.services.rollup_service import rebuild_rollups, upsert_statement
+from app.services.github_query.github_graphql.client import (
+    Client,
+    QueryFailedException,
+)
+from app.services.github_query.github_graphql.authentication import (
+    PersonalAccessTokenAuthenticator,
+)
+from app.services.github_query.utils.helper import TIME_FORMAT
+from app.services.github_query.queries.time_range_contributions.user_semester_snapshots import (UserSemesterSnapshots)
+from app.services.github_query.queries.contributions.user_search_counts import (
+    UserSearchCounts,
+    SEARCH_KINDS,
+    MAX_COUNTERS,
+)
+
+# a snapshot is identified by whose it is and the period it covers
+SNAPSHOT_KEY = ("github_login", "semester", "start_at", "end_at")
+
+
+def _normalize(snapshot: Dict[str, Any], columns: List[str], now: datetime) -> Dict[str, Any]:
+    unknown = set(snapshot) - set(columns)
+    if unknown:
+        raise ValueError(f"Unknown snapshot fields: {', '.join(sorted(unknown))}")
+    if snapshot.get("user_id") is None or not snapshot.get("github_login"):
+        raise ValueError("Every snapshot needs a user_id and a github_login")
+    # NULLs never conflict, so a snapshot without its whole key would be inserted again on every upsert
+    missing = [column for column in SNAPSHOT_KEY if not snapshot.get(column)]
+    if missing:
+        raise ValueError(f"Every snapshot needs a {', '.join(missing)}")
+    row = {column: snapshot.get(column) for column in columns}
+    for column in ("created_at", "start_at", "end_at"):
+        if isinstance(row[column], str):
+            row[column] = datetime.fromisoformat(row[column].replace("Z", "+00:00"))
+        # stored as naive UTC
+        if isinstance(row[column], datetime) and row[column].tzinfo is not None:
+            row[column] = row[column].astimezone(timezone.utc).replace(tzinfo=None)
+    row["created_at"] = row["created_at"] or now
+    return row
+
+
+def ingest_snapshots(snapshots: List[Dict[str, Any]], chunk_size: int = 1000) -> Dict[str, Any]:
+    """
+    Stores a batch of snapshots, e.g. the semester results of a whole class, with one multi-row
+    statement per chunk inside a single transaction. A snapshot replaces the stored one with the same
+    github_login, semester, start_at and end_at. The contribution rollups of the users involved are
+    recomputed in the same transaction, since bulk statements bypass the ORM events maintaining them.
+    Within a batch, the last snapshot with a given key wins.
+
+    Args:
+        snapshots (list): The snapshots, as dictionaries of GitHubUserData columns. Dates may be ISO-8601 strings.
+        chunk_size (int): The number of snapshots sent per statement.
+
+    Returns:
+        dict: The number of rows written, the seconds spent writing them and the rows per second,
+        and the seconds spent recomputing the rollups.
+
+    Raises:
+        ValueError: If a snapshot is invalid; nothing is stored then.
+    """
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be positive")
+    began = time.perf_counter()
+    table = GitHubUserData.__table__
+    columns = [column.name for column in table.columns if column.name != "id"]
+    now = datetime.utcnow()
+    # a statement cannot update the same row twice, so only the last snapshot of each key is sent
+    rows = list({
+        tuple(row[column] for column in SNAPSHOT_KEY): row
+        for row in (_normalize(snapshot, columns, now) for snapshot in snapshots)
+    }.values())
+
+    rollup_seconds = 0.0
+    try:
+        connection = db.session.connection()
+        if rows:
+            statement = upsert_statement(table, SNAPSHOT_KEY, columns)
+            for i in range(0, len(rows), chunk_size):
+                connection.execute(statement, rows[i:i + chunk_size])
+        elapsed = time.perf_counter() - began
+        if rows:
+            rebuild_rollups(sorted({row["user_id"] for row in rows}), commit=False)
+            rollup_seconds = time.perf_counter() - began - elapsed
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+    return {
+        "rows": len(rows),
+        "chunks": -(-len(rows) // chunk_size),
+        "seconds": round(elapsed, 4),
+        "rows_per_second": round(len(rows) / elapsed, 1) if elapsed > 0 else None,
+        "rollup_seconds": round(rollup_seconds, 4),
+    }
+
+
+def build_semester_snapshots(
+    user_id: int,
+    github_login: str,
+    semesters: List[Dict[str, Any]],
+    token: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Builds and stores the snapshots of a user for several semesters with a couple of GraphQL requests:
+    the contributions of every semester are fetched as aliased fields of one document, the issues and
+    pull requests created in each semester are counted by UserSearchCounts, and all the rows are then
+    written at once by ingest_snapshots. The gists, discussions and comments columns are left empty,
+    since GitHub only reports them as lifetime totals.
+
+    Args:
+        user_id (int): The user the snapshots belong to.
+        github_login (str): The GitHub login of the user.
+        semesters (list): One {"semester", "start_at", "end_at"} dictionary per semester. Dates may be
+            datetimes or ISO-8601 strings.
+        token (Optional[str]): The GitHub token, the session's one if omitted.
+
+    Returns:
+        dict: The report of ingest_snapshots and the number of requests sent, or an error if a request failed.
+
+    Raises:
+        ValueError: If a semester is invalid; nothing is stored then.
+    """
+    if not semesters:
+        raise ValueError("At least one semester is needed")
+    windows = []
+    for semester in semesters:
+        if not semester.get("semester"):
+            raise ValueError("Every semester needs a semester name")
+        bounds = []
+        for column in ("start_at", "end_at"):
+            value = semester.get(column)
+            if isinstance(value, str):
+                value = datetime.fromisoformat(value.replace("Z", ""))
+            if not isinstance(value, datetime):
+                raise ValueError(f"Every semester needs a {column}")
+            bounds.append(value.strftime(TIME_FORMAT))
+        windows.append(tuple(bounds))
+    query = UserSemesterSnapshots(user=github_login, windows=windows)
+
+    token = token or session.get("access_token")
+    if not token:
+        return {"error": "User not authenticated"}
+    client = Client(
+        host="api.github.com",
+        is_enterprise=False,
+        authenticator=PersonalAccessTokenAuthenticator(token=token),
+    )
+    try:
+        response = client.execute(query=query)
+        counts = UserSearchCounts.window_counts(client, github_login, windows)
+    except QueryFailedException as e:
+        return {"error": str(e)}
+
+    rows = query.snapshots(response)
+    for row, semester, semester_counts in zip(rows, semesters, counts):
+        row.update(semester_counts, user_id=user_id, semester=semester.get("semester"))
+    report = ingest_snapshots(rows)
+    report["requests"] = 1 + -(-len(windows) * len(SEARCH_KINDS) // MAX_COUNTERS)
+    return report
@@ -3,10 +3,12 @@ from app import create_app
 from app.database import db
 from app.models.user import User
 from app.models.github_user_data import GitHubUserData
+from app.models.contribution_rollup import ContributionRollup
 from datetime import datetime, timedelta
 
 def seed_database():
     # Clear existing data
+    db.session.query(ContributionRollup).delete()
     db.session.query(GitHubUserData).delete()
     db.session.query(User).delete()
 
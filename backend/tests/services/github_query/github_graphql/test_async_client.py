@@ -0,0 +1,112 @@
+import json
+import asyncio
+import httpx
+import pytest
+from datetime import datetime, timedelta
+from backend.app.services.github_query.github_graphql.async_client import AsyncClient
+from backend.app.services.github_query.github_graphql.client import InvalidAuthenticationError, QueryFailedException
+from backend.app.services.github_query.github_graphql.authentication import PersonalAccessTokenAuthenticator
+from backend.app.services.github_query.github_graphql.query import QueryNode, PaginatedQuery, QueryNodePaginator
+from backend.app.services.github_query.github_graphql.rate_limit_budget import RateLimitBudget
+
+
+def fresh_budget():
+    budget = RateLimitBudget()
+    reset_at = (datetime.utcnow() + timedelta(hours=1)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    budget.observe({"cost": 1, "remaining": 5000, "resetAt": reset_at})
+    return budget
+
+
+def make_client(handler):
+    client = AsyncClient(authenticator=PersonalAccessTokenAuthenticator(token="async_token"), budget=fresh_budget())
+    client._http = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return client
+
+
+def paginated_query():
+    return PaginatedQuery(fields=[
+        QueryNode("user", args={"login": "octocat"}, fields=[
+            QueryNodePaginator("issues", args={"first": 1}, fields=[
+                QueryNode("nodes", fields=["createdAt"]),
+                QueryNode("pageInfo", fields=["endCursor", "hasNextPage"]),
+            ])
+        ])
+    ])
+
+
+class TestAsyncClient:
+    def test_client_without_authenticator(self):
+        """Test that client raises error when no authenticator is provided"""
+        with pytest.raises(InvalidAuthenticationError):
+            AsyncClient()
+
+    def test_execute_success(self):
+        """Test successful execution of a query."""
+        client = make_client(lambda request: httpx.Response(200, json={"data": "query success"}))
+        assert asyncio.run(client.execute("query { viewer { login }}")) == "query success", \
+            "Execute should return the response data."
+
+    def test_execute_failed(self):
+        """Test that a failed query raises QueryFailedException."""
+        client = make_client(lambda request: httpx.Response(400, json={"error": "bad request"}))
+        with pytest.raises(QueryFailedException):
+            asyncio.run(client.execute("query { viewer { login }}"))
+
+    def test_execution_generator(self):
+        """Test that pages are yielded in order with the cursor forwarded."""
+        pages = iter([
+            {"data": {"user": {"issues": {"nodes": [{"createdAt": "a"}], "pageInfo": {"endCursor": "c1", "hasNextPage": True}}}}},
+            {"data": {"user": {"issues": {"nodes": [{"createdAt": "b"}], "pageInfo": {"endCursor": "c2", "hasNextPage": False}}}}},
+        ])
+        sent = []
+
+        def handler(request):
+            sent.append(json.loads(request.content))
+            return httpx.Response(200, json=next(pages))
+
+        client = make_client(handler)
+
+        async def run():
+            return [page async for page in client.execute(paginated_query())]
+
+        results = asyncio.run(run())
+        assert len(results) == 2, "Should yield two pages."
+        assert "variables" not in sent[0], "The first request should not send a cursor."
+        assert sent[1]["variables"] == {"after": "c1"}, "The second request should continue from the first cursor."
+        assert "after: $after" in sent[1]["query"], "The cursor should be passed as a variable."
+
+    def test_gather_runs_concurrently(self):
+        """Test that gathered queries are in flight at the same time."""
+        in_flight, peak = 0, 0
+
+        async def handler(request):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return httpx.Response(200, json={"data": {"ok": True}})
+
+        client = make_client(handler)
+        results = asyncio.run(client.gather(*["query { viewer { login }}"] * 4))
+        assert results == [{"ok": True}] * 4, "Every query should return its data in order."
+        assert peak > 1, "Queries should overlap instead of running one after another."
+
+    def test_stale_budget_is_probed_once(self):
+        """Test that coroutines finding the budget stale together send a single dry-run probe."""
+        probes = 0
+        reset_at = (datetime.utcnow() + timedelta(hours=1)).strftime('%Y-%m-%dT%H:%M:%SZ')
+
+        async def handler(request):
+            nonlocal probes
+            if "dryRun" in json.loads(request.content)["query"]:
+                probes += 1
+                await asyncio.sleep(0.01)
+                return httpx.Response(200, json={"data": {"rateLimit": {"cost": 1, "remaining": 5000, "resetAt": reset_at}}})
+            return httpx.Response(200, json={"data": {"ok": True}})
+
+        client = make_client(handler)
+        client._budget = RateLimitBudget()
+        results = asyncio.run(client.gather(*["query { viewer { login }}"] * 4))
+        assert results == [{"ok": True}] * 4, "Every query should return its data."
+        assert probes == 1, "Only the first coroutine should probe the stale budget."
@@ -1,5 +1,7 @@
 import pytest
-from backend.app.services.github_query.github_graphql.authentication import Authenticator, PersonalAccessTokenAuthenticator 
+from backend.app.services.github_query.github_graphql.authentication import Authenticator, PersonalAccessTokenAuthenticator, TokenPoolAuthenticator
+from backend.app.services.github_query.github_graphql.rate_limit_budget import RateLimitBudget
+from backend.app.services.github_query.github_graphql.client import Client
 
 def test_authenticator_raises():
     """
@@ -24,3 +26,62 @@ def test_personal_access_token_authenticator():
     expected_header = {"Authorization": f"token {token}"}
     assert authenticator.get_authorization_header() == expected_header, "The authorization header should be formatted correctly."
 
+
+
+@pytest.fixture
+def token_pool():
+    RateLimitBudget.clear_registry()
+    yield TokenPoolAuthenticator(["pool_a", "pool_b"])
+    RateLimitBudget.clear_registry()
+
+def observe(budget, remaining):
+    budget.observe({"cost": 1, "remaining": remaining, "limit": 5000, "resetAt": "2999-01-01T00:00:00Z"})
+
+def test_token_pool_requires_tokens():
+    """Test that an empty pool is rejected."""
+    with pytest.raises(ValueError):
+        TokenPoolAuthenticator([])
+
+def test_token_pool_routes_to_most_headroom(token_pool):
+    """Test that queries go to the token with the most remaining points."""
+    observe(token_pool._budgets[0], 100)
+    observe(token_pool._budgets[1], 4000)
+    assert token_pool.get_authorization_header() == {"Authorization": "token pool_b"}, "The fuller token should be picked."
+
+def test_token_pool_skips_exhausted_tokens(token_pool):
+    """Test that an exhausted token is only used once every token is exhausted."""
+    observe(token_pool._budgets[0], 0)
+    observe(token_pool._budgets[1], 100)
+    authenticator, budget = token_pool.acquire()
+    assert authenticator.get_authorization_header() == {"Authorization": "token pool_b"}, "A token that can send now should be preferred."
+    observe(token_pool._budgets[1], 0)
+    authenticator, budget = token_pool.acquire()
+    assert budget.wait_seconds() > 0, "With every token exhausted, one of them has to be waited for."
+
+def test_token_pool_shares_budgets_with_clients(token_pool):
+    """Test that a single-token client and the pool throttle against the same budget."""
+    client = Client(authenticator=PersonalAccessTokenAuthenticator(token="pool_a"))
+    assert client._budget is token_pool._budgets[0], "Budgets should be shared per token."
+
+def test_token_pool_checks_every_attempt(token_pool):
+    """Test that a credential is only ready if it can afford every attempt of the query."""
+    # a cost of 1 and a safety margin of 5 leave room for 2 and 1 attempts
+    observe(token_pool._budgets[0], 7)
+    observe(token_pool._budgets[1], 6)
+    authenticator, budget = token_pool.acquire(attempts=3)
+    assert budget.wait_seconds(3) > 0, "No credential can afford three attempts."
+    authenticator, budget = token_pool.acquire(attempts=1)
+    assert authenticator.get_authorization_header() == {"Authorization": "token pool_a"}, \
+        "With a single attempt, the fuller token should be picked."
+
+def test_token_pool_stats(token_pool):
+    """Test the per-token utilisation report."""
+    observe(token_pool._budgets[0], 1000)
+    authenticator, budget = token_pool.acquire()
+    assert token_pool.stats()[1]["requests"] == 0, "Picking a credential should not count as a request."
+    token_pool.get_authorization_header()
+    token_pool.record_request(authenticator)
+    stats = token_pool.stats()
+    assert [s["requests"] for s in stats] == [0, 1], "The unobserved token should be tried first."
+    assert stats[0]["utilisation"] == pytest.approx(0.8), "Utilisation should be the spent share of the limit."
+    assert stats[1]["utilisation"] is None, "Unobserved tokens have no known utilisation."
@@ -0,0 +1,109 @@
+import pytest
+from unittest.mock import MagicMock
+from backend.app.services.github_query.github_graphql.client import Client, QueryFailedException
+from backend.app.services.github_query.github_graphql.authentication import PersonalAccessTokenAuthenticator
+from backend.app.services.github_query.github_graphql.rate_limit_budget import RateLimitBudget
+from backend.app.services.github_query.github_graphql.batch import BatchedQuery, estimate_cost, rate_limit_cost, execute_batched
+from backend.app.services.github_query.github_graphql.query import QueryNode, Query, PaginatedQuery, QueryVariable
+from backend.app.services.github_query.queries.profiles.user_profile_stats import UserProfileStats
+from backend.app.services.github_query.queries.profiles.user_login import UserLogin
+
+
+def profile_data(login):
+    return {
+        "login": login, "name": login, "email": "", "createdAt": "2020-01-01T00:00:00Z",
+        "issues": {"totalCount": 1}, "pullRequests": {"totalCount": 2}, "repositories": {"totalCount": 3},
+        "gistComments": {"totalCount": 4}, "issueComments": {"totalCount": 5}, "commitComments": {"totalCount": 6},
+        "repositoryDiscussionComments": {"totalCount": 7},
+    }
+
+
+class TestBatchedQuery:
+    def test_aliases_in_document(self):
+        """Test that every sub-query is aliased in one document."""
+        batch = BatchedQuery([UserLogin("a"), UserLogin("b")])
+        query_string = batch.get_query()
+        assert query_string.startswith(
+            "query($u0_login: String!, $u1_login: String!) { u0: user(login: $u0_login)"
+        ), "First user should be aliased u0."
+        assert "u1: user(login: $u1_login)" in query_string, "Second user should be aliased u1."
+        assert batch.get_variables() == {"u0_login": "a", "u1_login": "b"}, "Each login should be its own variable."
+        assert BatchedQuery([UserLogin("c"), UserLogin("d")]).get_query() == query_string, \
+            "Batches of the same shape should share a document."
+
+    def test_rejects_declared_variables(self):
+        """Test that variables hidden in string fields are not silently shared by packed queries."""
+        query = Query(fields=["user(login: $login) { name }"], variables=[QueryVariable("login", "String!", "a")])
+        with pytest.raises(ValueError):
+            BatchedQuery([query])
+
+    def test_split_response_matches_parsers(self):
+        """Test that the split response can be fed to the existing static parsers."""
+        batch = BatchedQuery([UserProfileStats("a"), UserProfileStats("b")])
+        responses = batch.split_response({"u0": profile_data("a"), "u1": profile_data("b")})
+        stats = [UserProfileStats.profile_stats(response) for response in responses]
+        assert [s["login"] for s in stats] == ["a", "b"], "Responses should keep the order of the queries."
+        assert stats[1]["repository_discussion_comments"] == 7, "Parsed fields should come from the right alias."
+
+    def test_split_response_missing_user(self):
+        """Test that a user missing from the response maps to None."""
+        batch = BatchedQuery([UserLogin("a"), UserLogin("ghost")])
+        assert batch.split_response({"u0": {"login": "a"}, "u1": None})[1] == {"user": None}, \
+            "A missing user should be returned as None."
+
+    def test_rejects_paginated_and_empty(self):
+        """Test that invalid batches are rejected."""
+        paginated = PaginatedQuery(fields=[QueryNode("a", fields=[QueryNode("pageInfo", fields=["endCursor"])])])
+        with pytest.raises(ValueError):
+            BatchedQuery([paginated])
+        with pytest.raises(ValueError):
+            BatchedQuery([])
+
+    def test_estimate_cost(self):
+        """Test the connection count of nested connections."""
+        query = Query(fields=[QueryNode("repositories", args={"first": 100}, fields=[
+            QueryNode("languages", args={"first": 10}, fields=["totalSize"])
+        ])])
+        assert estimate_cost(query) == 101, "One repositories request plus one languages request per repository."
+        assert rate_limit_cost(query) == 2, "101 requests should cost 2 points."
+        assert rate_limit_cost(UserLogin("a")) == 1, "A query without connections should cost 1 point."
+
+    def test_batches_respect_limits(self):
+        """Test that batches are split by size and by cost."""
+        logins = [UserLogin(str(i)) for i in range(5)]
+        assert [len(b.aliases) for b in BatchedQuery.batches(logins, max_size=2)] == [2, 2, 1], \
+            "Batches should hold at most max_size queries."
+        heavy = [Query(fields=[QueryNode("repositories", args={"first": 100}, fields=[
+            QueryNode("languages", args={"first": 100}, fields=["totalSize"])
+        ])]) for _ in range(3)]
+        assert len(list(BatchedQuery.batches(heavy, max_cost=2))) == 3, "Expensive queries should not share a batch."
+
+    def test_execute_batched(self):
+        """Test that results of several batches are returned in order."""
+        client = MagicMock()
+        client.execute.side_effect = [{"u0": {"login": "a"}, "u1": {"login": "b"}}, {"u0": {"login": "c"}}]
+        results = execute_batched(client, [UserLogin(x) for x in "abc"], max_size=2)
+        assert [r["user"]["login"] for r in results] == ["a", "b", "c"], "Results should follow the query order."
+        assert client.execute.call_count == 2, "Three users in batches of two should take two requests."
+
+    def test_execute_batched_missing_user(self, requests_mock):
+        """Test that a login that does not exist only nulls its own result instead of failing the batch."""
+        client = Client(authenticator=PersonalAccessTokenAuthenticator(token="batch_token"), budget=RateLimitBudget())
+        client._wait_for_limit = lambda *args: None
+        requests_mock.post(client._base_path(), json={
+            "data": {"u0": {"login": "a"}, "u1": None},
+            "errors": [{"type": "NOT_FOUND", "path": ["u1"], "message": "Could not resolve to a User"}],
+        })
+        results = execute_batched(client, [UserLogin("a"), UserLogin("ghost")])
+        assert results == [{"user": {"login": "a"}}, {"user": None}], "Only the missing user should be None."
+
+    def test_execute_batched_without_data(self, requests_mock):
+        """Test that a batch failing as a whole still raises."""
+        client = Client(authenticator=PersonalAccessTokenAuthenticator(token="batch_token"), budget=RateLimitBudget())
+        client._wait_for_limit = lambda *args: None
+        requests_mock.post(client._base_path(), json={"errors": [{"message": "Something went wrong"}]})
+        with pytest.raises(QueryFailedException):
+            execute_batched(client, [UserLogin("a")])
+        requests_mock.post(client._base_path(), json={"data": None, "errors": [{"type": "NOT_FOUND"}]})
+        with pytest.raises(QueryFailedException):
+            client.execute(UserLogin("a"))
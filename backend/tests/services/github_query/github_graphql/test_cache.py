@@ -0,0 +1,113 @@
+import time
+from backend.app.services.github_query.github_graphql.cache import QueryCache
+from backend.app.services.github_query.github_graphql.client import Client
+from backend.app.services.github_query.github_graphql.authentication import PersonalAccessTokenAuthenticator
+from backend.app.services.github_query.github_graphql.rate_limit_budget import RateLimitBudget
+from backend.app.services.github_query.queries.profiles.user_profile_stats import UserProfileStats
+from backend.app.services.github_query.queries.profiles.user_login import UserLoginViewer
+from backend.app.services.github_query.queries.time_range_contributions.user_contributions_collection import UserContributionsCollection
+
+
+class TestQueryCache:
+    def test_key_normalizes_whitespace_and_scopes_token(self):
+        """Test that whitespace does not change the key but the token does."""
+        assert QueryCache.key("query {  a }", "t") == QueryCache.key("query {\n a }", "t"), \
+            "Whitespace should be normalized."
+        assert QueryCache.key("query { a }", "t1") != QueryCache.key("query { a }", "t2"), \
+            "Different tokens should not share entries."
+
+    def test_memory_hit_and_miss(self):
+        """Test that stored responses are returned as copies and counted."""
+        cache = QueryCache()
+        assert cache.get("k") is None, "An empty cache should miss."
+        cache.put("k", {"user": {"login": "a"}}, 60)
+        hit = cache.get("k")
+        hit["user"]["login"] = "changed"
+        assert cache.get("k") == {"user": {"login": "a"}}, "Cached responses should not be mutated by callers."
+        assert cache.stats()["hits"] == 2 and cache.stats()["misses"] == 1, "Hits and misses should be counted."
+
+    def test_expiry(self):
+        """Test that expired entries miss."""
+        cache = QueryCache()
+        cache.put("k", {"a": 1}, 0.01)
+        time.sleep(0.02)
+        assert cache.get("k") is None, "An expired entry should miss."
+
+    def test_zero_ttl_not_stored(self):
+        """Test that a zero time to live disables caching."""
+        cache = QueryCache()
+        cache.put("k", {"a": 1}, 0)
+        assert cache.get("k") is None, "A zero time to live should not store the response."
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted from memory."""
+        cache = QueryCache(max_entries=2)
+        cache.put("a", {"v": 1}, 60)
+        cache.put("b", {"v": 2}, 60)
+        cache.get("a")
+        cache.put("c", {"v": 3}, 60)
+        assert cache.get("b") is None, "The least recently used entry should be evicted."
+        assert cache.get("a") == {"v": 1}, "Recently used entries should be kept."
+
+    def test_disk_tier(self, tmp_path):
+        """Test that the disk tier survives a new cache instance and is bounded."""
+        path = str(tmp_path / "cache.sqlite")
+        cache = QueryCache(path=path, max_disk_entries=2)
+        cache.put("a", {"v": 1}, None)
+        cache.put("b", {"v": 2}, None)
+        cache.put("c", {"v": 3}, None)
+        reopened = QueryCache(path=path)
+        assert reopened.get("c") == {"v": 3}, "Entries should be read back from disk."
+        assert reopened.get("a") is None, "The oldest entry should be evicted from disk."
+        assert reopened.stats()["disk_hits"] == 1, "Disk hits should be counted."
+
+    def test_ttl_per_query_class(self):
+        """Test that closed contribution windows never expire and profiles expire quickly."""
+        cache = QueryCache()
+        assert cache.ttl_for(UserProfileStats("a")) == 300, "Profile stats should have a short time to live."
+        closed = UserContributionsCollection("a", "2020-01-01T00:00:00Z", "2020-12-31T23:59:59Z")
+        assert cache.ttl_for(closed) is None, "A closed window should never expire."
+        open_window = UserContributionsCollection("a", "2020-01-01T00:00:00Z", "2999-01-01T00:00:00Z")
+        assert cache.ttl_for(open_window) == 300, "An open window should expire."
+
+    def test_caching_is_opt_in(self):
+        """Test that raw strings, mutations and unlisted query classes are not cached."""
+        cache = QueryCache(ttls={"UserLoginViewer": None})
+        assert cache.ttl_for("query { viewer { login } }") == 0, "Raw query strings should not be cached."
+        assert cache.ttl_for(UserLoginViewer()) is None, "Listed query classes should be cached."
+        del cache.ttls["UserLoginViewer"]
+        assert cache.ttl_for(UserLoginViewer()) == 0, "Unlisted query classes should not be cached."
+
+        class Mutation:
+            def cache_ttl(self):
+                return None
+
+            def __str__(self):
+                return "mutation { addStar(input: {}) { clientMutationId } }"
+
+        assert cache.ttl_for(Mutation()) == 0, "Mutations should never be cached."
+
+    def test_disk_count_is_kept(self, tmp_path):
+        """Test that replacing an entry does not count as a new row towards the disk bound."""
+        path = str(tmp_path / "cache.sqlite")
+        cache = QueryCache(path=path, max_disk_entries=2)
+        cache.put("a", {"v": 1}, None)
+        cache.put("a", {"v": 2}, None)
+        cache.put("b", {"v": 3}, None)
+        reopened = QueryCache(path=path, max_disk_entries=2)
+        assert reopened.get("a") == {"v": 2}, "A replaced entry should not cause an eviction."
+        reopened.put("c", {"v": 4}, None)
+        assert reopened.stats()["evictions"] == 1, "The count of rows should survive a restart."
+
+
+class TestClientCache:
+    def test_execute_uses_cache(self, requests_mock):
+        """Test that a repeated query is served from the cache."""
+        client = Client(authenticator=PersonalAccessTokenAuthenticator(token="cache_token"),
+                        budget=RateLimitBudget(), cache=QueryCache())
+        client._wait_for_limit = lambda *args: None
+        requests_mock.post(client._base_path(), json={"data": {"viewer": {"login": "a"}}}, status_code=200)
+        first = client.execute(UserLoginViewer())
+        second = client.execute(UserLoginViewer())
+        assert first == second == {"viewer": {"login": "a"}}, "Both calls should return the response."
+        assert requests_mock.call_count == 1, "The second call should not reach the API."
@@ -0,0 +1,43 @@
+import pytest
+from backend.app.services.github_query.github_graphql import checkpoint
+from backend.app.services.github_query.github_graphql.checkpoint import (
+    CheckpointStore,
+    configure_checkpoint_store,
+    get_default_checkpoint_store,
+)
+
+
+class TestCheckpointStore:
+    def test_get_missing(self):
+        """Test that a missing checkpoint is None."""
+        assert CheckpointStore(":memory:").get("kind", "subject") is None, "No checkpoint should be found."
+
+    def test_put_get_replace_delete(self):
+        """Test the lifecycle of a checkpoint."""
+        store = CheckpointStore(":memory:")
+        store.put("kind", "subject", {"cursor": "a"})
+        store.put("kind", "subject", {"cursor": "b"})
+        assert store.get("kind", "subject") == {"cursor": "b"}, "The latest checkpoint should be returned."
+        assert store.get("other", "subject") is None, "Checkpoints should be separated by kind."
+        store.delete("kind", "subject")
+        assert store.get("kind", "subject") is None, "A deleted checkpoint should be gone."
+
+    def test_persisted(self, tmp_path):
+        """Test that checkpoints survive reopening the store."""
+        path = str(tmp_path / "checkpoints.sqlite")
+        CheckpointStore(path).put("kind", "subject", {"cursor": "a"})
+        assert CheckpointStore(path).get("kind", "subject") == {"cursor": "a"}, "Checkpoints should be persisted."
+
+    def test_default_store(self, tmp_path, monkeypatch):
+        """Test that the default store is file-backed once configured, and kept in memory until then."""
+        monkeypatch.delenv("GRAPHQL_CHECKPOINT_PATH", raising=False)
+        monkeypatch.setattr(checkpoint, "_default_store", None)
+        monkeypatch.setattr(checkpoint, "_default_store_path", None)
+        get_default_checkpoint_store().put("kind", "subject", {"cursor": "a"})
+        assert get_default_checkpoint_store().get("kind", "subject") == {"cursor": "a"}, \
+            "Without a file, checkpoints should be kept in memory."
+        path = str(tmp_path / "checkpoints.sqlite")
+        configure_checkpoint_store(path)
+        get_default_checkpoint_store().put("kind", "subject", {"cursor": "a"})
+        assert CheckpointStore(path).get("kind", "subject") == {"cursor": "a"}, \
+            "The default store should write to the configured file."
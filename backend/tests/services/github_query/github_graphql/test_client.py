@@ -1,11 +1,15 @@
 import pytest
+import requests
 import requests_mock
 from unittest.mock import MagicMock
-from datetime import datetime
+from datetime import datetime, timedelta
 from requests.exceptions import Timeout
-from backend.app.services.github_query.github_graphql.client import Client, InvalidAuthenticationError, QueryFailedException, RESTClient
-from backend.app.services.github_query.github_graphql.authentication import PersonalAccessTokenAuthenticator 
-from backend.app.services.github_query.github_graphql.query import Query, PaginatedQuery
+from backend.app.services.github_query.github_graphql.client import Client, InvalidAuthenticationError, QueryFailedException
+from backend.app.services.github_query.github_graphql.authentication import PersonalAccessTokenAuthenticator, TokenPoolAuthenticator
+from backend.app.services.github_query.github_graphql.query import Query, PaginatedQuery, QueryNode, QueryNodePaginator, QueryVariable
+from backend.app.services.github_query.github_graphql import checkpoint as checkpoint_module
+from backend.app.services.github_query.github_graphql.checkpoint import CheckpointStore, configure_checkpoint_store
+from backend.app.services.github_query.github_graphql.rate_limit_budget import RateLimitBudget
 
 @pytest.fixture
 def valid_token():
@@ -157,4 +161,171 @@ class TestClient:
         ])
         with pytest.raises(QueryFailedException) as excinfo:
             github_client.execute(Query("query { viewer { login }}"), {})
-        assert "Query failed with code" in str(excinfo.value), "QueryFailedException should contain the right error message."
\ No newline at end of file
+        assert "Query failed with code" in str(excinfo.value), "QueryFailedException should contain the right error message."
+
+class TestClientConnectionPool:
+    def test_session_is_reused(self, github_client, requests_mock):
+        """Test that every attempt goes through the client's persistent session."""
+        requests_mock.post(github_client._base_path(), json={"data": "success"}, status_code=200)
+        session = github_client._session
+        github_client._retry_request("query { viewer { login }}")
+        github_client._retry_request("query { viewer { login }}")
+        assert github_client._session is session, "The client should keep a single session."
+        assert requests_mock.call_count == 2, "Both requests should be sent through the session."
+
+    def test_variables_payload(self, github_client, requests_mock):
+        """Test that the variables of a query are sent alongside its document."""
+        requests_mock.post(github_client._base_path(), json={"data": "success"}, status_code=200)
+        query = Query(fields=[QueryNode("user", args={"login": QueryVariable("login", "String!", "octocat")}, fields=["name"])])
+        github_client._retry_request(query)
+        assert requests_mock.last_request.json() == {
+            "query": "query($login: String!) { user(login: $login) { name } }",
+            "variables": {"login": "octocat"},
+        }, "The login should be sent as a variable."
+
+    def test_pool_configuration(self, authenticator):
+        """Test that the pool size is applied to the mounted adapter."""
+        client = Client(authenticator=authenticator, pool_maxsize=4)
+        assert client._session.get_adapter(client._base_path()) is client._adapter, "The pooled adapter should be mounted."
+        assert client._adapter._pool_maxsize == 4, "The pool size should be configurable."
+
+    def test_keep_alive_disabled(self, authenticator):
+        """Test that connections are closed after each request when keep-alive is disabled."""
+        client = Client(authenticator=authenticator, keep_alive=False)
+        assert client._session.headers["Connection"] == "close", "Connection header should request closing."
+
+    def test_borrowed_session_is_shared(self, authenticator):
+        """Test that clients sharing a session share its adapter and leave its configuration alone."""
+        session = requests.Session()
+        adapter = session.get_adapter("https://api.github.com/graphql")
+        first = Client(authenticator=authenticator, session=session, keep_alive=False, pool_maxsize=4)
+        second = Client(authenticator=authenticator, session=session)
+        assert first._adapter is second._adapter is adapter, "The session's own adapter should be shared."
+        assert session.headers.get("Connection") != "close", "A borrowed session's headers should not be changed."
+        session.close = MagicMock()
+        first.close()
+        session.close.assert_not_called()
+
+    def test_pool_stats_initial(self, github_client):
+        """Test that pool statistics start at zero."""
+        assert github_client.pool_stats() == {"requests": 0, "hits": 0, "misses": 0}, "A new client has no pool traffic."
+
+
+class TestClientRateLimitBudget:
+    def test_probe_only_when_stale(self, requests_mock):
+        """Test that the dry-run probe is only sent while the budget is stale."""
+        client = Client(authenticator=PersonalAccessTokenAuthenticator(token="budget_token"), budget=RateLimitBudget())
+        reset_at = (datetime.utcnow() + timedelta(hours=1)).strftime('%Y-%m-%dT%H:%M:%SZ')
+        requests_mock.post(client._base_path(), [
+            {'json': {"data": {"rateLimit": {"cost": 1, "remaining": 5000, "resetAt": reset_at}}}, 'status_code': 200},
+            {'json': {"data": "first"}, 'status_code': 200},
+            {'json': {"data": "second"}, 'status_code': 200},
+        ])
+        assert client._execute("query { viewer { login }}") == "first", "First query should succeed after a probe."
+        assert client._execute("query { viewer { login }}") == "second", "Second query should be sent without a probe."
+        assert requests_mock.call_count == 3, "Only one probe should be sent for two queries."
+
+    def test_budget_shared_per_token(self, authenticator):
+        """Test that clients with the same token share one budget."""
+        assert Client(authenticator=authenticator)._budget is Client(authenticator=authenticator)._budget, \
+            "Clients using the same token should share a budget."
+
+
+class TestClientTokenPool:
+    def test_queries_spread_over_pool(self, requests_mock):
+        """Test that each query is sent with the token that has the most headroom."""
+        RateLimitBudget.clear_registry()
+        pool = TokenPoolAuthenticator(["token_a", "token_b"])
+        client = Client(authenticator=pool)
+        reset = int((datetime.utcnow() + timedelta(hours=1)).timestamp())
+        remaining = {"token token_a": 3000, "token token_b": 4000}
+
+        def respond(request, context):
+            token = request.headers["Authorization"]
+            remaining[token] -= 1000
+            context.headers = {"X-RateLimit-Remaining": str(remaining[token]), "X-RateLimit-Reset": str(reset), "X-RateLimit-Limit": "5000"}
+            return {"data": {"token": token}}
+
+        requests_mock.post(client._base_path(), json=respond, status_code=200)
+        for budget in pool._budgets:
+            budget.observe({"cost": 1, "remaining": 5000, "resetAt": "2999-01-01T00:00:00Z"})
+        used = [client._execute("query { viewer { login } }")["token"] for _ in range(4)]
+        assert sorted(used) == ["token token_a", "token token_a", "token token_b", "token token_b"], "Queries should alternate as budgets drain."
+        assert [s["requests"] for s in pool.stats()] == [2, 2], "Per-token stats should count the routed queries."
+        RateLimitBudget.clear_registry()
+
+
+def gists_query():
+    return PaginatedQuery(fields=[
+        QueryNode("user", args={"login": "a"}, fields=[
+            QueryNodePaginator("gists", args={"first": 1}, fields=[
+                QueryNode("nodes", fields=["id"]),
+                QueryNode("pageInfo", fields=["endCursor", "hasNextPage"]),
+            ])
+        ])
+    ])
+
+
+def gists_page(number, last):
+    return {"user": {"gists": {"nodes": [{"id": number}],
+                               "pageInfo": {"endCursor": f"cursor{number}", "hasNextPage": not last}}}}
+
+
+class TestClientResumable:
+    def test_resumes_from_checkpoint(self, github_client):
+        """Test that a crawl that failed midway resumes after the last folded page."""
+        store = CheckpointStore(":memory:")
+        sent_cursors = []
+        pages = {None: gists_page(1, False), "cursor1": gists_page(2, False), "cursor2": gists_page(3, True)}
+
+        def execute(query):
+            after = query.paginator.args.get("after")
+            sent_cursors.append(after.value if after else None)
+            if len(sent_cursors) == 3:
+                raise Timeout("The crawl died on the third page.")
+            return pages[sent_cursors[-1]]
+
+        github_client._execute = execute
+        fold = lambda ids, page: ids + [page["user"]["gists"]["nodes"][0]["id"]]
+        with pytest.raises(Timeout):
+            github_client.execute_resumable(gists_query(), fold, [], subject="a", store=store)
+        checkpoint = store.get("PaginatedQuery.pages", "a")
+        assert checkpoint == {"end_cursor": "cursor2", "has_next_page": True, "pages": 2, "partial": [1, 2]}
+
+        result = github_client.execute_resumable(gists_query(), fold, [], subject="a", store=store)
+        assert result == [1, 2, 3], "The resumed crawl should continue the partial aggregate."
+        assert sent_cursors == [None, "cursor1", "cursor2", "cursor2"], "Pages already folded should not be fetched again."
+        assert store.get("PaginatedQuery.pages", "a") is None, "The checkpoint should be removed once the crawl is done."
+
+    def test_default_store(self, github_client, tmp_path, monkeypatch):
+        """Test that without a store, checkpoints go to the configured file, or to memory without one."""
+        monkeypatch.delenv("GRAPHQL_CHECKPOINT_PATH", raising=False)
+        monkeypatch.setattr(checkpoint_module, "_default_store", None)
+        monkeypatch.setattr(checkpoint_module, "_default_store_path", None)
+        fold = lambda ids, page: ids + [page["user"]["gists"]["nodes"][0]["id"]]
+        github_client._execute = MagicMock(side_effect=[gists_page(1, False), Timeout("The crawl died.")])
+        with pytest.raises(Timeout):
+            github_client.execute_resumable(gists_query(), fold, [], subject="a")
+        github_client._execute = MagicMock(side_effect=[gists_page(2, True)])
+        assert github_client.execute_resumable(gists_query(), fold, [], subject="a") == [1, 2], \
+            "Without a checkpoint file, the crawl should resume from the in-memory checkpoint."
+        monkeypatch.setattr(checkpoint_module, "_default_store", None)
+
+        path = str(tmp_path / "checkpoints.sqlite")
+        configure_checkpoint_store(path)
+        github_client._execute = MagicMock(side_effect=[gists_page(1, False), Timeout("The crawl died.")])
+        with pytest.raises(Timeout):
+            github_client.execute_resumable(gists_query(), fold, [], subject="a")
+        assert CheckpointStore(path).get("PaginatedQuery.pages", "a")["partial"] == [1], \
+            "The checkpoint should be written to the configured file."
+
+    def test_default_subject(self, github_client):
+        """Test that without a subject, checkpoints are kept per query text."""
+        store = CheckpointStore(":memory:")
+        github_client._execute = MagicMock(side_effect=[gists_page(1, False), Timeout("died")])
+        with pytest.raises(Timeout):
+            github_client.execute_resumable(gists_query(), lambda count, page: count + 1, 0, store=store)
+        github_client._execute = MagicMock(side_effect=[gists_page(2, True)])
+        assert github_client.execute_resumable(gists_query(), lambda count, page: count + 1, 0, store=store) == 2, \
+            "An identical query should resume from the checkpoint of the first one."
+
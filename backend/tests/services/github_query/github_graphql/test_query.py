@@ -1,4 +1,4 @@
-from backend.app.services.github_query.github_graphql.query import QueryNode, Query, QueryNodePaginator, PaginatedQuery
+from backend.app.services.github_query.github_graphql.query import QueryNode, Query, QueryNodePaginator, PaginatedQuery, QueryVariable
 
 class TestQueryNode:
     def test_initialization(self):
@@ -110,6 +110,72 @@ class TestQuery:
         expected = "testQuery(arg1: substitutedValue) { field1 }"
         assert substituted_query == expected, "Should substitute values correctly into the query."
 
+    def test_compiled_rendering(self):
+        """Test that the compiled template renders like the node tree it was compiled from."""
+        nested = QueryNode(name="nestedNode", fields=["a", QueryNode(name="deep", fields=["b"], args={"first": 2})])
+        query = Query(name="testQuery", fields=["field1", nested, QueryNode(name="empty")], args={"arg1": "value1"})
+        expected = "testQuery(arg1: value1) { field1 nestedNode { a deep(first: 2) { b } } empty {  } }"
+        assert query.get_query() == expected, "The compiled query should match the tree rendering."
+        assert str(query) == expected, "str() should render the compiled query."
+        assert query.get_body() == "field1 nestedNode { a deep(first: 2) { b } } empty {  }", "The body should omit the query wrapper."
+
+    def test_compiled_paginator_slot(self):
+        """Test that paginator arguments are rendered on every call while the rest of the query is reused."""
+        page_info_node = QueryNode(name="pageInfo", fields=["endCursor", "hasNextPage"])
+        nested_node = QueryNodePaginator(name="nestedNode", fields=[page_info_node], args={"first": 10})
+        query = PaginatedQuery(fields=[QueryNode(name="user", fields=[nested_node])])
+        assert query.get_query() == "query { user { nestedNode(first: 10) { pageInfo { endCursor hasNextPage } } } }"
+        nested_node.update_paginator(True, "cursor123")
+        assert query.get_query() == "query($after: String) { user { nestedNode(first: 10, after: $after) { pageInfo { endCursor hasNextPage } } } }", "The cursor should be passed as a variable."
+        assert query.get_variables() == {"after": "cursor123"}, "The cursor should be sent in the variables."
+        nested_node.update_paginator(False, "cursor456")
+        assert query.get_query().endswith("nestedNode(first: 10, after: $after) { pageInfo { endCursor hasNextPage } } } }"), "The document should not change between pages."
+        assert query.get_variables() == {"after": "cursor456"}, "Only the variables should change between pages."
+
+    def test_variables(self):
+        """Test that variables in node arguments are declared in the operation header."""
+        login = QueryVariable("login", "String!", "octocat")
+        query = Query(fields=[QueryNode(name="user", args={"login": login, "first": 5}, fields=["name"])])
+        assert query.get_query() == "query($login: String!) { user(login: $login, first: 5) { name } }", "The login should not be quoted or inlined."
+        assert query.get_variables() == {"login": "octocat"}, "The variables payload should hold the login."
+        login.value = "hubot"
+        assert query.get_variables() == {"login": "hubot"}, "A new value should not require recompiling the document."
+
+    def test_declared_variables(self):
+        """Test that variables used by string fields can be declared explicitly."""
+        query = Query(fields=["user(login: $login) { name }"], variables=[QueryVariable("login", "String!", "octocat")])
+        assert query.get_query() == "query($login: String!) { user(login: $login) { name } }", "Explicit variables should be declared."
+        assert query.get_variables() == {"login": "octocat"}
+
+    def test_invalidate(self):
+        """Test that structural changes are rendered after invalidate()."""
+        query = Query(name="testQuery", fields=["field1"])
+        assert query.get_query() == "testQuery { field1 }"
+        query.fields.append("field2")
+        assert query.get_query() == "testQuery { field1 }", "The compiled template should be reused."
+        query.invalidate()
+        assert query.get_query() == "testQuery { field1 field2 }", "The template should be recompiled after invalidate()."
+
+    def test_changed_args_recompile(self):
+        """Test that changing the arguments of a compiled node renders them without invalidate()."""
+        user = QueryNode(name="user", args={"login": "octocat"}, fields=["name"])
+        query = Query(fields=[user])
+        assert query.get_query() == 'query { user(login: "octocat") { name } }'
+        user.args["login"] = "hubot"
+        assert query.get_query() == 'query { user(login: "hubot") { name } }', "An argument set in place should be rendered."
+        user.args = {"login": "monalisa"}
+        assert query.get_query() == 'query { user(login: "monalisa") { name } }', "New arguments should be rendered."
+        user.name = "organization"
+        assert query.get_query() == 'query { organization(login: "monalisa") { name } }', "A new name should be rendered."
+
+    def test_static_variables_per_instance(self):
+        """Test that queries do not share the variables they collected."""
+        first = Query(fields=[QueryNode(name="user", args={"login": QueryVariable("login", "String!", "a")}, fields=["name"])])
+        second = Query(fields=["viewer { login }"])
+        assert first.get_variables() == {"login": "a"}
+        assert second.get_variables() == {}, "Variables of one query should not leak into another."
+        assert first._static_variables is not second._static_variables
+
 class TestQueryNodePaginator:
     def test_initialization(self):
         """Test the proper initialization of a QueryNodePaginator."""
@@ -127,7 +193,7 @@ class TestQueryNodePaginator:
         # Update the paginator to reflect new pagination state
         paginator.update_paginator(has_next_page=False, end_cursor="cursor123")
         assert paginator.has_next_page == False, "has_next_page should be updated correctly."
-        assert paginator.args.get("after") == '"cursor123"', "End cursor should be updated correctly."
+        assert paginator.args.get("after") == QueryVariable("after", "String", "cursor123"), "End cursor should be updated correctly."
 
     def test_reset_paginator(self):
         """Test the reset_paginator method."""
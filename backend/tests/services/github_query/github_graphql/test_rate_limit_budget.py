@@ -0,0 +1,62 @@
+import time
+import pytest
+from datetime import datetime, timedelta, timezone
+from backend.app.services.github_query.github_graphql.rate_limit_budget import RateLimitBudget
+
+
+def reset_in(seconds):
+    return (datetime.now(timezone.utc) + timedelta(seconds=seconds)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+@pytest.fixture
+def budget():
+    return RateLimitBudget()
+
+
+class TestRateLimitBudget:
+    def test_new_budget_is_stale(self, budget):
+        """Test that a budget without observations is stale and does not block."""
+        assert budget.is_stale(), "A budget that was never observed should be stale."
+        assert budget.wait_seconds() == 0, "An unknown budget should not make the client wait."
+
+    def test_observe_rate_limit_block(self, budget):
+        """Test that a rateLimit block is learned."""
+        budget.observe({"cost": 3, "remaining": 4000, "resetAt": reset_in(600)})
+        assert not budget.is_stale(), "A fresh observation should not be stale."
+        assert budget.remaining == 4000, "Remaining points should be learned."
+        assert budget.last_cost == 3, "The query cost should be learned."
+        assert budget.wait_seconds(attempts=3) == 0, "Enough points should allow the query."
+
+    def test_observe_headers_derives_cost(self, budget):
+        """Test that the cost is derived from consecutive X-RateLimit headers in the same window."""
+        reset = str(int(time.time()) + 600)
+        budget.observe_headers({"X-RateLimit-Remaining": "100", "X-RateLimit-Reset": reset, "X-RateLimit-Limit": "5000"})
+        budget.consume()
+        budget.observe_headers({"X-RateLimit-Remaining": "96", "X-RateLimit-Reset": reset})
+        assert budget.remaining == 96, "Remaining points should follow the latest header."
+        assert budget.last_cost == 4, "The cost should be the difference between two observations."
+        assert budget.limit == 5000, "The limit should be learned from the headers."
+
+    def test_observe_headers_without_rate_limit(self, budget):
+        """Test that responses without rate limit headers are ignored."""
+        budget.observe_headers({})
+        assert budget.is_stale(), "Missing headers should not count as an observation."
+
+    def test_wait_when_exhausted(self, budget):
+        """Test that an exhausted budget asks to wait until the reset time."""
+        budget.observe({"cost": 10, "remaining": 14, "resetAt": reset_in(600)})
+        seconds = budget.wait_seconds(attempts=3)
+        assert 0 < seconds <= 600, "The wait should last until the reset time."
+
+    def test_stale_after_max_age(self):
+        """Test that an old observation becomes stale."""
+        budget = RateLimitBudget(max_age_seconds=0)
+        budget.observe({"cost": 1, "remaining": 4000, "resetAt": reset_in(600)})
+        time.sleep(0.01)
+        assert budget.is_stale(), "An observation older than max_age_seconds should be stale."
+
+    def test_shared_by_scope(self):
+        """Test that budgets are shared per token scope."""
+        RateLimitBudget.clear_registry()
+        assert RateLimitBudget.for_scope("a") is RateLimitBudget.for_scope("a"), "The same scope should share a budget."
+        assert RateLimitBudget.for_scope("a") is not RateLimitBudget.for_scope("b"), "Different scopes should not share."
@@ -0,0 +1,105 @@
+import threading
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from backend.app.services.github_query.github_graphql.single_flight import SingleFlight
+from backend.app.services.github_query.github_graphql.client import Client
+from backend.app.services.github_query.github_graphql.authentication import PersonalAccessTokenAuthenticator
+from backend.app.services.github_query.github_graphql.rate_limit_budget import RateLimitBudget
+
+
+def run_concurrently(flight, key, fn, callers):
+    """Starts the callers without waiting for them, and returns their futures."""
+    executor = ThreadPoolExecutor(max_workers=callers)
+    futures = [executor.submit(flight.do, key, fn) for _ in range(callers)]
+    executor.shutdown(wait=False)
+    return futures
+
+
+class TestSingleFlight:
+    def test_concurrent_calls_are_coalesced(self):
+        """Test that concurrent callers of one key share a single execution."""
+        flight = SingleFlight()
+        release = threading.Event()
+        executions = []
+
+        def fetch():
+            executions.append(1)
+            release.wait(5)
+            return {"user": {"login": "a"}}
+
+        futures = run_concurrently(flight, "key", fetch, 4)
+        while flight.stats()["calls"] < 4:
+            pass
+        release.set()
+        results = [future.result() for future in futures]
+        assert len(executions) == 1, "Only the first caller should execute."
+        assert all(result == {"user": {"login": "a"}} for result in results), "Every caller should get the result."
+        assert len({id(result) for result in results}) == 4, "Waiting callers should get their own copy."
+        assert flight.stats() == {"calls": 4, "executions": 1, "coalesced": 3, "in_flight": 0}
+
+    def test_executing_caller_owns_its_result(self):
+        """Test that the waiters copy the result before the executing caller gets it back."""
+        flight = SingleFlight()
+        release = threading.Event()
+        payload = {"user": {"login": "a"}}
+
+        def fetch():
+            release.wait(5)
+            return payload
+
+        futures = run_concurrently(flight, "key", fetch, 3)
+        while flight.stats()["calls"] < 3:
+            pass
+        release.set()
+        results = [future.result() for future in futures]
+        payload["user"]["login"] = "changed"
+        assert sum(result is payload for result in results) == 1, "The executing caller should get the result itself."
+        assert [result for result in results if result is not payload] == [{"user": {"login": "a"}}] * 2, \
+            "Changing the result should not affect the waiting callers."
+
+    def test_errors_are_shared(self):
+        """Test that waiting callers receive the exception of the execution."""
+        flight = SingleFlight()
+        release = threading.Event()
+
+        def fetch():
+            release.wait(5)
+            raise ValueError("boom")
+
+        futures = run_concurrently(flight, "key", fetch, 2)
+        while flight.stats()["calls"] < 2:
+            pass
+        release.set()
+        for future in futures:
+            with pytest.raises(ValueError):
+                future.result()
+
+    def test_sequential_calls_execute_again(self):
+        """Test that nothing is kept once an execution has finished."""
+        flight = SingleFlight()
+        assert flight.do("key", lambda: 1) == 1
+        assert flight.do("key", lambda: 2) == 2, "A later call should not reuse the previous result."
+        assert flight.stats()["coalesced"] == 0
+
+
+class TestClientSingleFlight:
+    def test_identical_queries_share_one_request(self, requests_mock):
+        """Test that concurrent identical queries through clients of one token send one request."""
+        flight = SingleFlight()
+        release = threading.Event()
+        requests_mock.post("https://api.github.com/graphql", json={"data": {"viewer": {"login": "a"}}}, status_code=200)
+
+        def client():
+            c = Client(authenticator=PersonalAccessTokenAuthenticator(token="flight_token"),
+                       budget=RateLimitBudget(), single_flight=flight)
+            c._wait_for_limit = lambda *args: release.wait(5)
+            return c
+
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            futures = [executor.submit(client().execute, "query { viewer { login } }") for _ in range(3)]
+            while flight.stats()["calls"] < 3:
+                pass
+            release.set()
+            results = [future.result() for future in futures]
+        assert results == [{"viewer": {"login": "a"}}] * 3, "Every caller should get the response."
+        assert requests_mock.call_count == 1, "Only one request should reach the API."
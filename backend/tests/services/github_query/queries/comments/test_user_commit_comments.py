@@ -69,7 +69,7 @@
 
 import pytest
 from backend.app.services.github_query.queries.comments.user_commit_comments import UserCommitComments
-from backend.app.services.github_query.github_graphql.query import QueryNode, PaginatedQuery, QueryNodePaginator
+from backend.app.services.github_query.github_graphql.query import QueryNode, PaginatedQuery, QueryNodePaginator, QueryVariable
 from backend.app.services.github_query.queries.constants import (
      FIELD_LOGIN, FIELD_TOTAL_COUNT, FIELD_CREATED_AT, FIELD_END_CURSOR, FIELD_HAS_NEXT_PAGE,
     NODE_USER, NODE_COMMIT_COMMENTS, NODE_NODES, NODE_PAGE_INFO, ARG_LOGIN, ARG_FIRST
@@ -107,7 +107,7 @@ def test_user_commit_comments_initialization(user_commit_comments_query):
 def test_user_commit_comments_query_structure(user_commit_comments_query):
     user_node = user_commit_comments_query.fields[0]
     assert user_node.name == NODE_USER
-    assert user_node.args == {ARG_LOGIN: "$user"}
+    assert user_node.args == {ARG_LOGIN: QueryVariable(ARG_LOGIN, "String!", "$user")}
     
     assert FIELD_LOGIN in user_node.fields
     assert len(user_node.fields) == 2
@@ -71,7 +71,7 @@
 import pytest
 from datetime import datetime, timedelta
 from typing import Dict, Any, List
-from backend.app.services.github_query.github_graphql.query import QueryNode, PaginatedQuery, QueryNodePaginator
+from backend.app.services.github_query.github_graphql.query import QueryNode, PaginatedQuery, QueryNodePaginator, QueryVariable
 from backend.app.services.github_query.queries.comments.user_gist_comments import UserGistComments
 import backend.app.services.github_query.utils.helper as helper
 from backend.app.services.github_query.queries.constants import (
@@ -110,7 +110,7 @@ def test_user_gist_comments_initialization(user_gist_comments_query):
 def test_user_gist_comments_query_structure(user_gist_comments_query):
     user_node = user_gist_comments_query.fields[0]
     assert user_node.name == NODE_USER
-    assert user_node.args == {ARG_LOGIN: "$user"}
+    assert user_node.args == {ARG_LOGIN: QueryVariable(ARG_LOGIN, "String!", "$user")}
     
     assert FIELD_LOGIN in user_node.fields
     assert len(user_node.fields) == 2
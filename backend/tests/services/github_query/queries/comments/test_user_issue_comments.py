@@ -70,7 +70,7 @@
 
 import pytest
 from typing import Dict, Any, List
-from backend.app.services.github_query.github_graphql.query import QueryNode, PaginatedQuery, QueryNodePaginator
+from backend.app.services.github_query.github_graphql.query import QueryNode, PaginatedQuery, QueryNodePaginator, QueryVariable
 from backend.app.services.github_query.queries.comments.user_issue_comments import UserIssueComments
 from backend.app.services.github_query.queries.constants import (
     NODE_USER, NODE_LOGIN, NODE_ISSUE_COMMENTS, FIELD_TOTAL_COUNT,
@@ -109,7 +109,7 @@ def test_user_issue_comments_initialization(user_issue_comments_query):
 def test_user_issue_comments_query_structure(user_issue_comments_query):
     user_node = user_issue_comments_query.fields[0]
     assert user_node.name == NODE_USER
-    assert user_node.args == {ARG_LOGIN: "$user"}
+    assert user_node.args == {ARG_LOGIN: QueryVariable(ARG_LOGIN, "String!", "$user")}
     
     assert NODE_LOGIN in user_node.fields
     assert len(user_node.fields) == 2
@@ -69,6 +69,7 @@
 #         assert count == 1, "There should be 1 comment created before 2022."
 
 import pytest
+from backend.app.services.github_query.github_graphql.query import QueryVariable
 from typing import Dict, Any, List
 from backend.app.services.github_query.queries.comments.user_repository_discussion_comments import UserRepositoryDiscussionComments
 from backend.app.services.github_query.queries.constants import (
@@ -87,7 +88,7 @@ from backend.app.services.github_query.queries.constants import (
 
 @pytest.fixture
 def user_repository_discussion_comments_query():
-    return UserRepositoryDiscussionComments()
+    return UserRepositoryDiscussionComments("octocat", 10)
 
 @pytest.fixture
 def sample_raw_data():
@@ -115,14 +116,14 @@ def test_user_repository_discussion_comments_initialization(user_repository_disc
 def test_user_repository_discussion_comments_query_structure(user_repository_discussion_comments_query):
     user_node = user_repository_discussion_comments_query.fields[0]
     assert user_node.name == NODE_USER
-    assert user_node.args == {ARG_LOGIN: "$user"}
+    assert user_node.args == {ARG_LOGIN: QueryVariable(ARG_LOGIN, "String!", "octocat")}
 
     assert NODE_LOGIN in user_node.fields
     assert len(user_node.fields) == 2
 
     discussion_comments_node = user_node.fields[1]
     assert discussion_comments_node.name == NODE_REPOSITORY_DISCUSSION_COMMENTS
-    assert discussion_comments_node.args == {ARG_FIRST: "$pg_size"}
+    assert discussion_comments_node.args == {ARG_FIRST: 10}
     
     assert FIELD_TOTAL_COUNT in discussion_comments_node.fields
     assert len(discussion_comments_node.fields) == 3
@@ -215,3 +215,36 @@ class TestUserRepositories:
         assert repo_stats["stargazer_count"] == 10, "Stargazer count should be 10."
         assert lang_stats["Python"] == 600, "Python size should be 600."
         assert lang_stats["JavaScript"] == 400, "JavaScript size should be 400."
+
+    def test_windowed_repository_stats_matches_separate_calls(self):
+        repo_list = [
+            {
+                "name": f"Repo{i}",
+                "createdAt": f"20{18 + i}-06-01T00:00:00Z",
+                "forkCount": i,
+                "stargazerCount": 2 * i,
+                "watchers": {"totalCount": i},
+                "languages": {
+                    "totalSize": 100 * i,
+                    "edges": [
+                        {"size": 40 * i, "node": {"name": "Python"}},
+                        {"size": 60 * i, "node": {"name": "Go" if i % 2 else "C"}}
+                    ]
+                }
+            }
+            for i in range(5)
+        ]
+        windows = [
+            ("before", "2020-06-01T00:00:00Z", None),
+            ("after", "2020-06-01T00:00:00Z", None),
+            ("between", "2019-01-01T00:00:00Z", "2021-06-01T00:00:00Z"),
+        ]
+        buckets = UserRepositories.windowed_repository_stats(repo_list, windows)
+
+        for (direction, start, end), bucket in zip(windows, buckets):
+            repo_stats = {"total_count": 0, "fork_count": 0, "stargazer_count": 0, "watchers_count": 0, "total_size": 0}
+            lang_stats = {}
+            UserRepositories.cumulated_repository_stats(repo_list, repo_stats, lang_stats, start, end, direction)
+            assert bucket == (repo_stats, lang_stats), f"The {direction} window should match a separate call."
+        assert buckets[0][0]["total_count"] == 1, "Repo0 has no languages and the cutoff itself is not before."
+        assert buckets[2][0]["total_count"] == 3, "The bounds of a between window are included."
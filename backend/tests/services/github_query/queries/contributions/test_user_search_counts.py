@@ -0,0 +1,98 @@
+import pytest
+from backend.app.services.github_query.queries.contributions.user_search_counts import (
+    UserSearchCounts,
+    MAX_COUNTERS,
+)
+
+
+class FakeClient:
+    def __init__(self):
+        self.queries = []
+
+    def execute(self, query):
+        self.queries.append(query)
+        # every search counts the number of characters of its search string
+        return {
+            name[:-len("_query")]: {"issueCount": len(search)}
+            for name, search in query.get_variables().items()
+        }
+
+
+class TestUserSearchCounts:
+    def test_query_structure(self):
+        query = UserSearchCounts({
+            "a": "author:octocat is:pr",
+            "b": "author:octocat is:issue",
+        })
+        assert str(query) == (
+            'query($a_query: String!, $b_query: String!) { '
+            'a: search(type: ISSUE, query: $a_query) { issueCount } '
+            'b: search(type: ISSUE, query: $b_query) { issueCount } }'
+        )
+        assert query.get_variables() == {
+            "a_query": "author:octocat is:pr",
+            "b_query": "author:octocat is:issue",
+        }
+
+    def test_invalid_counters(self):
+        with pytest.raises(ValueError):
+            UserSearchCounts({})
+        with pytest.raises(ValueError):
+            UserSearchCounts({f"c{i}": "author:octocat is:pr" for i in range(MAX_COUNTERS + 1)})
+        with pytest.raises(ValueError):
+            UserSearchCounts({"2021-spring": "author:octocat is:pr"})
+
+    def test_search_string(self):
+        assert UserSearchCounts.search_string("octocat", "prs", "2021-01-01T00:00:00Z", "2021-06-30T00:00:00Z") \
+            == "author:octocat is:pr created:2021-01-01T00:00:00Z..2021-06-30T00:00:00Z"
+        assert UserSearchCounts.search_string("octocat", "issues", start="2021-01-01T00:00:00Z") \
+            == "author:octocat is:issue created:>=2021-01-01T00:00:00Z"
+        assert UserSearchCounts.search_string("octocat", "issues", end="2021-01-01T00:00:00Z") \
+            == "author:octocat is:issue created:<=2021-01-01T00:00:00Z"
+        assert UserSearchCounts.search_string("octocat", "prs") == "author:octocat is:pr"
+        with pytest.raises(ValueError):
+            UserSearchCounts.search_string("octocat", "gists")
+
+    def test_cache_ttl(self):
+        closed = UserSearchCounts({
+            "a": UserSearchCounts.search_string("octocat", "prs", "2021-01-01T00:00:00Z", "2021-06-30T00:00:00Z"),
+            "b": UserSearchCounts.search_string("octocat", "prs", end="2021-06-30T00:00:00Z"),
+        })
+        assert closed.cache_ttl() is None
+        for search in (
+            UserSearchCounts.search_string("octocat", "prs", start="2021-01-01T00:00:00Z"),
+            UserSearchCounts.search_string("octocat", "prs"),
+            UserSearchCounts.search_string("octocat", "prs", "2021-01-01T00:00:00Z", "2999-01-01T00:00:00Z"),
+        ):
+            assert UserSearchCounts({"a": search}).cache_ttl() == 300
+
+    def test_counts(self):
+        raw_data = {"a": {"issueCount": 3}, "b": {"issueCount": 0}}
+        assert UserSearchCounts.counts(raw_data) == {"a": 3, "b": 0}
+
+    def test_window_counts(self):
+        client = FakeClient()
+        windows = [("2021-01-01T00:00:00Z", "2021-06-30T00:00:00Z"), (None, "2021-01-01T00:00:00Z")]
+        counts = UserSearchCounts.window_counts(client, "octocat", windows)
+        assert counts == [
+            {
+                "issues": len("author:octocat is:issue created:2021-01-01T00:00:00Z..2021-06-30T00:00:00Z"),
+                "prs": len("author:octocat is:pr created:2021-01-01T00:00:00Z..2021-06-30T00:00:00Z"),
+            },
+            {
+                "issues": len("author:octocat is:issue created:<=2021-01-01T00:00:00Z"),
+                "prs": len("author:octocat is:pr created:<=2021-01-01T00:00:00Z"),
+            },
+        ]
+        # all four counters are packed into a single request
+        assert len(client.queries) == 1
+
+    def test_window_counts_batches(self):
+        client = FakeClient()
+        windows = [(f"20{i:02d}-01-01T00:00:00Z", f"20{i:02d}-12-31T00:00:00Z") for i in range(MAX_COUNTERS)]
+        counts = UserSearchCounts.window_counts(client, "octocat", windows, kinds=("prs",))
+        assert len(counts) == MAX_COUNTERS
+        assert len(client.queries) == 1
+        counts = UserSearchCounts.window_counts(client, "octocat", windows)
+        assert len(counts) == MAX_COUNTERS
+        assert len(client.queries) == 3
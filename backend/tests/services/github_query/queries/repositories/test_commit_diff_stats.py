@@ -0,0 +1,27 @@
+import pytest
+from backend.app.services.github_query.queries.repositories.commit_diff_stats import CommitDiffStats, MAX_IDS
+
+class TestCommitDiffStats:
+    def test_query_structure(self):
+        query = CommitDiffStats(["C_1", "C_2"])
+        assert query.get_query() == \
+            "query($ids: [ID!]!) { nodes(ids: $ids) { ... on Commit { id additions deletions changedFilesIfAvailable } } }"
+        assert query.get_variables() == {"ids": ["C_1", "C_2"]}, "The ids should be sent as a variable."
+
+    def test_id_limits(self):
+        with pytest.raises(ValueError):
+            CommitDiffStats([])
+        with pytest.raises(ValueError):
+            CommitDiffStats([f"C_{i}" for i in range(MAX_IDS + 1)])
+
+    def test_never_expires(self):
+        assert CommitDiffStats(["C_1"]).cache_ttl() is None, "Diff stats of a commit never change."
+
+    def test_diff_stats(self):
+        raw_data = {"nodes": [
+            {"id": "C_1", "additions": 3, "deletions": 1, "changedFilesIfAvailable": 2},
+            None,
+        ]}
+        assert CommitDiffStats.diff_stats(raw_data) == {
+            "C_1": {"additions": 3, "deletions": 1, "changedFilesIfAvailable": 2}
+        }, "Unresolved ids should be left out."
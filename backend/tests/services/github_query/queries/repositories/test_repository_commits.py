@@ -1,11 +1,16 @@
 import re
+from unittest.mock import MagicMock, patch
 import pytest
 from backend.app.services.github_query.queries.repositories.repository_commits import RepositoryCommits
+from requests.exceptions import Timeout
+from backend.app.services.github_query.github_graphql.checkpoint import CheckpointStore
+from backend.app.services.github_query.github_graphql.client import Client
+from backend.app.services.github_query.github_graphql.authentication import PersonalAccessTokenAuthenticator
 
 class TestRepositoryCommits:
     def test_repository_commits_query_structure(self):
         # Instantiate the RepositoryCommits class
-        repository_commits_query = RepositoryCommits()
+        repository_commits_query = RepositoryCommits("octocat", "hello-world", 10)
 
         # Convert the generated query to a string or the appropriate format
         query_string = str(repository_commits_query)
@@ -13,11 +18,11 @@ class TestRepositoryCommits:
         # Define what the expected query should look like, including all fields
         expected_query = '''
         query {
-            repository(owner: "$owner", name: "$repo_name") {
+            repository(owner: "octocat", name: "hello-world") {
                 defaultBranchRef {
                     target {
                         ... on Commit {
-                            history(first: $pg_size) {
+                            history(first: 10) {
                                 totalCount
                                 nodes {
                                     authoredDate
@@ -211,4 +216,255 @@ class TestRepositoryCommits:
         assert "" in result, "empty string should be in the cumulative commits."
         assert result[""]["alice_smith"]["total_additions"] == 7, "alice_smith without name should have 7 additions."
         assert result["Bob Brown"]["total_deletions"] == 5, "Bob Brown without login should have 5 deletions."
-        assert result["Alice Smith"]["alice_smith"]["total_files"] == 2, "Alice Smith with login should have 2 files."
\ No newline at end of file
+        assert result["Alice Smith"]["alice_smith"]["total_files"] == 2, "Alice Smith with login should have 2 files."
+
+def commit_page(name, login, additions):
+    return {
+        "repository": {"defaultBranchRef": {"target": {"history": {"nodes": [{
+            "authoredDate": "2021-01-01T00:00:00Z", "changedFilesIfAvailable": 1, "additions": additions,
+            "deletions": 0, "message": "", "parents": {"totalCount": 1},
+            "author": {"name": name, "email": "", "user": {"login": login}},
+        }]}}}}
+    }
+
+
+def count_response(counts):
+    return {"repository": {"defaultBranchRef": {"target": {f"w{i}": {"totalCount": c} for i, c in enumerate(counts)}}}}
+
+
+class TestRepositoryCommitsParallel:
+    def test_time_window_arguments(self):
+        """Test that since and until are added to the history arguments."""
+        query = RepositoryCommits("owner", "repo", 50, since="2021-01-01T00:00:00Z", until="2021-06-01T00:00:00Z")
+        assert 'history(first: 50, since: "2021-01-01T00:00:00Z", until: "2021-06-01T00:00:00Z")' in query.get_query(), \
+            "The history should be restricted to the window."
+
+    def test_time_windows_split_until_small(self):
+        """Test that windows above the target size are halved without overlap."""
+        client = MagicMock()
+        client.execute.side_effect = [count_response([30]), count_response([10, 20])]
+        windows = RepositoryCommits.time_windows(client, "o", "r", "2021-01-01T00:00:00Z", "2021-01-03T00:00:00Z", 25)
+        assert windows == [
+            ("2021-01-02T00:00:01Z", "2021-01-03T00:00:00Z"),
+            ("2021-01-01T00:00:00Z", "2021-01-02T00:00:00Z"),
+        ], "Windows should be halved, adjacent and newest first."
+        assert client.execute.call_count == 2, "Each round of splitting should take one request."
+
+    def test_parallel_commits_list_is_deterministic(self):
+        """Test that pages of all windows are merged into the same totals as a sequential crawl."""
+        client = MagicMock()
+        client.execute.side_effect = lambda query: (
+            count_response([5]) if "totalCount }" in query.get_query() and "nodes" not in query.get_query()
+            else iter([commit_page("Ann", "ann", 3), commit_page("Bob", "bob", 4)])
+        )
+        result = RepositoryCommits.parallel_commits_list(client, "o", "r", "2021-01-01T00:00:00Z", "2021-02-01T00:00:00Z")
+        assert result == {
+            "Ann": {"ann": {"total_additions": 3, "total_deletions": 0, "total_files": 1, "total_commits": 1}},
+            "Bob": {"bob": {"total_additions": 4, "total_deletions": 0, "total_files": 1, "total_commits": 1}},
+        }, "Parallel crawling should produce the commits_list output."
+
+
+def history_page(oids, has_next=False):
+    return {
+        "repository": {"defaultBranchRef": {"target": {"history": {
+            "nodes": [{
+                "id": oid, "oid": oid, "authoredDate": "2021-01-01T00:00:00Z", "changedFilesIfAvailable": 1, "additions": 1,
+                "deletions": 1, "message": "", "parents": {"totalCount": 1},
+                "author": {"name": "Ann", "email": "", "user": {"login": "ann"}},
+            } for oid in oids],
+            "pageInfo": {"endCursor": "c", "hasNextPage": has_next},
+        }}}}
+    }
+
+
+def history_client(*crawls):
+    """A client whose successive history crawls return the given pages, and whose diff stats lookups succeed."""
+    crawls = iter(crawls)
+    client = MagicMock()
+    client.execute.side_effect = lambda query: (
+        iter(next(crawls)) if isinstance(query, RepositoryCommits) else {"nodes": [
+            {"id": node_id, "additions": 1, "deletions": 1, "changedFilesIfAvailable": 1}
+            for node_id in query.get_variables()["ids"]
+        ]}
+    )
+    return client
+
+
+class TestRepositoryCommitsIncremental:
+    def test_include_oid(self):
+        """Test that the oid is requested for incremental syncs."""
+        assert "nodes { oid authoredDate" in RepositoryCommits("o", "r", 10, include_oid=True).get_query(), \
+            "The commit oid should be requested."
+
+    def test_incremental_commits_list(self):
+        """Test that a second sync only folds in the commits newer than the checkpoint."""
+        store = CheckpointStore(":memory:")
+        client = history_client(
+            [history_page(["b", "a"])], [history_page(["d", "c"], has_next=True), history_page(["b", "a"])]
+        )
+        first = RepositoryCommits.incremental_commits_list(client, store, "o", "r")
+        assert first["Ann"]["ann"]["total_commits"] == 2, "The first sync should count the whole history."
+
+        second = RepositoryCommits.incremental_commits_list(client, store, "o", "r")
+        assert second["Ann"]["ann"]["total_commits"] == 4, "Only the two new commits should be added."
+        assert store.get("RepositoryCommits", "o/r")["head_oid"] == "d", "The checkpoint should move to the new head."
+
+    def test_incremental_commits_list_rewritten_history(self):
+        """Test that totals are rebuilt when the checkpoint commit is no longer in the history."""
+        store = CheckpointStore(":memory:")
+        store.put("RepositoryCommits", "o/r", {"head_oid": "gone", "commits": {"Ann": {"ann": {
+            "total_additions": 9, "total_deletions": 9, "total_files": 9, "total_commits": 9}}}})
+        client = history_client([history_page(["x"])])
+        result = RepositoryCommits.incremental_commits_list(client, store, "o", "r")
+        assert result["Ann"]["ann"]["total_commits"] == 1, "A rewritten history should be counted from scratch."
+
+
+
+class TestRepositoryCommitsResumable:
+    def test_resumable_commits_list(self):
+        """Test that a crawl that died midway keeps the totals of the pages it had folded."""
+        store = CheckpointStore(":memory:")
+        client = Client(authenticator=PersonalAccessTokenAuthenticator(token="resume_token"))
+        client._execute = MagicMock(side_effect=[history_page(["c", "b"], has_next=True), Timeout("died")])
+        with pytest.raises(Timeout):
+            RepositoryCommits.resumable_commits_list(client, store, "o", "r")
+
+        client._execute = MagicMock(side_effect=[history_page(["a"])])
+        result = RepositoryCommits.resumable_commits_list(client, store, "o", "r")
+        assert result["Ann"]["ann"]["total_commits"] == 3, "The resumed crawl should add the last page to the saved totals."
+        assert client._execute.call_count == 1, "Only the remaining page should be fetched."
+
+    def test_parallel_commits_list_resumes_windows(self):
+        """Test that a parallel crawl given a store continues its unfinished windows."""
+        store = CheckpointStore(":memory:")
+        client = Client(authenticator=PersonalAccessTokenAuthenticator(token="resume_token"))
+        windows = [("2021-01-16T00:00:01Z", "2021-02-01T00:00:00Z"), ("2021-01-01T00:00:00Z", "2021-01-16T00:00:00Z")]
+        with patch.object(RepositoryCommits, "time_windows", return_value=windows):
+            client._execute = MagicMock(side_effect=[history_page(["c", "b"], has_next=True), Timeout("died")])
+            with pytest.raises(Timeout):
+                RepositoryCommits.parallel_commits_list(
+                    client, "o", "r", "2021-01-01T00:00:00Z", "2021-02-01T00:00:00Z", max_workers=1, store=store
+                )
+
+            client._execute = MagicMock(side_effect=[history_page(["a"]), history_page(["z", "y"])])
+            result = RepositoryCommits.parallel_commits_list(
+                client, "o", "r", "2021-01-01T00:00:00Z", "2021-02-01T00:00:00Z", max_workers=1, store=store
+            )
+        assert result["Ann"]["ann"]["total_commits"] == 5, "The windows should be merged with the saved totals."
+        assert client._execute.call_count == 2, "The pages of the unfinished window should not be fetched again."
+
+
+def skeleton_page(commits, has_next=False):
+    return {
+        "repository": {"defaultBranchRef": {"target": {"history": {
+            "nodes": [{
+                "id": node_id, "authoredDate": "2021-01-01T00:00:00Z", "parents": {"totalCount": parents},
+                "author": {"name": name, "email": "", "user": {"login": name.lower()}},
+            } for node_id, name, parents in commits],
+            "pageInfo": {"endCursor": "c", "hasNextPage": has_next},
+        }}}}
+    }
+
+
+def diff_stats_response(query):
+    return {"nodes": [
+        {"id": node_id, "additions": int(node_id[2:]), "deletions": 1, "changedFilesIfAvailable": 1}
+        for node_id in query.get_variables()["ids"]
+    ]}
+
+
+class TestRepositoryCommitsTwoPhase:
+    def test_skeleton_query(self):
+        """Test that a skeleton crawl asks for node ids and no diff stats."""
+        query = RepositoryCommits("o", "r", 100, diff_stats=False).get_query()
+        assert "nodes { id authoredDate parents (first: 2)" in query, "The node id should be requested."
+        for field in ("additions", "deletions", "changedFilesIfAvailable", "message"):
+            assert field not in query, f"{field} should be left to the enrichment phase."
+
+    def test_enrich_only_counted_commits(self):
+        """Test that merge commits are not looked up and batches respect the batch size."""
+        client = MagicMock()
+        client.execute.side_effect = diff_stats_response
+        nodes = skeleton_page([("C_1", "Ann", 1), ("C_2", "Ann", 2), ("C_3", "Bob", 1), ("C_4", "Bob", 0)])
+        nodes = nodes["repository"]["defaultBranchRef"]["target"]["history"]["nodes"]
+        RepositoryCommits.enrich_diff_stats(client, nodes, batch_size=2)
+        looked_up = [call.args[0].get_variables()["ids"] for call in client.execute.call_args_list]
+        assert looked_up == [["C_1", "C_3"], ["C_4"]], "Only commits with fewer than 2 parents should be looked up."
+        assert "additions" not in nodes[1], "Merge commits should be left as they are."
+
+    def test_enrich_missing_commit(self):
+        client = MagicMock()
+        client.execute.return_value = {"nodes": [None]}
+        nodes = [{"id": "C_1", "parents": {"totalCount": 1}}]
+        with pytest.raises(ValueError):
+            RepositoryCommits.enrich_diff_stats(client, nodes)
+
+    def test_incremental_sync_is_two_phase(self):
+        """Test that an incremental sync crawls a skeleton and aggregates the looked up diff stats like commits_list."""
+        pages = [skeleton_page([("C_1", "Ann", 1), ("C_2", "Bob", 2)], has_next=True), skeleton_page([("C_3", "Ann", 1)])]
+        for page in pages:
+            for node in page["repository"]["defaultBranchRef"]["target"]["history"]["nodes"]:
+                node["oid"] = node["id"].lower()
+        queries = []
+        client = MagicMock()
+        client.execute.side_effect = lambda query: (
+            queries.append(query.get_query()) or iter(pages) if isinstance(query, RepositoryCommits)
+            else diff_stats_response(query)
+        )
+        result = RepositoryCommits.incremental_commits_list(client, CheckpointStore(":memory:"), "o", "r", max_workers=2)
+        assert "additions" not in queries[0], "The history should be crawled without diff stats."
+        assert result == {"Ann": {"ann": {"total_additions": 4, "total_deletions": 2, "total_files": 2, "total_commits": 2}}}
+
+def random_pages(seed, pages=20, per_page=50):
+    import random
+    rng = random.Random(seed)
+    authors = [("Ann", "ann"), ("Ann", None), ("Bob", "bob"), ("Bob", "bobby"), ("", "eve"), ("Carl", None), ("Dee", "")]
+    result = []
+    for _ in range(pages):
+        nodes = []
+        for _ in range(per_page):
+            name, login = rng.choice(authors)
+            nodes.append({
+                "changedFilesIfAvailable": rng.randint(0, 20), "additions": rng.randint(0, 500),
+                "deletions": rng.randint(0, 500), "parents": {"totalCount": rng.choice([0, 1, 1, 2])},
+                "author": {"name": name, "user": {"login": login} if login is not None else None},
+            })
+        result.append({"repository": {"defaultBranchRef": {"target": {"history": {"nodes": nodes}}}}})
+    return result
+
+
+class TestRepositoryCommitsAggregate:
+    def test_identical_to_commits_list(self):
+        """Test that the vectorized aggregation matches folding commits_list over the pages."""
+        for seed in range(5):
+            pages = random_pages(seed)
+            expected = {}
+            for page in pages:
+                RepositoryCommits.commits_list(page, expected)
+            result = RepositoryCommits.aggregate_commits(pages)
+            assert result == expected, "The totals should be identical."
+            assert list(result) == list(expected), "Authors should keep the order of first appearance."
+            assert all(list(result[name]) == list(expected[name]) for name in expected), "Keys should keep their order."
+            assert all(type(v) is int for entry in result.values() for v in entry.values() if not isinstance(v, dict))
+
+    def test_accumulates_into_existing(self, mock_raw_data_multiple_commits):
+        """Test that totals are added to an existing cumulative dictionary."""
+        pages = random_pages(7, pages=3)
+        expected = RepositoryCommits.commits_list(mock_raw_data_multiple_commits)
+        result = RepositoryCommits.commits_list(mock_raw_data_multiple_commits)
+        for page in pages:
+            RepositoryCommits.commits_list(page, expected)
+        assert RepositoryCommits.aggregate_commits(pages, result) == expected, "Existing totals should be extended."
+
+    def test_as_frame(self, mock_raw_data_multiple_commits):
+        """Test the DataFrame output."""
+        frame = RepositoryCommits.aggregate_commits([mock_raw_data_multiple_commits] * 2, as_frame=True)
+        assert list(frame.columns) == ["name", "login", "total_additions", "total_deletions", "total_files", "total_commits"]
+        bob = frame[frame["name"] == "Bob Brown"].iloc[0]
+        assert bob["login"] is None, "Authors without a login should have a None login."
+        assert (bob["total_additions"], bob["total_commits"]) == (30, 2), "Totals should be summed per author."
+
+    def test_empty(self):
+        """Test pages without commits."""
+        page = {"repository": {"defaultBranchRef": {"target": {"history": {"nodes": []}}}}}
+        assert RepositoryCommits.aggregate_commits([page]) == {}
@@ -1,10 +1,14 @@
 import re
+from unittest.mock import MagicMock
+from backend.app.services.github_query.github_graphql.checkpoint import CheckpointStore
 from backend.app.services.github_query.queries.repositories.repository_contributors_contribution import RepositoryContributorsContribution
 
 class TestRepositoryContributorsContributionInit:
     def test_repository_contributors_contribution_query_structure(self):
         # Instantiate the RepositoryContributorsContribution class
-        repository_contributors_contribution_query = RepositoryContributorsContribution()
+        repository_contributors_contribution_query = RepositoryContributorsContribution(
+            "octocat", "hello-world", "MDQ6VXNlcjE=", 10
+        )
 
         # Convert the generated query to a string or the appropriate format
         query_string = str(repository_contributors_contribution_query)
@@ -12,11 +16,11 @@ class TestRepositoryContributorsContributionInit:
         # Define what the expected query should look like, including all fields
         expected_query = '''
         query {
-            repository(owner: "$owner", name: "$repo_name") {
+            repository(owner: "octocat", name: "hello-world") {
                 defaultBranchRef {
                     target {
                         ... on Commit {
-                            history(author: $id, first: $pg_size) {
+                            history(author: {id: "MDQ6VXNlcjE="}, first: 10) {
                                 totalCount
                                 nodes {
                                     authoredDate
@@ -102,3 +106,34 @@ class TestRepositoryContributorsContributionInit:
         # Call the user_commit_contribution method and assert it returns the expected result
         commit_contributions = RepositoryContributorsContribution.user_commit_contribution(raw_data)
         assert commit_contributions == expected_commit_contributions, "The individual commit contributions do not match the expected structure."
+
+
+class TestRepositoryContributorsContributionIncremental:
+    def test_author_argument(self):
+        """Test that a concrete author id is passed as a CommitAuthor input."""
+        query = RepositoryContributorsContribution("o", "r", "MDQ6VXNlcjE=", 10, include_oid=True)
+        assert 'history(author: {id: "MDQ6VXNlcjE="}, first: 10)' in query.get_query(), \
+            "The author should be filtered by id."
+
+    def test_incremental_user_contribution(self):
+        """Test that a second sync only adds the commits newer than the checkpoint."""
+        def page(oids):
+            return {"repository": {"defaultBranchRef": {"target": {"history": {
+                "nodes": [{"id": oid, "oid": oid, "parents": {"totalCount": 1}} for oid in oids],
+                "pageInfo": {"endCursor": "c", "hasNextPage": False},
+            }}}}}
+
+        crawls = iter([[page(["b", "a"])], [page(["c", "b", "a"])]])
+        store = CheckpointStore(":memory:")
+        client = MagicMock()
+        # the history is crawled without diff stats, which are looked up by node id
+        client.execute.side_effect = lambda query: (
+            iter(next(crawls)) if isinstance(query, RepositoryContributorsContribution) else {"nodes": [
+                {"id": node_id, "additions": 2, "deletions": 1, "changedFilesIfAvailable": 1}
+                for node_id in query.get_variables()["ids"]
+            ]}
+        )
+        RepositoryContributorsContribution.incremental_user_contribution(client, store, "o", "r", "id")
+        result = RepositoryContributorsContribution.incremental_user_contribution(client, store, "o", "r", "id")
+        assert result == {"total_additions": 6, "total_deletions": 3, "total_commits": 3}, \
+            "Only the new commit should be added to the stored totals."
@@ -0,0 +1,67 @@
+import pytest
+from unittest.mock import MagicMock
+from backend.app.services.github_query.queries.contributions.user_issues import UserIssues
+from backend.app.services.github_query.queries.comments.user_gist_comments import UserGistComments
+
+
+def issue_pages(dates, pg_size, connection="issues"):
+    pages = []
+    for i in range(0, len(dates), pg_size):
+        chunk = dates[i:i + pg_size]
+        pages.append({"user": {"login": "a", connection: {
+            "totalCount": len(dates),
+            "nodes": [{"createdAt": date} for date in chunk],
+            "pageInfo": {"endCursor": f"c{i}", "hasNextPage": i + pg_size < len(dates)},
+        }}})
+    return pages
+
+
+def lazy_client(pages):
+    """Returns a client yielding the pages lazily, and the list of pages it actually yielded."""
+    fetched = []
+
+    def execute(query):
+        for page in pages:
+            fetched.append(page)
+            yield page
+
+    client = MagicMock()
+    client.execute.side_effect = execute
+    return client, fetched
+
+
+DATES = [f"20{year}-0{month}-01T00:00:00Z" for year in range(18, 24) for month in (1, 7)]
+
+
+class TestWindowedPaginatedQuery:
+    def test_order_by_creation(self):
+        query = UserIssues(user="a", pg_size=2)
+        query.order_by_creation(descending=True)
+        assert "issues(first: 2, orderBy: {field: CREATED_AT, direction: DESC})" in query.get_query()
+
+    def test_default_order_cannot_be_reversed(self):
+        query = UserGistComments(user="a", pg_size=2)
+        query.order_by_creation()
+        assert "orderBy" not in query.get_query(), "Connections without orderBy keep their default order."
+        with pytest.raises(ValueError):
+            query.order_by_creation(descending=True)
+
+    def test_stops_after_window(self):
+        """Test that oldest-first pagination stops at the first node created after the window."""
+        client, fetched = lazy_client(issue_pages(DATES, 2))
+        result = UserIssues(user="a", pg_size=2).windowed_nodes(client, "2019-01-01T00:00:00Z", "2020-01-01T00:00:00Z")
+        assert [node["createdAt"] for node in result["nodes"]] == ["2019-01-01T00:00:00Z", "2019-07-01T00:00:00Z"]
+        assert (result["pages_fetched"], result["pages_skipped"], result["total_count"]) == (3, 3, 12)
+        assert len(fetched) == 3, "Pages after the window should not be requested."
+
+    def test_descending_stops_before_window(self):
+        """Test that newest-first pagination stops at the first node created before the window."""
+        client, fetched = lazy_client(issue_pages(DATES[::-1], 5))
+        result = UserIssues(user="a", pg_size=5).windowed_nodes(client, "2022-01-01T00:00:00Z", None, descending=True)
+        assert len(result["nodes"]) == 4, "Every node since the start of the window should be collected."
+        assert (result["pages_fetched"], result["pages_skipped"]) == (1, 2)
+
+    def test_unbounded_window_fetches_everything(self):
+        client, fetched = lazy_client(issue_pages(DATES, 4, connection="gistComments"))
+        result = UserGistComments(user="a", pg_size=4).windowed_nodes(client)
+        assert len(result["nodes"]) == 12 and result["pages_skipped"] == 0
@@ -68,7 +68,6 @@
 
 import pytest
 from collections import Counter
-from backend.app.services.github_query.github_graphql.query import QueryNode
 from backend.app.services.github_query.queries.time_range_contributions.user_contributions_collection import UserContributionsCollection
 from backend.app.services.github_query.queries.constants import (
     FIELD_RESTRICTED_CONTRIBUTIONS_COUNT,
@@ -148,3 +147,73 @@ def test_user_contributions_collection_partial_data():
     result = UserContributionsCollection.user_contributions_collection(partial_data)
     assert result == expected_result, "The contribution counts with partial data should fill missing fields with zero."
 
+
+def test_user_contributions_collection_query_structure():
+    query = UserContributionsCollection("octocat", "2021-01-01T00:00:00Z", "2021-06-30T00:00:00Z")
+    assert str(query) == (
+        'query($login: String!, $w0_from: DateTime, $w0_to: DateTime) { user(login: $login) { '
+        'w0: contributionsCollection(from: $w0_from, to: $w0_to) { '
+        'startedAt endedAt restrictedContributionsCount totalCommitContributions totalIssueContributions '
+        'totalPullRequestContributions totalPullRequestReviewContributions totalRepositoryContributions } } }'
+    )
+    assert query.get_variables() == {
+        "login": "octocat", "w0_from": "2021-01-01T00:00:00Z", "w0_to": "2021-06-30T00:00:00Z",
+    }
+    other = UserContributionsCollection("hubot", "2022-01-01T00:00:00Z", "2022-06-30T00:00:00Z")
+    assert str(other) == str(query), "Another user and range of the same length should share the document."
+
+def test_split_windows():
+    assert UserContributionsCollection.split_windows("2021-01-01T00:00:00Z", "2021-12-31T00:00:00Z") == [
+        ("2021-01-01T00:00:00Z", "2021-12-31T00:00:00Z"),
+    ]
+    assert UserContributionsCollection.split_windows("2020-01-01T00:00:00Z", "2022-06-01T00:00:00Z") == [
+        ("2020-01-01T00:00:00Z", "2020-12-30T23:59:59Z"),
+        ("2020-12-31T00:00:00Z", "2021-12-30T23:59:59Z"),
+        ("2021-12-31T00:00:00Z", "2022-06-01T00:00:00Z"),
+    ]
+    with pytest.raises(ValueError):
+        UserContributionsCollection.split_windows("2021-01-01T00:00:00Z", "2021-01-01T00:00:00Z")
+    with pytest.raises(ValueError):
+        UserContributionsCollection.split_windows("2021-01-01", "next year")
+
+def test_split_windows_date_formats():
+    """Test that dates, offsets and fractional seconds are accepted and converted to UTC."""
+    assert UserContributionsCollection.split_windows("2021-01-01", "2021-06-30T02:00:00.000+02:00") == [
+        ("2021-01-01T00:00:00Z", "2021-06-30T00:00:00Z"),
+    ]
+
+def test_multi_year_range_is_one_document():
+    query = UserContributionsCollection("octocat", "2019-01-01T00:00:00Z", "2022-01-01T00:00:00Z")
+    query_string = str(query)
+    assert query_string.count("contributionsCollection(") == len(query.windows) == 4
+    assert 'user(login: $login) { w0: contributionsCollection(from: $w0_from, to: $w0_to)' in query_string
+    variables = query.get_variables()
+    assert (variables["w3_from"], variables["w3_to"]) == ("2021-12-31T00:00:00Z", "2022-01-01T00:00:00Z")
+
+def test_user_contributions_collection_merges_windows():
+    raw_data = {
+        NODE_USER: {
+            "w1": {
+                "startedAt": "2021-01-01T00:00:00Z",
+                "endedAt": "2021-06-30T00:00:00Z",
+                FIELD_TOTAL_COMMIT_CONTRIBUTIONS: 10,
+                FIELD_TOTAL_ISSUE_CONTRIBUTIONS: 1,
+            },
+            "w0": {
+                "startedAt": "2020-01-01T00:00:00Z",
+                "endedAt": "2020-12-31T23:59:59Z",
+                FIELD_TOTAL_COMMIT_CONTRIBUTIONS: 5,
+                FIELD_TOTAL_PULL_REQUEST_CONTRIBUTIONS: 2,
+            },
+        }
+    }
+    assert UserContributionsCollection.user_contributions_collection(raw_data) == Counter({
+        "res_con": 0, "commit": 15, "issue": 1, "pr": 2, "pr_review": 0, "repository": 0
+    })
+    windows = UserContributionsCollection.contributions_by_window(raw_data)
+    assert [(window["start"], window["end"]) for window in windows] == [
+        ("2020-01-01T00:00:00Z", "2020-12-31T23:59:59Z"),
+        ("2021-01-01T00:00:00Z", "2021-06-30T00:00:00Z"),
+    ]
+    assert windows[0]["counts"]["commit"] == 5
+    assert windows[1]["counts"]["commit"] == 10
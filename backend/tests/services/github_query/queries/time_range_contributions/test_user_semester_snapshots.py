@@ -0,0 +1,87 @@
+from datetime import datetime
+import pytest
+from backend.app.services.github_query.queries.time_range_contributions.user_semester_snapshots import (
+    UserSemesterSnapshots,
+)
+
+WINDOWS = [
+    ("2023-01-09T00:00:00Z", "2023-05-12T00:00:00Z"),
+    ("2023-08-21T00:00:00Z", "2023-12-15T00:00:00Z"),
+]
+
+
+def window(commits, issues, prs):
+    return {
+        "restrictedContributionsCount": 1,
+        "totalCommitContributions": commits,
+        "totalIssueContributions": issues,
+        "totalPullRequestContributions": prs,
+        "totalPullRequestReviewContributions": 0,
+        "totalRepositoryContributions": 2,
+    }
+
+
+PROFILE = {
+    "login": "octocat",
+    "createdAt": "2022-01-09T00:00:00Z",
+}
+
+
+def test_query_structure():
+    query = UserSemesterSnapshots("octocat", WINDOWS)
+    query_string = str(query)
+    assert 'user(login: $login) { login createdAt s0_0: contributionsCollection(' in query_string
+    # lifetime profile totals do not belong to a semester
+    assert "totalCount" not in query_string
+    assert 's0_0: contributionsCollection(from: $s0_0_from, to: $s0_0_to)' in query_string
+    assert 's1_0: contributionsCollection(from: $s1_0_from, to: $s1_0_to)' in query_string
+    assert query.get_variables() == {
+        "login": "octocat",
+        "s0_0_from": "2023-01-09T00:00:00Z", "s0_0_to": "2023-05-12T00:00:00Z",
+        "s1_0_from": "2023-08-21T00:00:00Z", "s1_0_to": "2023-12-15T00:00:00Z",
+    }
+    assert query_string.count("contributionsCollection(") == 2
+
+
+def test_long_window_is_split():
+    query = UserSemesterSnapshots("octocat", [("2020-01-01T00:00:00Z", "2022-01-01T00:00:00Z")])
+    assert [len(sub_windows) for sub_windows in query.windows] == [3]
+    assert "s0_2: contributionsCollection(" in str(query)
+
+
+def test_invalid_windows():
+    with pytest.raises(ValueError):
+        UserSemesterSnapshots("octocat", [])
+    with pytest.raises(ValueError):
+        UserSemesterSnapshots("octocat", [("2023-05-12T00:00:00Z", "2023-01-09T00:00:00Z")])
+
+
+def test_snapshots():
+    query = UserSemesterSnapshots("octocat", WINDOWS)
+    raw_data = {"user": dict(PROFILE, s0_0=window(10, 1, 2), s1_0=window(20, 3, 4))}
+    snapshots = query.snapshots(raw_data)
+    assert snapshots[0] == {
+        "github_login": "octocat",
+        "start_at": datetime(2023, 1, 9),
+        "end_at": datetime(2023, 5, 12),
+        "period": 123,
+        "lifetime": 488,
+        "private_contributions": 1,
+        "commits": 10,
+        "issues": 1,
+        "prs": 2,
+        "pr_reviews": 0,
+        "repos": 2,
+    }
+    assert snapshots[1]["commits"] == 20
+    assert snapshots[1]["prs"] == 4
+
+
+def test_snapshots_sum_split_windows():
+    query = UserSemesterSnapshots("octocat", [("2020-01-01T00:00:00Z", "2022-01-01T00:00:00Z")])
+    raw_data = {"data": {"user": dict(PROFILE, s0_0=window(1, 0, 0), s0_1=window(2, 0, 0), s0_2=window(3, 0, 0))}}
+    snapshot, = query.snapshots(raw_data)
+    assert snapshot["commits"] == 6
+    assert snapshot["repos"] == 6
+    assert snapshot["start_at"] == datetime(2020, 1, 1)
+    assert snapshot["end_at"] == datetime(2022, 1, 1)
@@ -5,7 +5,7 @@ from datetime import datetime, timedelta
 from unittest.mock import MagicMock
 from backend.app.services.github_query.github_graphql.client import Client
 from backend.app.services.github_query.github_graphql.query import Query
-from backend.app.services.github_query.utils.helper import print_methods, print_attr, get_abs_path, generate_file_name, add_by_days, minus_by_days, in_time_period, created_before, created_after, write_csv, get_owner_and_name, have_rate_limit
+from backend.app.services.github_query.utils.helper import print_methods, print_attr, get_abs_path, generate_file_name, add_by_days, minus_by_days, in_time_period, created_before, created_after, parse_time, write_csv, get_owner_and_name, have_rate_limit
 
 class TestUtilityFunctions:
     def test_get_abs_path(mock_file_path):
@@ -46,6 +46,18 @@ class TestUtilityFunctions:
         assert created_after("2022-01-01T00:00:00Z", "2021-01-01T00:00:00Z") is True, "Created should be after the time."
         assert created_after("2022-01-01T00:00:00Z", "2023-01-01T00:00:00Z") is False, "Created should not be after the time."
 
+    def test_parse_time(self):
+        assert parse_time("1970-01-02T00:00:00Z") == 86400, "Should convert to seconds since the epoch."
+        assert parse_time("2021-06-01T12:00:00Z") == 1622548800
+        with pytest.raises(ValueError):
+            parse_time("2021-06-01")
+
+    def test_predicates_accept_parsed_cutoffs(self):
+        cutoff = parse_time("2022-01-01T00:00:00Z")
+        assert created_before("2021-01-01T00:00:00Z", cutoff) is True, "A parsed cutoff should compare like the string."
+        assert created_after("2021-01-01T00:00:00Z", cutoff) is False
+        assert in_time_period("2021-06-01T12:00:00Z", parse_time("2021-01-01T00:00:00Z"), cutoff) is True
+
     def test_write_csv(self):
         with tempfile.NamedTemporaryFile("w+", delete=False) as tmp:
             data_row = "test,data,row"